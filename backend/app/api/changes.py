@@ -0,0 +1,63 @@
+from fastapi import APIRouter, Header
+from fastapi.responses import StreamingResponse
+from typing import Optional
+import asyncio
+import os
+
+from app.services.change_feed import OVERFLOW, change_feed, format_event, format_reset
+
+router = APIRouter(prefix="/changes", tags=["changes"])
+
+# 無通信時に送るコメント行の間隔（秒）。プロキシによる切断を防ぐ
+HEARTBEAT_INTERVAL = float(os.getenv("CHANGE_FEED_HEARTBEAT", "15"))
+
+@router.get("/stream")
+async def stream_changes(
+    task_id: Optional[str] = None,
+    last_event_id: Optional[str] = Header(None),
+):
+    """変更フィード（Server-Sent Events）
+
+    task_id を指定するとそのタスク（サブタスク・コメントを含む）のイベントのみ配信する。
+    """
+    try:
+        resume_from = int(last_event_id) if last_event_id else None
+    except ValueError:
+        resume_from = -1
+    subscription, missed = change_feed.hub.subscribe(task_id, resume_from)
+
+    async def events():
+        try:
+            yield "retry: 3000\n\n"
+            if missed is None:
+                yield format_reset()
+            else:
+                for event_id, event in missed:
+                    yield format_event(event_id, event)
+            while True:
+                try:
+                    item = await asyncio.wait_for(subscription.queue.get(), HEARTBEAT_INTERVAL)
+                except asyncio.TimeoutError:
+                    yield ": ping\n\n"
+                    continue
+                if item is OVERFLOW:
+                    yield format_reset()
+                    break
+                yield format_event(*item)
+        finally:
+            change_feed.hub.unsubscribe(subscription)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+@router.get("/status")
+async def change_feed_status():
+    """変更フィードの状態"""
+    return {
+        "backend": change_feed.backend,
+        "subscribers": change_feed.hub.subscriber_count,
+        "pid": os.getpid(),
+    }
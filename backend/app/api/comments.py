@@ -1,47 +1,83 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
 
 
-from app.database.connection import get_db
+from app.database.connection import get_async_db
+from app.database.replicas import get_read_db
 from app.models.task import Task
 from app.models.comment import TaskComment
 from app.schemas.comment import Comment as CommentSchema, CommentCreate
+from app.schemas.response import CommentListResponse
+from app.services.change_feed import change_feed
+from app.services.pagination import COMMENT_ORDER, CursorError, child_keyset_page, finish_child_page
+from app.services.response_cache import response_cache
+from app.services.task_counts import adjust_counts
 
 router = APIRouter(tags=["comments"])
 
-@router.get("/tasks/{task_id}/comments", response_model=List[CommentSchema])
-async def get_comments(task_id: str, db: Session = Depends(get_db)):
-    """特定タスクのコメント一覧取得"""
-    # タスクの存在確認
-    task = db.query(Task).filter(Task.id == task_id).first()
+@router.get("/tasks/{task_id}/comments", response_model=CommentListResponse)
+async def get_comments(
+    task_id: str,
+    limit: int = Query(20, ge=1, le=100),
+    before: Optional[str] = None,
+    after: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db)
+):
+    """特定タスクのコメント一覧取得
+
+    新しい順に limit 件ずつ返す。続き（古いコメント）はレスポンスの next_cursor を after に、
+    前（新しいコメント）は prev_cursor を before に渡して取得する。total はタスクの comment_count。
+    """
+    # タスクの存在確認（件数もタスクの列から取得する）
+    task = await db.get(Task, task_id)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     
-    comments = db.query(TaskComment).filter(TaskComment.task_id == task_id).order_by(TaskComment.created_at.desc()).all()
-    return comments
+    try:
+        query, direction = child_keyset_page(
+            select(TaskComment).where(TaskComment.task_id == task_id), db.bind.dialect.name,
+            COMMENT_ORDER, limit, before, after
+        )
+    except CursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    comments, cursors = finish_child_page(
+        list((await db.execute(query)).scalars()), COMMENT_ORDER, limit, direction, has_cursor=bool(before or after)
+    )
+    return {
+        "comments": comments,
+        "pagination": {"limit": limit, "total": task.comment_count, **cursors}
+    }
 
 @router.post("/tasks/{task_id}/comments", response_model=CommentSchema)
-async def create_comment(task_id: str, comment: CommentCreate, db: Session = Depends(get_db)):
+async def create_comment(task_id: str, comment: CommentCreate, db: AsyncSession = Depends(get_async_db)):
     """コメント作成"""
     # タスクの存在確認
-    task = db.query(Task).filter(Task.id == task_id).first()
+    task = await db.get(Task, task_id)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     
-    db_comment = TaskComment(task_id=task_id, **comment.dict())
+    db_comment = TaskComment(task_id=task_id, **comment.model_dump())
     db.add(db_comment)
-    db.commit()
-    db.refresh(db_comment)
+    await adjust_counts(db, task_id, comments=1)
+    await db.commit()
+    await db.refresh(db_comment)
+    await response_cache.invalidate_task_children(task_id)
+    change_feed.publish("comment", "created", db_comment.id, task_id)
     return db_comment
 
 @router.delete("/comments/{comment_id}")
-async def delete_comment(comment_id: str, db: Session = Depends(get_db)):
+async def delete_comment(comment_id: str, db: AsyncSession = Depends(get_async_db)):
     """コメント削除"""
-    comment = db.query(TaskComment).filter(TaskComment.id == comment_id).first()
+    comment = await db.get(TaskComment, comment_id)
     if not comment:
         raise HTTPException(status_code=404, detail="Comment not found")
     
-    db.delete(comment)
-    db.commit()
+    task_id = comment.task_id
+    await db.delete(comment)
+    await adjust_counts(db, task_id, comments=-1)
+    await db.commit()
+    await response_cache.invalidate_task_children(task_id)
+    change_feed.publish("comment", "deleted", comment_id, task_id)
     return {"message": "Comment deleted successfully"}
\ No newline at end of file
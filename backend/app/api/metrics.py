@@ -0,0 +1,98 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+import os
+
+from app.database.connection import engine, async_engine
+from app.database.pool import pool_status
+from app.database.replicas import replica_router
+from app.middleware.metrics import request_metrics
+from app.services.response_cache import response_cache
+
+router = APIRouter(prefix="/metrics", tags=["metrics"])
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4"
+CACHE_COUNTERS = ("hits", "misses", "stores", "evictions", "expirations", "invalidations")
+
+
+def _pool_lines(pools: dict):
+    yield "# HELP db_pool_checked_out Connections currently checked out"
+    yield "# TYPE db_pool_checked_out gauge"
+    for name, status in pools.items():
+        yield f'db_pool_checked_out{{pool="{name}"}} {status["checked_out"]}'
+    yield "# HELP db_pool_size Configured pool size"
+    yield "# TYPE db_pool_size gauge"
+    for name, status in pools.items():
+        yield f'db_pool_size{{pool="{name}"}} {status["size"]}'
+    yield "# HELP db_pool_wait_seconds Time spent waiting for a pooled connection"
+    yield "# TYPE db_pool_wait_seconds histogram"
+    for name, status in pools.items():
+        wait = status["wait_seconds"]
+        for bound, count in wait["buckets"].items():
+            yield f'db_pool_wait_seconds_bucket{{pool="{name}",le="{bound}"}} {count}'
+        yield f'db_pool_wait_seconds_sum{{pool="{name}"}} {wait["sum"]:.6f}'
+        yield f'db_pool_wait_seconds_count{{pool="{name}"}} {wait["count"]}'
+
+
+def _replica_lines(status: dict):
+    if not status["enabled"]:
+        return
+    yield "# HELP db_replica_eligible Replica is healthy and within the lag limit"
+    yield "# TYPE db_replica_eligible gauge"
+    for replica in status["replicas"]:
+        yield f'db_replica_eligible{{replica="{replica["name"]}"}} {int(replica["eligible"])}'
+    yield "# HELP db_replica_lag_seconds Replication lag at the last check"
+    yield "# TYPE db_replica_lag_seconds gauge"
+    for replica in status["replicas"]:
+        if replica["lag_seconds"] is not None:
+            yield f'db_replica_lag_seconds{{replica="{replica["name"]}"}} {replica["lag_seconds"]:.3f}'
+    yield "# HELP db_reads_total Read sessions by target and reason"
+    yield "# TYPE db_reads_total counter"
+    for target, count in status["reads"].items():
+        yield f'db_reads_total{{target="{target}"}} {count}'
+
+
+def _pools() -> dict:
+    return {
+        "api": pool_status(async_engine.sync_engine),
+        "sync": pool_status(engine),
+        **{replica.name: pool_status(replica.engine.sync_engine) for replica in replica_router.replicas},
+    }
+
+
+def _cache_lines(status: dict):
+    for counter in CACHE_COUNTERS:
+        yield f"# TYPE response_cache_{counter}_total counter"
+        yield f'response_cache_{counter}_total{{backend="{status["backend"]}"}} {status[counter]}'
+
+
+@router.get("", response_class=PlainTextResponse)
+async def get_prometheus_metrics():
+    """Prometheus形式のメトリクス（ルート別レイテンシ・SQL数・DB時間・取得行数、プール、レプリカ、キャッシュ）"""
+    pools = {name: status for name, status in _pools().items() if status is not None}
+    lines = [
+        *request_metrics.prometheus_lines(),
+        *_pool_lines(pools),
+        *_replica_lines(replica_router.status()),
+        *_cache_lines(await response_cache.status()),
+    ]
+    return PlainTextResponse("\n".join(lines) + "\n", media_type=PROMETHEUS_CONTENT_TYPE)
+
+@router.get("/requests")
+async def get_request_metrics():
+    """ルート別のリクエスト統計の要約（ワーカープロセス単位）"""
+    return {"pid": os.getpid(), "routes": request_metrics.snapshot()}
+
+@router.get("/pool")
+async def get_pool_metrics():
+    """コネクションプールの統計取得（ワーカープロセス単位）"""
+    return {"pid": os.getpid(), "pools": _pools()}
+
+@router.get("/replicas")
+async def get_replica_metrics():
+    """読み取りレプリカの状態（死活・遅延）と振り分け件数（ワーカープロセス単位）"""
+    return {"pid": os.getpid(), **replica_router.status()}
+
+@router.get("/cache")
+async def get_cache_metrics():
+    """レスポンスキャッシュの統計取得（ヒット・ミス・追い出し件数など）"""
+    return {"pid": os.getpid(), **(await response_cache.status())}
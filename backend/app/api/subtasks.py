@@ -1,62 +1,150 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from typing import List
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional
 
 
-from app.database.connection import get_db
+from app.database.connection import get_async_db, AsyncSessionLocal
+from app.database.replicas import get_read_db
 from app.models.task import Task
 from app.models.subtask import SubTask
-from app.schemas.subtask import SubTask as SubTaskSchema, SubTaskCreate, SubTaskUpdate
+from app.schemas.subtask import SubTask as SubTaskSchema, SubTaskCreate, SubTaskMove, SubTaskReorder, SubTaskUpdate
+from app.schemas.response import SubTaskListResponse, SubTaskReorderResponse
+from app.services.change_feed import change_feed
+from app.services.pagination import SUBTASK_ORDER, CursorError, child_keyset_page, finish_child_page
+from app.services.response_cache import response_cache
+from app.services.task_counts import adjust_counts
+from app.services.subtask_order import (
+    OrderError, move_subtask as move_subtask_key, next_order_index, rebalance_in_background, reorder_subtasks
+)
 
 router = APIRouter(tags=["subtasks"])
 
-@router.get("/tasks/{task_id}/subtasks", response_model=List[SubTaskSchema])
-async def get_subtasks(task_id: str, db: Session = Depends(get_db)):
-    """特定タスクのサブタスク一覧取得"""
-    # タスクの存在確認
-    task = db.query(Task).filter(Task.id == task_id).first()
+@router.get("/tasks/{task_id}/subtasks", response_model=SubTaskListResponse)
+async def get_subtasks(
+    task_id: str,
+    limit: int = Query(100, ge=1, le=500),
+    before: Optional[str] = None,
+    after: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db)
+):
+    """特定タスクのサブタスク一覧取得
+
+    order_index 順に limit 件ずつ返す。続きはレスポンスの next_cursor を after に、
+    前は prev_cursor を before に渡して取得する。total はタスクの subtask_count。
+    """
+    # タスクの存在確認（件数もタスクの列から取得する）
+    task = await db.get(Task, task_id)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     
-    subtasks = db.query(SubTask).filter(SubTask.task_id == task_id).order_by(SubTask.order_index).all()
-    return subtasks
+    try:
+        query, direction = child_keyset_page(
+            select(SubTask).where(SubTask.task_id == task_id), db.bind.dialect.name,
+            SUBTASK_ORDER, limit, before, after
+        )
+    except CursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    subtasks, cursors = finish_child_page(
+        list((await db.execute(query)).scalars()), SUBTASK_ORDER, limit, direction, has_cursor=bool(before or after)
+    )
+    return {
+        "subtasks": subtasks,
+        "pagination": {"limit": limit, "total": task.subtask_count, **cursors}
+    }
 
 @router.post("/tasks/{task_id}/subtasks", response_model=SubTaskSchema)
-async def create_subtask(task_id: str, subtask: SubTaskCreate, db: Session = Depends(get_db)):
+async def create_subtask(task_id: str, subtask: SubTaskCreate, db: AsyncSession = Depends(get_async_db)):
     """サブタスク作成"""
     # タスクの存在確認
-    task = db.query(Task).filter(Task.id == task_id).first()
+    task = await db.get(Task, task_id)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     
-    db_subtask = SubTask(task_id=task_id, **subtask.dict())
+    db_subtask = SubTask(task_id=task_id, **subtask.model_dump())
+    if db_subtask.order_index is None:
+        db_subtask.order_index = await next_order_index(db, task_id)
     db.add(db_subtask)
-    db.commit()
-    db.refresh(db_subtask)
+    await adjust_counts(db, task_id, subtasks=1, completed=1 if db_subtask.completed else 0)
+    await db.commit()
+    await db.refresh(db_subtask)
+    await response_cache.invalidate_task_children(task_id)
+    change_feed.publish("subtask", "created", db_subtask.id, task_id)
     return db_subtask
 
 @router.put("/subtasks/{subtask_id}", response_model=SubTaskSchema)
-async def update_subtask(subtask_id: str, subtask_update: SubTaskUpdate, db: Session = Depends(get_db)):
+async def update_subtask(subtask_id: str, subtask_update: SubTaskUpdate, db: AsyncSession = Depends(get_async_db)):
     """サブタスク更新"""
-    subtask = db.query(SubTask).filter(SubTask.id == subtask_id).first()
+    subtask = await db.get(SubTask, subtask_id)
     if not subtask:
         raise HTTPException(status_code=404, detail="Subtask not found")
     
-    update_data = subtask_update.dict(exclude_unset=True)
+    update_data = subtask_update.model_dump(exclude_unset=True)
+    was_completed = bool(subtask.completed)
     for field, value in update_data.items():
         setattr(subtask, field, value)
     
-    db.commit()
-    db.refresh(subtask)
+    completed = bool(subtask.completed) - was_completed
+    await adjust_counts(db, subtask.task_id, completed=completed)
+    await db.commit()
+    await db.refresh(subtask)
+    await response_cache.invalidate_task_children(subtask.task_id)
+    change_feed.publish("subtask", "updated", subtask.id, subtask.task_id)
     return subtask
 
 @router.delete("/subtasks/{subtask_id}")
-async def delete_subtask(subtask_id: str, db: Session = Depends(get_db)):
+async def delete_subtask(subtask_id: str, db: AsyncSession = Depends(get_async_db)):
     """サブタスク削除"""
-    subtask = db.query(SubTask).filter(SubTask.id == subtask_id).first()
+    subtask = await db.get(SubTask, subtask_id)
+    if not subtask:
+        raise HTTPException(status_code=404, detail="Subtask not found")
+    
+    task_id = subtask.task_id
+    await db.delete(subtask)
+    await adjust_counts(db, task_id, subtasks=-1, completed=-1 if subtask.completed else 0)
+    await db.commit()
+    await response_cache.invalidate_task_children(task_id)
+    change_feed.publish("subtask", "deleted", subtask_id, task_id)
+    return {"message": "Subtask deleted successfully"}
+
+@router.post("/subtasks/{subtask_id}/move", response_model=SubTaskSchema)
+async def move_subtask(
+    subtask_id: str,
+    move: SubTaskMove,
+    background_tasks: BackgroundTasks,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """サブタスク移動（移動するサブタスクの order_index のみ更新）"""
+    subtask = await db.get(SubTask, subtask_id)
     if not subtask:
         raise HTTPException(status_code=404, detail="Subtask not found")
     
-    db.delete(subtask)
-    db.commit()
-    return {"message": "Subtask deleted successfully"}
\ No newline at end of file
+    try:
+        needs_rebalance = await move_subtask_key(db, subtask, move.after_id, move.before_id)
+    except OrderError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    await adjust_counts(db, subtask.task_id)
+    await db.commit()
+    await db.refresh(subtask)
+    if needs_rebalance:
+        background_tasks.add_task(rebalance_in_background, AsyncSessionLocal, subtask.task_id)
+    await response_cache.invalidate_task_children(subtask.task_id)
+    change_feed.publish("subtask", "updated", subtask.id, subtask.task_id)
+    return subtask
+
+@router.put("/tasks/{task_id}/subtasks/order", response_model=SubTaskReorderResponse)
+async def reorder_task_subtasks(task_id: str, reorder: SubTaskReorder, db: AsyncSession = Depends(get_async_db)):
+    """サブタスク一括並び替え（全サブタスクのidを新しい順に指定、1ステートメントで更新）"""
+    task = await db.get(Task, task_id)
+    if not task:
+        raise HTTPException(status_code=404, detail="Task not found")
+    
+    try:
+        reordered = await reorder_subtasks(db, task_id, reorder.ids)
+    except OrderError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    await adjust_counts(db, task_id)
+    await db.commit()
+    await response_cache.invalidate_task_children(task_id)
+    change_feed.publish("subtask", "reordered", None, task_id)
+    return {"task_id": task_id, "reordered": reordered}
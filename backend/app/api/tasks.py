@@ -1,22 +1,57 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional, Dict
+import io
+import logging
 
-from datetime import datetime
+from datetime import date, datetime, time, timedelta
 
-from app.database.connection import get_db
+from app.database.connection import get_async_db
+from app.database.replicas import get_read_db, replica_router
 from app.models.task import Task, TaskCategory, TaskPriority, TaskUrgency, TaskStatus
 from app.models.subtask import SubTask
 from app.models.comment import TaskComment
 from app.schemas.task import (
     Task as TaskSchema, TaskCreate, TaskUpdate, TaskDetail, 
-    TaskWithCounts, MatrixTask, CalendarEvent
+    TaskWithCounts, MatrixTask, CalendarEvent,
+    TaskBulkCreate, TaskBulkUpdate, TaskBulkDelete
 )
+from app.schemas.response import (
+    BulkResponse, CalendarResponse, ImportResponse, MatrixResponse, MatrixSummaryResponse, TaskListResponse
+)
+from app.services.task_query import (
+    COUNT_FIELDS, LIST_FIELDS, TASK_FIELDS, FieldsError, count_of, parse_fields, parse_names,
+    render_rows, rows_to_tasks_with_counts, task_columns, with_counts
+)
+from app.services.task_detail import DETAIL_INCLUDES, EmbedPage, load_task_detail
+from app.services.bulk import BulkOutcome, bulk_create, bulk_update, bulk_delete
+from app.services.etag import TASK_TABLES, TASK_TREE_TABLES, row_validators, validators_for
+from app.services.change_feed import change_feed
+from app.services.export import EXPORT_MEDIA_TYPES, stream_export
+from app.services.importer import (
+    IMPORT_BATCH_SIZE, ImportStats, iter_batches, iter_records, write_batch_async
+)
+from app.services.calendar import MAX_RANGE_DAYS, build_calendar, calendar_cache, event_dates, months_range
+from app.services.matrix import build_matrix
+from app.services.search import ranked_search, search_filter, search_terms
+from app.services.summary_cache import summary_cache, summary_key
+from app.services.response_cache import (
+    TAG_CALENDAR, TAG_LIST, TAG_MATRIX, TAG_SEARCH, cache_key, response_cache, task_tag
+)
+from app.services.pagination import (
+    KEYSET_SORT_COLUMNS, CursorError, keyset_page, finish_keyset_page
+)
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/tasks", tags=["tasks"])
 
-@router.get("/", response_model=dict)
+@router.get("/", response_model=TaskListResponse)
 async def get_tasks(
+    request: Request,
     category: Optional[TaskCategory] = None,
     priority: Optional[TaskPriority] = None,
     urgency: Optional[TaskUrgency] = None,
@@ -26,22 +61,81 @@ async def get_tasks(
     limit: int = Query(20, ge=1, le=100),
     sort_by: str = Query("created_at"),
     sort_order: str = Query("desc"),
-    db: Session = Depends(get_db)
+    paging: str = Query("offset", pattern="^(offset|cursor)$"),
+    cursor: Optional[str] = None,
+    include_total: bool = True,
+    fields: Optional[str] = Query(None, description="返す項目（カンマ区切り、idは常に含む）"),
+    layout: str = Query("rows", pattern="^(rows|columns)$"),
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """タスク一覧取得"""
-    query = db.query(Task)
+    """タスク一覧取得
+
+    paging=cursor の場合は sort_by + id のキーセットでページングし、
+    レスポンスの next_cursor / prev_cursor を cursor に渡して前後のページを取得する。
+    include_total=false で総件数の集計を省略できる。
+    fields= で取得する列をSQLの段階で絞り、layout=columns で項目ごとの配列として返す。
+    """
+    try:
+        output_fields = parse_fields(fields, LIST_FIELDS)
+    except FieldsError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    keyset = paging == "cursor" or cursor
+    # select を組み立てる前に検証する（未知の列名は getattr で失敗するため）
+    if sort_by not in TASK_FIELDS:
+        raise HTTPException(status_code=400, detail=f"Unknown sort_by '{sort_by}'")
+    if keyset and sort_by not in KEYSET_SORT_COLUMNS:
+        raise HTTPException(status_code=400, detail=f"sort_by '{sort_by}' is not supported for cursor paging")
+    lookup = await response_cache.lookup(request, cache_key(
+        "tasks:list", category=category, priority=priority, urgency=urgency, status=status,
+        search=search, page=page, limit=limit, sort_by=sort_by, sort_order=sort_order,
+        paging=paging, cursor=cursor, include_total=include_total,
+        fields=",".join(output_fields), layout=layout
+    ), [TAG_LIST])
+    if lookup.response is not None:
+        return lookup.response
+    validators = await validators_for(request, db, TASK_TREE_TABLES)
+    if validators.matches(request):
+        return validators.not_modified()
+
+    selected = [name for name in output_fields if name in TASK_FIELDS]
+    counts = [name for name in output_fields if name in COUNT_FIELDS]
+    # カーソル生成にはソート列が必要
+    if keyset and sort_by not in selected:
+        selected.append(sort_by)
+    query = select(*task_columns(selected))
     
     # フィルタリング
     if category:
-        query = query.filter(Task.category == category)
+        query = query.where(Task.category == category)
     if priority:
-        query = query.filter(Task.priority == priority)
+        query = query.where(Task.priority == priority)
     if urgency:
-        query = query.filter(Task.urgency == urgency)
+        query = query.where(Task.urgency == urgency)
     if status:
-        query = query.filter(Task.status == status)
+        query = query.where(Task.status == status)
     if search:
-        query = query.filter(Task.title.contains(search))
+        query = query.where(search_filter(db.bind.dialect.name, search))
+    
+    # キーセットページング（OFFSETを使わない）
+    if keyset:
+        try:
+            page_query, direction = keyset_page(
+                with_counts(query, counts), db.bind.dialect.name, sort_by, sort_order, limit, cursor
+            )
+        except CursorError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        total = await db.scalar(count_of(query)) if include_total else None
+        rows, cursors = finish_keyset_page(
+            (await db.execute(page_query)).all(), sort_by, sort_order, limit, direction, has_cursor=bool(cursor)
+        )
+        return await lookup.store({
+            "tasks": render_rows(rows, output_fields, layout),
+            "pagination": {
+                "limit": limit,
+                "total": total,
+                **cursors
+            }
+        }, validators)
     
     # ソート
     if sort_order == "desc":
@@ -50,201 +144,338 @@ async def get_tasks(
         query = query.order_by(getattr(Task, sort_by))
     
     # ページング
-    total = query.count()
-    tasks = query.offset((page - 1) * limit).limit(limit).all()
-    
-    # 集計情報を追加
-    tasks_with_counts = []
-    for task in tasks:
-        subtask_count = db.query(SubTask).filter(SubTask.task_id == task.id).count()
-        completed_subtasks = db.query(SubTask).filter(
-            SubTask.task_id == task.id, SubTask.completed == True
-        ).count()
-        comment_count = db.query(TaskComment).filter(TaskComment.task_id == task.id).count()
-        
-        task_dict = TaskSchema.from_orm(task).dict()
-        task_dict.update({
-            "subtask_count": subtask_count,
-            "completed_subtasks": completed_subtasks,
-            "comment_count": comment_count
-        })
-        tasks_with_counts.append(task_dict)
+    total = await db.scalar(count_of(query)) if include_total else None
+    rows = (await db.execute(with_counts(query, counts).offset((page - 1) * limit).limit(limit))).all()
     
-    return {
-        "tasks": tasks_with_counts,
+    # 集計情報を1クエリで取得済み
+    return await lookup.store({
+        "tasks": render_rows(rows, output_fields, layout),
         "pagination": {
             "page": page,
             "limit": limit,
             "total": total,
-            "total_pages": (total + limit - 1) // limit
+            "total_pages": (total + limit - 1) // limit if total is not None else None
         }
-    }
+    }, validators)
 
 @router.post("/", response_model=TaskSchema)
-async def create_task(task: TaskCreate, db: Session = Depends(get_db)):
+async def create_task(task: TaskCreate, db: AsyncSession = Depends(get_async_db)):
     """タスク作成"""
-    db_task = Task(**task.dict())
+    db_task = Task(**task.model_dump())
     db.add(db_task)
-    db.commit()
-    db.refresh(db_task)
+    await db.commit()
+    await db.refresh(db_task)
+    summary_cache.apply(None, summary_key(db_task))
+    calendar_cache.invalidate_dates(event_dates(db_task))
+    await response_cache.invalidate_task()
+    change_feed.publish("task", "created", db_task.id)
     return db_task
 
+async def _finish_bulk(db: AsyncSession, outcome: BulkOutcome, atomic: bool, action: str) -> dict:
+    """一括操作をコミットしてレスポンスを生成（atomic時はエラーがあれば全件取り消し）"""
+    if atomic and outcome.errors:
+        await db.rollback()
+        raise HTTPException(status_code=422, detail={"errors": outcome.errors})
+    await db.commit()
+    outcome.apply_to_summary_cache()
+    calendar_cache.invalidate()
+    task_ids = [item["id"] if isinstance(item, dict) else item.id for item in outcome.succeeded]
+    await response_cache.invalidate_task(*task_ids)
+    for task_id in task_ids:
+        change_feed.publish("task", action, task_id)
+    return {
+        "succeeded": [
+            item if isinstance(item, dict) else TaskSchema.model_validate(item).model_dump()
+            for item in outcome.succeeded
+        ],
+        "errors": sorted(outcome.errors, key=lambda error: error["index"])
+    }
+
 # 特定パスのエンドポイントを{task_id}より前に配置
-@router.get("/matrix", response_model=dict)
-async def get_matrix_data(db: Session = Depends(get_db)):
-    """マトリックス表示データ取得"""
+@router.post("/bulk", response_model=BulkResponse)
+async def create_tasks_bulk(
+    payload: TaskBulkCreate,
+    atomic: bool = False,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """タスク一括作成（1トランザクション・複数行INSERT）"""
+    return await _finish_bulk(db, await bulk_create(db, payload.tasks), atomic, "created")
+
+@router.put("/bulk", response_model=BulkResponse)
+async def update_tasks_bulk(
+    payload: TaskBulkUpdate,
+    atomic: bool = False,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """タスク一括更新（各要素は id + TaskUpdateの項目）"""
+    return await _finish_bulk(db, await bulk_update(db, payload.items), atomic, "updated")
+
+@router.delete("/bulk", response_model=BulkResponse)
+async def delete_tasks_bulk(
+    payload: TaskBulkDelete,
+    atomic: bool = False,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """タスク一括削除"""
+    return await _finish_bulk(db, await bulk_delete(db, payload.ids), atomic, "deleted")
+
+@router.get("/export")
+async def export_tasks(request: Request, format: str = Query("ndjson", pattern="^(ndjson|csv)$")):
+    """タスク全件エクスポート（サブタスク・コメント含む、ストリーミング）"""
+    return StreamingResponse(
+        stream_export(replica_router.session_factory(request), format),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="tasks.{format}"'}
+    )
+
+@router.get("/search", response_model=TaskListResponse)
+async def search_tasks(
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=200),
+    page: int = Query(1, ge=1),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """タスク全文検索（タイトル・説明・メモ・コメント、関連度順）"""
+    lookup = await response_cache.lookup(
+        request, cache_key("tasks:search", q=q, page=page, limit=limit), [TAG_SEARCH]
+    )
+    if lookup.response is not None:
+        return lookup.response
+    validators = await validators_for(request, db, TASK_TREE_TABLES)
+    if validators.matches(request):
+        return validators.not_modified()
+    if not search_terms(q):
+        return await lookup.store({"tasks": [], "pagination": {"page": page, "limit": limit}}, validators)
+    query = with_counts(ranked_search(db.bind.dialect.name, q)).offset((page - 1) * limit).limit(limit)
+    rows = (await db.execute(query)).all()
+    tasks = rows_to_tasks_with_counts(
+        (task, subtask_count, completed_subtasks, comment_count)
+        for task, _, subtask_count, completed_subtasks, comment_count in rows
+    )
+    return await lookup.store({
+        "tasks": [
+            {**task.model_dump(), "rank": row.rank} for task, row in zip(tasks, rows)
+        ],
+        "pagination": {"page": page, "limit": limit}
+    }, validators)
+
+@router.post("/import", response_model=ImportResponse)
+async def import_tasks(
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(None, pattern="^(ndjson|csv)$"),
+    skip: int = Query(0, ge=0),
+    batch_size: int = Query(IMPORT_BATCH_SIZE, ge=1, le=10000),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """タスク一括インポート（エクスポート形式、バッチ単位でコミット）
+
+    skip には前回の last_record を指定すると続きから再開できる。
+    """
+    if format is None:
+        format = "csv" if (file.filename or "").lower().endswith(".csv") else "ndjson"
+
+    stream = io.TextIOWrapper(file.file, encoding="utf-8-sig", newline="")
+    batches = iter_batches(iter_records(stream, format), batch_size, skip)
+    stats = ImportStats(last_record=skip)
     try:
-        # 全タスクを取得（完了以外）
-        tasks = db.query(Task).filter(Task.status != TaskStatus.COMPLETED).all()
-        print(f"Found {len(tasks)} tasks for matrix")
-        
-        matrix = {
-            "high_high": [],
-            "high_medium": [],
-            "high_low": [],
-            "medium_high": [],
-            "medium_medium": [],
-            "medium_low": [],
-            "low_high": [],
-            "low_medium": [],
-            "low_low": []
-        }
-        
-        for task in tasks:
-            key = f"{task.priority.value}_{task.urgency.value}"
-            print(f"Task: {task.title}, Key: {key}")
-            
-            task_data = {
-                "id": task.id,
-                "title": task.title,
-                "priority": task.priority.value,
-                "urgency": task.urgency.value,
-                "status": task.status.value,
-                "progress": task.progress
-            }
-            
-            if key in matrix:
-                matrix[key].append(task_data)
-            else:
-                print(f"Unknown key: {key}")
-        
-        # 象限別の集計（実際のデータ分布に合わせて計算）
-        quadrant_counts = {
-            "quadrant_1": len(matrix["high_high"]),
-            "quadrant_2": len(matrix["high_low"]),
-            "quadrant_3": len(matrix["low_high"]),
-            "quadrant_4": len(matrix["medium_low"]) + len(matrix["low_medium"]) + len(matrix["low_low"])
-        }
-        
-        result = {
-            "matrix": matrix,
-            "summary": {
-                "total_tasks": len(tasks),
-                "by_quadrant": quadrant_counts
-            }
-        }
-        
-        print(f"Matrix result: {result}")
-        return result
-        
+        while True:
+            # 解析と検証はCPU処理のためスレッドで行う
+            batch = await run_in_threadpool(next, batches, None)
+            if batch is None:
+                break
+            await write_batch_async(db, batch)
+            stats.add(batch)
+    except Exception:
+        await db.rollback()
+        raise HTTPException(
+            status_code=500,
+            detail={"message": "Import failed", "resume_from": stats.last_record}
+        )
+    finally:
+        summary_cache.invalidate()
+        calendar_cache.invalidate()
+        # 既存IDは取り込まないため一覧系のみ無効化する
+        await response_cache.invalidate_task()
+        # 件数が多いため1イベントにまとめる
+        if stats.imported_tasks:
+            change_feed.publish("task", "imported", None)
+    return stats.as_dict()
+
+@router.get("/matrix", response_model=MatrixResponse)
+async def get_matrix_data(
+    request: Request,
+    limit_per_cell: Optional[int] = Query(None, ge=1),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """マトリックス表示データ取得
+
+    タスクはMatrixTaskの列のみ取得し、セル別件数は同じクエリの結果から求める。
+    limit_per_cell を指定すると各セルの新しい順に上位N件のみ返す。
+    """
+    lookup = await response_cache.lookup(
+        request, cache_key("tasks:matrix", limit_per_cell=limit_per_cell), [TAG_MATRIX]
+    )
+    if lookup.response is not None:
+        return lookup.response
+    validators = await validators_for(request, db, TASK_TABLES)
+    if validators.matches(request):
+        return validators.not_modified()
+    try:
+        # 件数もセルのタスクと同じ読み取りから求める（集計キャッシュは /matrix/summary のみ）
+        matrix = await build_matrix(db, limit_per_cell)
     except Exception as e:
-        print(f"Matrix API error: {e}")
+        logger.exception("Matrix API error")
         raise HTTPException(status_code=500, detail=str(e))
+    return await lookup.store(matrix, validators)
+
+@router.get("/matrix/summary", response_model=MatrixSummaryResponse)
+async def get_matrix_summary(request: Request, db: AsyncSession = Depends(get_read_db)):
+    """マトリックス集計取得（キャッシュから返す）"""
+    lookup = await response_cache.lookup(request, cache_key("tasks:matrix_summary"), [TAG_MATRIX])
+    if lookup.response is not None:
+        return lookup.response
+    validators = await validators_for(request, db, TASK_TABLES)
+    if validators.matches(request):
+        return validators.not_modified()
+    # 検証子と同じバージョンの集計を返す（他ワーカーでの書き込み後は同じ読み取り先から再集計）
+    await summary_cache.sync(db, validators.versions[Task.__tablename__])
+    return await lookup.store(summary_cache.summary(), validators)
 
-@router.get("/calendar", response_model=dict)
+@router.get("/calendar", response_model=CalendarResponse)
 async def get_calendar_data(
-    year: int = Query(...),
-    month: int = Query(..., ge=1, le=12),
-    db: Session = Depends(get_db)
+    request: Request,
+    year: Optional[int] = Query(None, ge=1, le=9999),
+    month: Optional[int] = Query(None, ge=1, le=12),
+    months: int = Query(1, ge=1, le=12),
+    week_of: Optional[date] = None,
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """カレンダー表示データ取得"""
-    # 指定月のタスクを取得
-    from datetime import datetime, timedelta
-    start_date = datetime(year, month, 1)
-    if month == 12:
-        end_date = datetime(year + 1, 1, 1) - timedelta(days=1)
-    else:
-        end_date = datetime(year, month + 1, 1) - timedelta(days=1)
-    
-    tasks = db.query(Task).filter(
-        (Task.due_date.between(start_date, end_date)) |
-        (Task.planned_start_date.between(start_date, end_date)) |
-        (Task.actual_start_date.between(start_date, end_date))
-    ).all()
-    
-    calendar_data: Dict[str, List[dict]] = {}
-    due_count = start_count = milestone_count = 0
-    
-    for task in tasks:
-        # 期限
-        if task.due_date and start_date <= task.due_date <= end_date:
-            date_key = task.due_date.strftime("%Y-%m-%d")
-            if date_key not in calendar_data:
-                calendar_data[date_key] = []
-            calendar_data[date_key].append({
-                "id": task.id,
-                "title": task.title,
-                "type": "due",
-                "priority": task.priority,
-                "urgency": task.urgency
-            })
-            due_count += 1
-        
-        # 開始予定
-        if task.planned_start_date and start_date <= task.planned_start_date <= end_date:
-            date_key = task.planned_start_date.strftime("%Y-%m-%d")
-            if date_key not in calendar_data:
-                calendar_data[date_key] = []
-            calendar_data[date_key].append({
-                "id": task.id,
-                "title": task.title,
-                "type": "start",
-                "priority": task.priority,
-                "urgency": task.urgency
-            })
-            start_count += 1
-    
-    return {
-        "calendar_data": calendar_data,
-        "summary": {
-            "total_events": due_count + start_count + milestone_count,
-            "due_dates": due_count,
-            "start_dates": start_count,
-            "milestones": milestone_count
-        }
-    }
+    """カレンダー表示データ取得
+
+    範囲は次のいずれかで指定する（終了日を含む）。
+    - year + month（months で複数月）
+    - week_of: その日を含む週（月曜始まり）
+    - start_date + end_date
+    """
+    try:
+        if year is not None and month is not None:
+            start, end = months_range(year, month, months)
+        elif week_of is not None:
+            start = datetime.combine(week_of - timedelta(days=week_of.weekday()), time.min)
+            end = start + timedelta(days=7)
+        elif start_date is not None and end_date is not None:
+            start = datetime.combine(start_date, time.min)
+            end = datetime.combine(end_date, time.min) + timedelta(days=1)
+        else:
+            raise HTTPException(status_code=400, detail="Specify year and month, week_of, or start_date and end_date")
+    except (OverflowError, ValueError):
+        # 終了（翌日0時・翌月1日）が9999年を超える範囲
+        raise HTTPException(status_code=400, detail="Date range must end within year 9999")
+
+    if end <= start or (end - start).days > MAX_RANGE_DAYS:
+        raise HTTPException(status_code=400, detail=f"Date range must be between 1 and {MAX_RANGE_DAYS} days")
+    # 指定方法によらず解決後の範囲をキーにする
+    lookup = await response_cache.lookup(
+        request, cache_key("tasks:calendar", start=start, end=end), [TAG_CALENDAR]
+    )
+    if lookup.response is not None:
+        return lookup.response
+    validators = await validators_for(request, db, TASK_TABLES)
+    if validators.matches(request):
+        return validators.not_modified()
+    calendar = await build_calendar(
+        db, start, end, store=not replica_router.may_be_stale(request),
+        version=validators.versions[Task.__tablename__]
+    )
+    return await lookup.store(calendar, validators)
 
 # 動的パスは最後に配置
 @router.get("/{task_id}", response_model=TaskDetail)
-async def get_task(task_id: str, db: Session = Depends(get_db)):
-    """タスク詳細取得"""
-    task = db.query(Task).filter(Task.id == task_id).first()
-    if not task:
+async def get_task(
+    task_id: str,
+    request: Request,
+    fields: Optional[str] = Query(None, description="返す項目（カンマ区切り、idは常に含む）"),
+    include: str = Query("subtasks,comments", description="埋め込む関連データ（subtasks, comments）"),
+    subtask_limit: int = Query(100, ge=1, le=500),
+    subtask_offset: int = Query(0, ge=0),
+    comment_limit: int = Query(20, ge=1, le=100),
+    comment_offset: int = Query(0, ge=0),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """タスク詳細取得
+
+    クエリ数は関連データの件数によらず一定（本体+集計で1、埋め込むものごとに1）。
+    コメントは新しい順に comment_limit 件まで、続きは *_offset で取得する。
+    """
+    try:
+        columns = parse_fields(fields)
+        embeds = parse_names(include, DETAIL_INCLUDES, "include")
+    except FieldsError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    lookup = await response_cache.lookup(request, cache_key(
+        "tasks:detail", task_id=task_id, fields=",".join(columns), include=",".join(embeds),
+        subtask_limit=subtask_limit, subtask_offset=subtask_offset,
+        comment_limit=comment_limit, comment_offset=comment_offset
+    ), [task_tag(task_id)])
+    if lookup.response is not None:
+        return lookup.response
+    # 検証子はこのタスク行のみから作る（他のタスクやその子レコードへの書き込みでは変わらない）
+    state = (await db.execute(
+        select(
+            Task.updated_at, Task.children_version,
+            Task.subtask_count, Task.completed_subtasks, Task.comment_count
+        ).where(Task.id == task_id)
+    )).first()
+    if state is None:
         raise HTTPException(status_code=404, detail="Task not found")
-    return task
+    validators = row_validators(request, *state)
+    if validators.matches(request):
+        return validators.not_modified()
+    detail = await load_task_detail(
+        db, task_id, columns, embeds,
+        EmbedPage(subtask_limit, subtask_offset), EmbedPage(comment_limit, comment_offset)
+    )
+    if detail is None:
+        raise HTTPException(status_code=404, detail="Task not found")
+    return await lookup.store(detail, validators)
 
 @router.put("/{task_id}", response_model=TaskSchema)
-async def update_task(task_id: str, task_update: TaskUpdate, db: Session = Depends(get_db)):
+async def update_task(task_id: str, task_update: TaskUpdate, db: AsyncSession = Depends(get_async_db)):
     """タスク更新"""
-    task = db.query(Task).filter(Task.id == task_id).first()
+    task = await db.get(Task, task_id)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     
-    update_data = task_update.dict(exclude_unset=True)
+    before = summary_key(task)
+    before_dates = event_dates(task)
+    update_data = task_update.model_dump(exclude_unset=True)
     for field, value in update_data.items():
         setattr(task, field, value)
     
-    db.commit()
-    db.refresh(task)
+    await db.commit()
+    await db.refresh(task)
+    summary_cache.apply(before, summary_key(task))
+    calendar_cache.invalidate_dates(before_dates + event_dates(task))
+    await response_cache.invalidate_task(task.id)
+    change_feed.publish("task", "updated", task.id)
     return task
 
 @router.delete("/{task_id}")
-async def delete_task(task_id: str, db: Session = Depends(get_db)):
+async def delete_task(task_id: str, db: AsyncSession = Depends(get_async_db)):
     """タスク削除"""
-    task = db.query(Task).filter(Task.id == task_id).first()
+    task = await db.get(Task, task_id)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     
-    db.delete(task)
-    db.commit()
+    before = summary_key(task)
+    before_dates = event_dates(task)
+    await db.delete(task)
+    await db.commit()
+    summary_cache.apply(before, None)
+    calendar_cache.invalidate_dates(before_dates)
+    await response_cache.invalidate_task(task_id)
+    change_feed.publish("task", "deleted", task_id)
     return {"message": "Task deleted successfully"}
\ No newline at end of file
@@ -0,0 +1,91 @@
+"""
+テーブル単位の変更バージョン管理
+
+接続で実行された insert/update/delete（ORMのflushを含む）の対象テーブルを記録し、
+コミット直前に同じトランザクション内で change_versions の該当行を加算する。
+ETagなどの検証子は change_versions を1回読むだけで作れる。
+
+セッションを経由しない書き込み（COPYなど）は mark_changed() で明示する。
+表示内容を変えない更新（子レコードの件数の加算など）は execution_options(skip_change_version=True) で除外する。
+
+change_versions の各行は、そのテーブルに書き込む全トランザクションが更新するため、
+PostgreSQLでは同じテーブルへの書き込みのコミットが行ロックで直列化される。
+ロックの保持をコミット直前の1文に限り、件数の加算では tasks 行を更新しない。
+"""
+from datetime import datetime, timezone
+from typing import Iterable
+
+from sqlalchemy import Delete, Insert, Update, event, insert, select, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app.database.connection import Base
+from app.models.change_version import ChangeVersion
+
+TRACKED_TABLES = ("tasks", "subtasks", "task_comments")
+# ON DELETE CASCADE で連動して削除されるテーブル
+CASCADE_TABLES = {"tasks": ("subtasks", "task_comments")}
+
+_INFO_KEY = "changed_tables"
+SKIP_CHANGE_VERSION = "skip_change_version"
+
+
+def _changed_set(info: dict) -> set:
+    return info.setdefault(_INFO_KEY, set())
+
+
+def mark_changed(session: Session, *tables: str) -> None:
+    """コミット時にバージョンを加算するテーブルを記録"""
+    _changed_set(session.info).update(table for table in tables if table in TRACKED_TABLES)
+
+
+@event.listens_for(Engine, "after_execute")
+def _after_execute(conn, clauseelement, multiparams, params, execution_options, result):
+    # ORMのflush・一括処理も最終的にここを通る
+    # （SessionのORMイベントは yield_per + selectinload と併用できないため接続レベルで記録する）
+    if isinstance(clauseelement, (Insert, Update, Delete)):
+        if clauseelement.get_execution_options().get(SKIP_CHANGE_VERSION):
+            return
+        table = clauseelement.table.name
+        if table in TRACKED_TABLES:
+            changed = _changed_set(conn.info)
+            changed.add(table)
+            if isinstance(clauseelement, Delete):
+                changed.update(CASCADE_TABLES.get(table, ()))
+
+
+@event.listens_for(Engine, "commit")
+@event.listens_for(Engine, "rollback")
+def _end_transaction(conn):
+    conn.info.pop(_INFO_KEY, None)
+
+
+@event.listens_for(Session, "before_commit")
+def _before_commit(session):
+    # commit時のflushはこのイベントの後に行われるため先に反映する
+    session.flush()
+    changed = session.info.pop(_INFO_KEY, set()) | session.connection().info.pop(_INFO_KEY, set())
+    if changed:
+        session.execute(
+            update(ChangeVersion)
+            .where(ChangeVersion.table_name.in_(sorted(changed)))
+            .values(version=ChangeVersion.version + 1, changed_at=datetime.now(timezone.utc))
+        )
+
+
+@event.listens_for(Session, "after_rollback")
+def _after_rollback(session):
+    session.info.pop(_INFO_KEY, None)
+
+
+def seed_versions(connection, tables: Iterable[str] = TRACKED_TABLES) -> None:
+    """バージョン行を作成（作成済みの行は変更しない）"""
+    existing = set(connection.scalars(select(ChangeVersion.table_name)))
+    missing = [{"table_name": table, "version": 0} for table in tables if table not in existing]
+    if missing:
+        connection.execute(insert(ChangeVersion.__table__), missing)
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _after_create(target, connection, **kw):
+    seed_versions(connection)
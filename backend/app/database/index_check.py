@@ -0,0 +1,186 @@
+"""
+EXPLAINの実行計画から想定インデックスの利用を検証する
+
+代表クエリはAPIと同じ組み立て関数で作る（SQLiteでは日時を julianday() で比較・ソートするなど、
+ダイアレクトによって式が変わるため）。
+"""
+import json
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Callable, List, Optional, Set
+
+from sqlalchemy import func, select
+from sqlalchemy.engine import Connection
+
+from app.models.task import Task, TaskPriority, TaskUrgency, TaskStatus
+from app.models.subtask import SubTask
+from app.models.comment import TaskComment
+from app.services.calendar import events_statement
+from app.services.matrix import cell_tasks_statement
+from app.services.pagination import COMMENT_ORDER, child_keyset_page, keyset_page
+
+
+@dataclass
+class IndexCheck:
+    name: str
+    # ダイアレクト名を受け取り、検証するselectを返す
+    build: Callable[[str], object]
+    expected: Set[str]
+    # SQLiteで想定するインデックス（式インデックスなど名前が異なる場合）
+    sqlite_expected: Optional[Set[str]] = None
+
+    def expected_for(self, dialect_name: str) -> Set[str]:
+        if dialect_name == "sqlite" and self.sqlite_expected is not None:
+            return self.sqlite_expected
+        return self.expected
+
+
+@dataclass
+class IndexCheckResult:
+    check: IndexCheck
+    used: Set[str]
+    plan: str
+    expected: Set[str]
+
+    @property
+    def ok(self) -> bool:
+        return bool(self.used & self.expected)
+
+
+SUPPORTED_DIALECTS = ("postgresql", "sqlite")
+
+_SAMPLE_ID = "00000000-0000-0000-0000-000000000000"
+
+
+def _month_range():
+    start = datetime(2024, 1, 1)
+    return start, start + timedelta(days=31)
+
+
+# 実際のアクセスパターンに対応する代表クエリ
+CHECKS: List[IndexCheck] = [
+    IndexCheck(
+        "マトリックス（完了以外）",
+        lambda dialect: cell_tasks_statement(),
+        {"idx_tasks_matrix_open"},
+    ),
+    IndexCheck(
+        "マトリックス（セルごとの上位N件）",
+        lambda dialect: cell_tasks_statement(limit_per_cell=20),
+        {"idx_tasks_matrix_open"},
+    ),
+    IndexCheck(
+        "ステータス絞り込み",
+        lambda dialect: select(Task.id).where(Task.status == TaskStatus.IN_PROGRESS),
+        {"idx_tasks_status"},
+    ),
+    IndexCheck(
+        "優先度・緊急度絞り込み",
+        lambda dialect: select(Task.id).where(Task.priority == TaskPriority.HIGH, Task.urgency == TaskUrgency.HIGH),
+        {"idx_tasks_priority_urgency", "idx_tasks_matrix_open"},
+    ),
+    IndexCheck(
+        "一覧（作成日時順のキーセット）",
+        lambda dialect: keyset_page(select(Task.id), dialect, "created_at", "desc", 20)[0],
+        {"idx_tasks_created_at"},
+        sqlite_expected={"idx_tasks_created_at_julianday"},
+    ),
+    IndexCheck(
+        "カレンダー（期限）",
+        lambda dialect: select(Task.id).where(Task.due_date.between(*_month_range())),
+        {"idx_tasks_due_date"},
+    ),
+    IndexCheck(
+        "カレンダー（開始予定）",
+        lambda dialect: select(Task.id).where(Task.planned_start_date.between(*_month_range())),
+        {"idx_tasks_planned_start_date"},
+    ),
+    IndexCheck(
+        "カレンダー（期限・開始予定のUNION）",
+        lambda dialect: events_statement(*_month_range()),
+        {"idx_tasks_due_date", "idx_tasks_planned_start_date"},
+    ),
+    IndexCheck(
+        "完了サブタスク数",
+        lambda dialect: select(func.count(SubTask.id))
+        .where(SubTask.task_id == _SAMPLE_ID, SubTask.completed.is_(True)),
+        {"idx_subtasks_task_completed"},
+    ),
+    IndexCheck(
+        "サブタスク一覧（並び順）",
+        lambda dialect: select(SubTask.id).where(SubTask.task_id == _SAMPLE_ID)
+        .order_by(SubTask.order_index, SubTask.id).limit(100),
+        {"idx_subtasks_task_order"},
+    ),
+    IndexCheck(
+        "コメント数",
+        lambda dialect: select(func.count(TaskComment.id)).where(TaskComment.task_id == _SAMPLE_ID),
+        # 先頭列が task_id のどちらのインデックスでも数えられる
+        {"idx_comments_task_created", "idx_comments_task_created_julianday"},
+    ),
+    IndexCheck(
+        "コメント一覧（新しい順のキーセット）",
+        lambda dialect: child_keyset_page(
+            select(TaskComment.id).where(TaskComment.task_id == _SAMPLE_ID), dialect, COMMENT_ORDER, 20
+        )[0],
+        {"idx_comments_task_created"},
+        sqlite_expected={"idx_comments_task_created_julianday"},
+    ),
+    IndexCheck(
+        "コメント一覧（タスク詳細）",
+        lambda dialect: select(TaskComment.id).where(TaskComment.task_id == _SAMPLE_ID)
+        .order_by(TaskComment.created_at.desc(), TaskComment.id.desc()).limit(20),
+        {"idx_comments_task_created"},
+    ),
+]
+
+
+def _postgresql_indexes(plan) -> Set[str]:
+    used = set()
+    nodes = [plan[0]["Plan"]]
+    while nodes:
+        node = nodes.pop()
+        if "Index Name" in node:
+            used.add(node["Index Name"])
+        nodes.extend(node.get("Plans", []))
+    return used
+
+
+def _sqlite_indexes(rows) -> Set[str]:
+    used = set()
+    for row in rows:
+        words = row[-1].split()
+        for i, word in enumerate(words[:-1]):
+            if word == "INDEX":
+                used.add(words[i + 1])
+    return used
+
+
+def explain(conn: Connection, check: IndexCheck) -> IndexCheckResult:
+    """1件のチェックをEXPLAINで検証（PostgreSQL・SQLite以外は ValueError）"""
+    dialect = conn.dialect.name
+    if dialect not in SUPPORTED_DIALECTS:
+        raise ValueError(f"EXPLAIN check is not supported for {dialect}")
+    statement = check.build(dialect)
+    sql = str(statement.compile(dialect=conn.dialect, compile_kwargs={"literal_binds": True}))
+    expected = check.expected_for(dialect)
+    if dialect == "postgresql":
+        plan = conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {sql}").scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return IndexCheckResult(check, _postgresql_indexes(plan), json.dumps(plan, ensure_ascii=False), expected)
+    rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}").fetchall()
+    return IndexCheckResult(check, _sqlite_indexes(rows), "\n".join(row[-1] for row in rows), expected)
+
+
+def run_checks(conn: Connection, checks: List[IndexCheck] = CHECKS) -> List[IndexCheckResult]:
+    """
+    全チェックを実行
+
+    PostgreSQLではテーブルが小さいとシーケンシャルスキャンが選ばれるため、
+    トランザクション内で enable_seqscan を無効にしてインデックスの利用可否を確認する。
+    """
+    with conn.begin():
+        if conn.dialect.name == "postgresql":
+            conn.exec_driver_sql("SET LOCAL enable_seqscan = off")
+        return [explain(conn, check) for check in checks]
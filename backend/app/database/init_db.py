@@ -1,11 +1,51 @@
-from app.database.connection import engine, Base
+from sqlalchemy import text
+
+from app.database.connection import engine, Base, SessionLocal
 from app.models.task import Task
 from app.models.subtask import SubTask
 from app.models.comment import TaskComment
+from app.services.task_counts import ensure_count_columns, repair_counts
+
+# 削除する旧インデックス
+# - idx_subtasks_order, idx_comments_task_id: 列を追加したインデックスに置き換え（先頭列が同じため不要）
+# - idx_tasks_actual_start_date: 開始実績で絞り込むクエリがない
+DROPPED_INDEXES = ("idx_subtasks_order", "idx_comments_task_id", "idx_tasks_actual_start_date")
+
+# SQLiteのキーセットページングは日時を julianday() で比較・ソートするため（app.services.pagination）、
+# 同じ式のインデックスを作る（式インデックスはリフレクションできず checkfirst が効かないためDDLで作成）
+SQLITE_INDEXES = (
+    "CREATE INDEX IF NOT EXISTS idx_tasks_created_at_julianday ON tasks (julianday(created_at), id)",
+    "CREATE INDEX IF NOT EXISTS idx_comments_task_created_julianday "
+    "ON task_comments (task_id, julianday(created_at), id)",
+)
+
+def create_indexes():
+    """既存テーブルに不足しているインデックスを作成"""
+    # create_allは既存テーブルのインデックスを作成しないため個別に作成する
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+    with engine.begin() as conn:
+        for name in DROPPED_INDEXES:
+            conn.execute(text(f"DROP INDEX IF EXISTS {name}"))
+        if conn.dialect.name == "sqlite":
+            for ddl in SQLITE_INDEXES:
+                conn.execute(text(ddl))
+
+def migrate_task_counts():
+    """件数列のない既存の tasks テーブルに列を追加し、子テーブルから件数を計算"""
+    if ensure_count_columns(engine):
+        db = SessionLocal()
+        try:
+            repair_counts(db)
+        finally:
+            db.close()
 
 def create_tables():
     """データベーステーブルを作成"""
     Base.metadata.create_all(bind=engine)
+    migrate_task_counts()
+    create_indexes()
     print("Database tables created successfully!")
 
 def drop_tables():
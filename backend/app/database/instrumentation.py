@@ -0,0 +1,90 @@
+"""
+SQLステートメントの計測
+
+すべてのエンジンのカーソル実行前後にフックし、リクエスト単位の集計
+（ステートメント数・DB時間・取得行数）を contextvar の QueryStats に加算する。
+非同期エンジンの同期イベントも呼び出し元のコンテキストで実行されるため、
+ミドルウェアが設定した QueryStats にそのまま加算される。
+
+SLOW_QUERY_THRESHOLD_MS（既定500、0で無効）以上かかったステートメントは
+app.slow_query ロガーに警告として出力する。
+"""
+import logging
+import os
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger("app.slow_query")
+
+SLOW_QUERY_THRESHOLD = float(os.getenv("SLOW_QUERY_THRESHOLD_MS", "500")) / 1000
+# ログに出すステートメントの最大長
+SLOW_QUERY_MAX_LENGTH = 2000
+
+_START_KEY = "query_start"
+
+
+@dataclass
+class QueryStats:
+    statements: int = 0
+    db_seconds: float = 0.0
+    rows: int = 0
+    route: Optional[str] = None
+
+
+current_query_stats: ContextVar[Optional[QueryStats]] = ContextVar("current_query_stats", default=None)
+
+
+def _fetched_rows(cursor) -> int:
+    """
+    取得行数
+
+    非同期ドライバのアダプタは実行時に結果を読み込んで _rows に保持する。
+    それ以外は DBAPI の rowcount（SELECTで-1を返すドライバは0とみなす）。
+    """
+    rows = getattr(cursor, "_rows", None)
+    if rows is not None:
+        try:
+            return len(rows)
+        except TypeError:
+            pass
+    rowcount = getattr(cursor, "rowcount", -1)
+    return rowcount if rowcount and rowcount > 0 else 0
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault(_START_KEY, []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get(_START_KEY)
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    stats = current_query_stats.get()
+    if stats is not None:
+        stats.statements += 1
+        stats.db_seconds += elapsed
+        stats.rows += _fetched_rows(cursor)
+    if SLOW_QUERY_THRESHOLD > 0 and elapsed >= SLOW_QUERY_THRESHOLD:
+        logger.warning(
+            "slow query %.1fms route=%s: %s",
+            elapsed * 1000,
+            stats.route if stats is not None else None,
+            " ".join(statement.split())[:SLOW_QUERY_MAX_LENGTH],
+        )
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(context):
+    # 失敗したステートメントの開始時刻を残さない
+    if context.connection is not None:
+        starts = context.connection.info.get(_START_KEY)
+        if starts:
+            starts.pop()
@@ -0,0 +1,146 @@
+"""
+コネクションプール設定と計測
+
+環境変数でプール設定を上書きできる（未指定時はダイアレクト別の既定値）:
+    DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT, DB_POOL_RECYCLE, DB_POOL_PRE_PING
+"""
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Any, Dict, Optional
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+# ダイアレクト別の既定値
+POOL_DEFAULTS = {
+    "postgresql": {
+        "pool_size": 10,
+        "max_overflow": 20,
+        "pool_timeout": 30,
+        # フェイルオーバー後の古い接続を使い続けないよう定期的に張り直す
+        "pool_recycle": 1800,
+        "pool_pre_ping": True,
+    },
+    "sqlite": {
+        "pool_size": 5,
+        "max_overflow": 10,
+        "pool_timeout": 30,
+        "pool_recycle": -1,
+        "pool_pre_ping": False,
+    },
+}
+
+_ENV_SETTINGS = {
+    "pool_size": ("DB_POOL_SIZE", int),
+    "max_overflow": ("DB_MAX_OVERFLOW", int),
+    "pool_timeout": ("DB_POOL_TIMEOUT", float),
+    "pool_recycle": ("DB_POOL_RECYCLE", int),
+    "pool_pre_ping": ("DB_POOL_PRE_PING", lambda value: value.lower() in ("1", "true", "yes", "on")),
+}
+
+# 接続取得待ち時間のヒストグラム境界（秒）
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class PoolMetrics:
+    """接続取得の待ち時間とタイムアウト回数"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.bucket_counts = [0] * (len(WAIT_BUCKETS) + 1)
+        self.wait_sum = 0.0
+        self.wait_count = 0
+        self.timeouts = 0
+
+    def observe(self, seconds: float) -> None:
+        with self._lock:
+            self.bucket_counts[bisect_left(WAIT_BUCKETS, seconds)] += 1
+            self.wait_sum += seconds
+            self.wait_count += 1
+
+    def timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """累積ヒストグラム（Prometheus形式の le バケット）"""
+        with self._lock:
+            cumulative, buckets = 0, {}
+            for bound, count in zip(WAIT_BUCKETS, self.bucket_counts):
+                cumulative += count
+                buckets[str(bound)] = cumulative
+            buckets["+Inf"] = cumulative + self.bucket_counts[-1]
+            return {
+                "buckets": buckets,
+                "sum": self.wait_sum,
+                "count": self.wait_count,
+                "timeouts": self.timeouts,
+            }
+
+
+class _TimedPoolMixin:
+    """接続取得の待ち時間を計測するプール"""
+
+    metrics: PoolMetrics
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except PoolTimeoutError:
+            self.metrics.timeout()
+            raise
+        self.metrics.observe(time.perf_counter() - start)
+        return connection
+
+
+class TimedQueuePool(_TimedPoolMixin, QueuePool):
+    pass
+
+
+class TimedAsyncAdaptedQueuePool(_TimedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def pool_settings(url: str) -> Dict[str, Any]:
+    """ダイアレクト既定値に環境変数の設定を反映したプール設定"""
+    dialect = make_url(url).get_backend_name()
+    settings = dict(POOL_DEFAULTS.get(dialect, POOL_DEFAULTS["postgresql"]))
+    for key, (env_name, parse) in _ENV_SETTINGS.items():
+        value = os.getenv(env_name)
+        if value not in (None, ""):
+            settings[key] = parse(value)
+    return settings
+
+
+def engine_options(url: str, is_async: bool = False) -> Dict[str, Any]:
+    """create_engine / create_async_engine に渡すプール関連の引数"""
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:"):
+        # インメモリDBは接続ごとに別DBになるためSQLAlchemyの既定プールを使う
+        return {}
+    pool_class = TimedAsyncAdaptedQueuePool if is_async else TimedQueuePool
+    # プールインスタンスごとに計測値を持たせる
+    pool_class = type(pool_class.__name__, (pool_class,), {"metrics": PoolMetrics()})
+    return {"poolclass": pool_class, **pool_settings(url)}
+
+
+def pool_status(engine) -> Optional[Dict[str, Any]]:
+    """プールの現在状態と待ち時間ヒストグラム"""
+    pool = engine.pool
+    if not isinstance(pool, _TimedPoolMixin):
+        return None
+    return {
+        "size": pool.size(),
+        "checked_in": pool.checkedin(),
+        "checked_out": pool.checkedout(),
+        "overflow": max(pool.overflow(), 0),
+        "max_overflow": pool._max_overflow,
+        "timeout": pool.timeout(),
+        "recycle": pool._recycle,
+        "pre_ping": pool._pre_ping,
+        "wait_seconds": pool.metrics.snapshot(),
+    }
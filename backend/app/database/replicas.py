@@ -0,0 +1,259 @@
+"""
+読み取りレプリカへの振り分け
+
+DATABASE_REPLICA_URLS（カンマ区切り）を指定すると、読み取り専用のルートは
+get_read_db 経由でレプリカのセッションを使い、書き込みは従来どおりプライマリを使う。
+
+レプリカの選択条件
+- 定期チェック（REPLICA_CHECK_INTERVAL 秒ごと）に成功していること
+- 遅延が REPLICA_MAX_LAG_SECONDS 以下であること
+- 最後のチェックが古すぎない（チェック間隔の3倍以内）こと
+条件を満たすレプリカがなければプライマリから読む。読み取り中の接続エラーは
+そのレプリカを次のチェックまで対象外にする。
+
+read-your-writes
+書き込み（GET/HEAD/OPTIONS以外）が成功すると、ReadYourWritesMiddleware が
+db_primary_until クッキーと X-Primary-Until ヘッダで期限（UNIX時刻）を返す。
+期限内のリクエスト（クッキー、またはヘッダをそのまま送り返したもの）はプライマリから読む。
+期限は READ_YOUR_WRITES_SECONDS と「最大遅延 + チェック間隔」の大きい方
+（チェック直後から次のチェックまでに遅延が伸びても書き込みが見える長さ）。
+
+プロセス内のキャッシュ（レスポンス・カレンダー）は、このプロセスで書き込みがあってから
+同じ期間はレプリカから読んだ結果を保存しない（無効化直後に古い結果で埋め戻さないため）。
+レスポンスキャッシュが memory の場合は、レプリカ未設定でも期限を付与し（長さはキャッシュのTTL以上）、
+期限内のリクエストはキャッシュを使わない（他ワーカーのキャッシュには無効化が届かないため）。
+"""
+import asyncio
+import itertools
+import logging
+import math
+import os
+import time
+from typing import Dict, List, Optional
+
+from fastapi import Request
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import InterfaceError, OperationalError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.database.connection import AsyncSessionLocal, to_async_url
+from app.database.pool import engine_options
+
+logger = logging.getLogger(__name__)
+
+READ_YOUR_WRITES_COOKIE = "db_primary_until"
+READ_YOUR_WRITES_HEADER = "X-Primary-Until"
+
+# PostgreSQLのスタンバイで最後に適用したトランザクションからの経過秒
+# （受信済みのWALをすべて適用済み、またはプライマリとして動作中なら0）
+POSTGRES_LAG_QUERY = text(
+    "SELECT CASE WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+)
+# 遅延を測れないデータベース（開発用のSQLiteなど）は疎通のみ確認する
+PING_QUERY = text("SELECT 0")
+
+
+class Replica:
+    """レプリカ1台の接続と直近のチェック結果"""
+
+    def __init__(self, name: str, url: str):
+        self.name = name
+        self.url = make_url(url).render_as_string(hide_password=True)
+        async_url = to_async_url(url)
+        self.engine = create_async_engine(async_url, **engine_options(async_url, is_async=True))
+        self.session_factory = async_sessionmaker(
+            self.engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+        )
+        self.healthy = False
+        self.lag: Optional[float] = None
+        self.checked_at: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self.failures = 0
+
+    async def check(self, timeout: float) -> None:
+        """疎通と遅延を確認"""
+        query = POSTGRES_LAG_QUERY if self.engine.dialect.name == "postgresql" else PING_QUERY
+        try:
+            async with self.engine.connect() as conn:
+                lag = await asyncio.wait_for(conn.scalar(query), timeout)
+        except Exception as e:
+            self.mark_failed(e)
+            return
+        self.healthy = True
+        self.lag = float(lag or 0)
+        self.checked_at = time.monotonic()
+        self.last_error = None
+        self.failures = 0
+
+    def mark_failed(self, error: BaseException) -> None:
+        if self.healthy:
+            logger.warning("Replica %s marked unhealthy: %s", self.name, error)
+        self.healthy = False
+        self.last_error = str(error) or type(error).__name__
+        self.failures += 1
+
+    def eligible(self, max_lag: float, max_age: float) -> bool:
+        return (
+            self.healthy
+            and self.lag is not None
+            and self.lag <= max_lag
+            and self.checked_at is not None
+            and time.monotonic() - self.checked_at <= max_age
+        )
+
+    def status(self, max_lag: float, max_age: float) -> dict:
+        return {
+            "name": self.name,
+            "url": self.url,
+            "healthy": self.healthy,
+            "eligible": self.eligible(max_lag, max_age),
+            "lag_seconds": self.lag,
+            "checked_seconds_ago": None if self.checked_at is None else round(time.monotonic() - self.checked_at, 3),
+            "consecutive_failures": self.failures,
+            "last_error": self.last_error,
+        }
+
+
+class ReplicaRouter:
+    def __init__(self, urls: List[str], max_lag: float = 5.0, check_interval: float = 5.0,
+                 check_timeout: float = 2.0, read_your_writes: float = 5.0):
+        self.replicas = [Replica(f"replica{i}", url) for i, url in enumerate(urls)]
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.check_timeout = check_timeout
+        self.max_age = check_interval * 3
+        self.window = max(read_your_writes, max_lag + check_interval)
+        # クライアントに返す期限の長さ（require_read_your_writes で延長）
+        self.deadline_seconds = self.window
+        self._required = False
+        # このプロセスで最後に書き込みを受け付けた時刻（キャッシュの埋め戻し判定用）
+        self.last_write = float("-inf")
+        # 読み取り先の内訳（primary はレプリカ未設定、read_your_writes / no_eligible_replica もプライマリ）
+        self.reads: Dict[str, int] = {"primary": 0, "replica": 0, "read_your_writes": 0, "no_eligible_replica": 0}
+        self._cycle = itertools.count()
+        self._checker: Optional[asyncio.Task] = None
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.replicas)
+
+    @property
+    def issues_deadlines(self) -> bool:
+        """書き込み応答に期限を付与するか"""
+        return self.enabled or self._required
+
+    def require_read_your_writes(self, seconds: float) -> None:
+        """プロセス内キャッシュなどで書き込みが見えない期間がある場合に期限を付与"""
+        self._required = True
+        self.deadline_seconds = max(self.deadline_seconds, seconds)
+
+    async def check_all(self) -> None:
+        await asyncio.gather(*(replica.check(self.check_timeout) for replica in self.replicas))
+
+    async def _run_checks(self) -> None:
+        while True:
+            await asyncio.sleep(self.check_interval)
+            await self.check_all()
+
+    async def start(self) -> None:
+        """初回チェック後、定期チェックを開始"""
+        if not self.enabled:
+            return
+        await self.check_all()
+        self._checker = asyncio.create_task(self._run_checks())
+
+    async def close(self) -> None:
+        if self._checker is not None:
+            self._checker.cancel()
+            self._checker = None
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+    def in_read_your_writes_window(self, request: Request) -> bool:
+        """直前に書き込んだクライアントか（期限はUNIX時刻）"""
+        value = request.headers.get(READ_YOUR_WRITES_HEADER) or request.cookies.get(READ_YOUR_WRITES_COOKIE)
+        if not value:
+            return False
+        try:
+            return float(value) > time.time()
+        except ValueError:
+            return False
+
+    def choose(self, request: Request) -> Optional[Replica]:
+        """読み取りに使うレプリカ（プライマリを使う場合は None）"""
+        if not self.enabled:
+            self.reads["primary"] += 1
+            return None
+        if self.in_read_your_writes_window(request):
+            self.reads["read_your_writes"] += 1
+            return None
+        eligible = [replica for replica in self.replicas if replica.eligible(self.max_lag, self.max_age)]
+        if not eligible:
+            self.reads["no_eligible_replica"] += 1
+            return None
+        self.reads["replica"] += 1
+        return eligible[next(self._cycle) % len(eligible)]
+
+    def session_factory(self, request: Request) -> async_sessionmaker:
+        """読み取り用のセッションファクトリ（ストリーミング応答などセッションを自前で開く場合）"""
+        replica = self.choose(request)
+        request.state.db_replica = replica.name if replica else None
+        return replica.session_factory if replica else AsyncSessionLocal
+
+    def note_write(self) -> None:
+        self.last_write = time.monotonic()
+
+    def may_be_stale(self, request: Request) -> bool:
+        """レプリカから読み、かつこのプロセスで直近に書き込みがあった（キャッシュに保存しない）"""
+        return (
+            getattr(request.state, "db_replica", None) is not None
+            and time.monotonic() - self.last_write < self.window
+        )
+
+    def primary_until(self) -> str:
+        """read-your-writes の期限（UNIX時刻）"""
+        return f"{time.time() + self.deadline_seconds:.3f}"
+
+    def cookie(self) -> str:
+        return (
+            f"{READ_YOUR_WRITES_COOKIE}={self.primary_until()}; Max-Age={math.ceil(self.deadline_seconds)}; "
+            "Path=/; HttpOnly; SameSite=Lax"
+        )
+
+    def status(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "max_lag_seconds": self.max_lag,
+            "check_interval_seconds": self.check_interval,
+            "read_your_writes_seconds": self.deadline_seconds,
+            "reads": dict(self.reads),
+            "replicas": [replica.status(self.max_lag, self.max_age) for replica in self.replicas],
+        }
+
+
+replica_router = ReplicaRouter(
+    urls=[url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()],
+    max_lag=float(os.getenv("REPLICA_MAX_LAG_SECONDS", "5")),
+    check_interval=float(os.getenv("REPLICA_CHECK_INTERVAL", "5")),
+    check_timeout=float(os.getenv("REPLICA_CHECK_TIMEOUT", "2")),
+    read_your_writes=float(os.getenv("READ_YOUR_WRITES_SECONDS", "5")),
+)
+
+
+# 読み取り専用ルートのデータベースセッションの依存性注入
+async def get_read_db(request: Request):
+    replica = replica_router.choose(request)
+    request.state.db_replica = replica.name if replica else None
+    if replica is None:
+        async with AsyncSessionLocal() as db:
+            yield db
+        return
+    async with replica.session_factory() as db:
+        try:
+            yield db
+        except (OperationalError, InterfaceError, OSError) as e:
+            # 接続障害のみ対象外にする（SQLの誤りなどはレプリカの状態と無関係）
+            replica.mark_failed(e)
+            raise
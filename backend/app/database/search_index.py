@@ -0,0 +1,138 @@
+"""
+全文検索インデックス
+
+- PostgreSQL: pg_trgm のGINインデックス（タイトル・説明・メモの連結、コメント本文）
+  トライグラムは分かち書きが不要なため日本語の部分一致にも使える。
+  拡張を作成する権限がない場合は警告を出してインデックスを作らない
+  （検索は索引なしのILIKEになる。事前に管理者が CREATE EXTENSION pg_trgm を実行しておく）
+- SQLite: FTS5（trigramトークナイザ）の task_search テーブルをトリガーで同期
+  tasks.id を UNINDEXED の task_id 列に持ち、検索はこの列で結合する
+  （tasks の rowid は VACUUM で振り直されることがあるため使わない）。
+  トリガーの更新・削除は task_search の走査になるが、1件の書き込みあたり1回のみ
+
+テーブル作成（create_all）のたびに冪等に作成される。インデックス・トリガーで
+更新されるため、APIの書き込み経路（一括処理・インポートを含む）に手を入れる必要はない。
+"""
+import logging
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import DBAPIError
+
+from app.database.connection import Base
+
+logger = logging.getLogger(__name__)
+
+SEARCH_TABLE = "task_search"
+
+# pg_trgm を利用できるか（作成できなかった場合は word_similarity によるランク付けを行わない）
+trigram_enabled = True
+
+# 検索対象の文字列（PostgreSQLの式インデックスと同じ式で検索すること）
+SEARCH_DOCUMENT_SQL = (
+    "(tasks.title || ' ' || coalesce(tasks.description, '') || ' ' || coalesce(tasks.notes, ''))"
+)
+
+_POSTGRESQL_INDEXES = [
+    f"CREATE INDEX IF NOT EXISTS idx_tasks_search_trgm ON tasks USING gin ({SEARCH_DOCUMENT_SQL} gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS idx_comments_content_trgm ON task_comments USING gin (content gin_trgm_ops)",
+]
+
+_SQLITE_COMMENTS_OF = (
+    "coalesce((SELECT group_concat(content, char(10)) FROM task_comments WHERE task_id = {task_id}), '')"
+)
+
+_SQLITE_TRIGGER_NAMES = [
+    "task_search_ai", "task_search_au", "task_search_ad",
+    "task_comment_search_ai", "task_comment_search_au", "task_comment_search_ad",
+]
+
+_SQLITE_TRIGGERS = [
+    f"""CREATE TRIGGER IF NOT EXISTS task_search_ai AFTER INSERT ON tasks BEGIN
+        INSERT INTO {SEARCH_TABLE}(task_id, title, description, notes, comments)
+        VALUES (NEW.id, NEW.title, NEW.description, NEW.notes, '');
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS task_search_au AFTER UPDATE OF title, description, notes ON tasks BEGIN
+        UPDATE {SEARCH_TABLE} SET title = NEW.title, description = NEW.description, notes = NEW.notes
+        WHERE task_id = NEW.id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS task_search_ad AFTER DELETE ON tasks BEGIN
+        DELETE FROM {SEARCH_TABLE} WHERE task_id = OLD.id;
+    END""",
+]
+# コメントの変更はタスク単位でコメント列を作り直す
+for _name, _event, _row in (("ai", "INSERT", "NEW"), ("au", "UPDATE OF content", "NEW"), ("ad", "DELETE", "OLD")):
+    _SQLITE_TRIGGERS.append(
+        f"""CREATE TRIGGER IF NOT EXISTS task_comment_search_{_name} AFTER {_event} ON task_comments BEGIN
+            UPDATE {SEARCH_TABLE} SET comments = {_SQLITE_COMMENTS_OF.format(task_id=f"{_row}.task_id")}
+            WHERE task_id = {_row}.task_id;
+        END"""
+    )
+
+
+def _create_sqlite(conn: Connection) -> None:
+    columns = {row[1] for row in conn.execute(text(f"PRAGMA table_info({SEARCH_TABLE})"))}
+    if columns and "task_id" not in columns:
+        # rowid で対応付けていた旧形式は作り直す
+        _drop_sqlite(conn)
+        columns = set()
+    if not columns:
+        conn.execute(text(
+            f"CREATE VIRTUAL TABLE {SEARCH_TABLE} USING fts5("
+            "task_id UNINDEXED, title, description, notes, comments, tokenize = 'trigram')"
+        ))
+        # 既存データを登録
+        conn.execute(text(
+            f"INSERT INTO {SEARCH_TABLE}(task_id, title, description, notes, comments) "
+            f"SELECT id, title, description, notes, {_SQLITE_COMMENTS_OF.format(task_id='tasks.id')} FROM tasks"
+        ))
+    for ddl in _SQLITE_TRIGGERS:
+        conn.execute(text(ddl))
+
+
+def _drop_sqlite(conn: Connection) -> None:
+    for name in _SQLITE_TRIGGER_NAMES:
+        conn.execute(text(f"DROP TRIGGER IF EXISTS {name}"))
+    conn.execute(text(f"DROP TABLE IF EXISTS {SEARCH_TABLE}"))
+
+
+def _create_postgresql(conn: Connection) -> None:
+    global trigram_enabled
+    try:
+        # 失敗してもトランザクション全体を中断しないようセーブポイント内で実行
+        with conn.begin_nested():
+            conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+    except DBAPIError as e:
+        trigram_enabled = False
+        logger.warning(
+            "pg_trgm is not available, search runs without trigram indexes "
+            "(run CREATE EXTENSION pg_trgm as a superuser): %s", e.orig
+        )
+        return
+    trigram_enabled = True
+    for ddl in _POSTGRESQL_INDEXES:
+        conn.execute(text(ddl))
+
+
+def create_search_index(conn: Connection) -> None:
+    """全文検索インデックスを作成（作成済みなら何もしない）"""
+    if conn.dialect.name == "postgresql":
+        _create_postgresql(conn)
+    elif conn.dialect.name == "sqlite":
+        _create_sqlite(conn)
+
+
+def drop_search_index(conn: Connection) -> None:
+    """SQLiteの検索テーブルとトリガーを削除（PostgreSQLのインデックスはテーブルと共に削除される）"""
+    if conn.dialect.name == "sqlite":
+        _drop_sqlite(conn)
+
+
+@event.listens_for(Base.metadata, "after_create")
+def _after_create(target, connection, **kw):
+    create_search_index(connection)
+
+
+@event.listens_for(Base.metadata, "before_drop")
+def _before_drop(target, connection, **kw):
+    drop_search_index(connection)
@@ -0,0 +1 @@
+# ASGIミドルウェア
\ No newline at end of file
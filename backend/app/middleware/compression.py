@@ -0,0 +1,178 @@
+"""
+レスポンス圧縮（gzip / brotli）
+
+Accept-Encoding から圧縮方式を選び、許可したContent-Typeかつ
+最小サイズ以上の本文のみ圧縮する。ストリーミング応答（エクスポート）は
+チャンクごとに逐次圧縮する。Content-Encoding が設定済みの応答
+（圧縮済みのキャッシュエントリ）はそのまま返す。
+
+brotli は brotli パッケージがインストールされている場合のみ使用する。
+"""
+import os
+import zlib
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # 任意依存
+    brotli = None
+
+DEFAULT_CONTENT_TYPES = (
+    "application/json",
+    "application/x-ndjson",
+    "text/csv",
+    "text/plain",
+    "text/html",
+)
+
+
+@dataclass(frozen=True)
+class CompressionSettings:
+    minimum_size: int = 1024
+    content_types: Tuple[str, ...] = DEFAULT_CONTENT_TYPES
+    # 優先順（クライアントの q 値が同じ場合）
+    encodings: Tuple[str, ...] = ("br", "gzip")
+    gzip_level: int = 6
+    brotli_quality: int = 5
+
+    @classmethod
+    def from_env(cls) -> "CompressionSettings":
+        encodings = tuple(
+            name.strip() for name in os.getenv("COMPRESSION_ENCODINGS", "br,gzip").split(",") if name.strip()
+        )
+        content_types = os.getenv("COMPRESSION_CONTENT_TYPES")
+        return cls(
+            minimum_size=int(os.getenv("COMPRESSION_MIN_SIZE", "1024")),
+            content_types=tuple(
+                value.strip() for value in content_types.split(",") if value.strip()
+            ) if content_types else DEFAULT_CONTENT_TYPES,
+            encodings=tuple(name for name in encodings if name == "gzip" or (name == "br" and brotli is not None)),
+            gzip_level=int(os.getenv("COMPRESSION_GZIP_LEVEL", "6")),
+            brotli_quality=int(os.getenv("COMPRESSION_BROTLI_QUALITY", "5")),
+        )
+
+    def allows(self, content_type: Optional[str]) -> bool:
+        if not content_type:
+            return False
+        return content_type.split(";", 1)[0].strip().lower() in self.content_types
+
+    def negotiate(self, accept_encoding: Optional[str]) -> Optional[str]:
+        """Accept-Encoding から使用する圧縮方式を選択（q=0 は除外）"""
+        if not accept_encoding or not self.encodings:
+            return None
+        weights = {}
+        for item in accept_encoding.split(","):
+            name, _, params = item.strip().partition(";")
+            weight = 1.0
+            params = params.strip()
+            if params.startswith("q="):
+                try:
+                    weight = float(params[2:])
+                except ValueError:
+                    weight = 0.0
+            weights[name.strip().lower()] = weight
+        wildcard = weights.get("*", 0.0)
+        best, best_weight = None, 0.0
+        for name in self.encodings:
+            weight = weights.get(name, wildcard)
+            if weight > best_weight:
+                best, best_weight = name, weight
+        return best
+
+    def compress(self, body: bytes, encoding: str) -> bytes:
+        if encoding == "br":
+            return brotli.compress(body, quality=self.brotli_quality)
+        compressor = zlib.compressobj(self.gzip_level, zlib.DEFLATED, 31)
+        return compressor.compress(body) + compressor.flush()
+
+    def stream_compressor(self, encoding: str):
+        """(compress(chunk), finish()) の組"""
+        if encoding == "br":
+            compressor = brotli.Compressor(quality=self.brotli_quality)
+            return compressor.process, compressor.finish
+        compressor = zlib.compressobj(self.gzip_level, zlib.DEFLATED, 31)
+        return compressor.compress, compressor.flush
+
+
+compression_settings = CompressionSettings.from_env()
+
+
+def add_vary(headers: MutableHeaders) -> None:
+    vary = headers.get("vary")
+    if not vary:
+        headers["Vary"] = "Accept-Encoding"
+    elif "accept-encoding" not in vary.lower():
+        headers["Vary"] = f"{vary}, Accept-Encoding"
+
+
+class CompressionMiddleware:
+    def __init__(self, app: ASGIApp, settings: CompressionSettings = compression_settings):
+        self.app = app
+        self.settings = settings
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = self.settings.negotiate(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        await self.app(scope, receive, _CompressingSender(send, encoding, self.settings).send)
+
+
+class _CompressingSender:
+    def __init__(self, send: Send, encoding: str, settings: CompressionSettings):
+        self._send = send
+        self.encoding = encoding
+        self.settings = settings
+        self.start: Optional[Message] = None
+        self.passthrough = False
+        self.compress = self.finish = None
+
+    def _compressible(self, start: Message, headers: MutableHeaders) -> bool:
+        return (
+            start["status"] not in (204, 206, 304)
+            and "content-encoding" not in headers
+            and self.settings.allows(headers.get("content-type"))
+        )
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start = message
+            return
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self.start is not None:
+            start, self.start = self.start, None
+            headers = MutableHeaders(scope=start)
+            if not self._compressible(start, headers) or (not more_body and len(body) < self.settings.minimum_size):
+                self.passthrough = True
+                await self._send(start)
+                await self._send(message)
+                return
+            headers["Content-Encoding"] = self.encoding
+            add_vary(headers)
+            if not more_body:
+                body = self.settings.compress(body, self.encoding)
+                headers["Content-Length"] = str(len(body))
+                await self._send(start)
+                await self._send({"type": "http.response.body", "body": body})
+                return
+            # ストリーミング応答は長さが変わるためContent-Lengthを外す
+            del headers["Content-Length"]
+            self.compress, self.finish = self.settings.stream_compressor(self.encoding)
+            await self._send(start)
+
+        chunk = self.compress(body)
+        if not more_body:
+            chunk += self.finish()
+        await self._send({"type": "http.response.body", "body": chunk, "more_body": more_body})
@@ -0,0 +1,191 @@
+"""
+リクエスト単位の性能計測
+
+ルート（パステンプレート）ごとに、レイテンシ・SQLステートメント数のヒストグラムと
+DB時間・取得行数の累計を記録する。SQLの集計は app.database.instrumentation の
+イベントフックがリクエストごとの QueryStats に加算したもの。
+
+- GET /metrics: Prometheus テキスト形式
+- Server-Timing ヘッダ: app（処理全体）と db（SQL時間・件数）
+"""
+import os
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.database.instrumentation import QueryStats, current_query_stats
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+STATEMENT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+UNMATCHED_ROUTE = "unmatched"
+
+
+class Histogram:
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self) -> List[Tuple[str, int]]:
+        """(le, 累積件数) の一覧（最後は +Inf）"""
+        total, result = 0, []
+        for bound, count in zip(self.buckets, self.counts):
+            total += count
+            result.append((str(bound), total))
+        result.append(("+Inf", total + self.counts[-1]))
+        return result
+
+
+class RouteMetrics:
+    def __init__(self):
+        self.latency = Histogram(LATENCY_BUCKETS)
+        self.statements = Histogram(STATEMENT_BUCKETS)
+        self.db_seconds = 0.0
+        self.rows = 0
+        self.responses: Dict[int, int] = {}
+
+
+class RequestMetrics:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._routes: Dict[Tuple[str, str], RouteMetrics] = {}
+
+    def observe(self, method: str, route: str, status: int, seconds: float, stats: QueryStats) -> None:
+        with self._lock:
+            metrics = self._routes.get((method, route))
+            if metrics is None:
+                metrics = self._routes[(method, route)] = RouteMetrics()
+            metrics.latency.observe(seconds)
+            metrics.statements.observe(stats.statements)
+            metrics.db_seconds += stats.db_seconds
+            metrics.rows += stats.rows
+            metrics.responses[status] = metrics.responses.get(status, 0) + 1
+
+    def snapshot(self) -> Dict[str, dict]:
+        """ルートごとの要約（JSON用）"""
+        with self._lock:
+            return {
+                f"{method} {route}": {
+                    "requests": metrics.latency.count,
+                    "latency_avg_ms": round(metrics.latency.sum / metrics.latency.count * 1000, 3),
+                    "statements_avg": round(metrics.statements.sum / metrics.statements.count, 2),
+                    "db_seconds": round(metrics.db_seconds, 6),
+                    "rows": metrics.rows,
+                }
+                for (method, route), metrics in sorted(self._routes.items())
+            }
+
+    def prometheus_lines(self) -> Iterable[str]:
+        with self._lock:
+            routes = sorted(self._routes.items())
+            yield "# HELP http_requests_total Requests by route and status"
+            yield "# TYPE http_requests_total counter"
+            for (method, route), metrics in routes:
+                for status, count in sorted(metrics.responses.items()):
+                    yield f'http_requests_total{{{_labels(method, route)},status="{status}"}} {count}'
+            yield from _histogram_lines(
+                "http_request_duration_seconds", "Request latency in seconds",
+                [(labels, metrics.latency) for labels, metrics in routes],
+            )
+            yield from _histogram_lines(
+                "http_request_db_statements", "SQL statements per request",
+                [(labels, metrics.statements) for labels, metrics in routes],
+            )
+            yield "# HELP http_request_db_seconds_total Time spent in SQL statements"
+            yield "# TYPE http_request_db_seconds_total counter"
+            for (method, route), metrics in routes:
+                yield f"http_request_db_seconds_total{{{_labels(method, route)}}} {metrics.db_seconds:.6f}"
+            yield "# HELP http_request_db_rows_total Rows fetched by SQL statements"
+            yield "# TYPE http_request_db_rows_total counter"
+            for (method, route), metrics in routes:
+                yield f"http_request_db_rows_total{{{_labels(method, route)}}} {metrics.rows}"
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(method: str, route: str) -> str:
+    return f'method="{_escape(method)}",route="{_escape(route)}"'
+
+
+def _histogram_lines(name: str, help_text: str, series) -> Iterable[str]:
+    yield f"# HELP {name} {help_text}"
+    yield f"# TYPE {name} histogram"
+    for (method, route), histogram in series:
+        labels = _labels(method, route)
+        for bound, count in histogram.cumulative():
+            yield f'{name}_bucket{{{labels},le="{bound}"}} {count}'
+        yield f"{name}_sum{{{labels}}} {histogram.sum:.6f}"
+        yield f"{name}_count{{{labels}}} {histogram.count}"
+
+
+request_metrics = RequestMetrics()
+
+
+def server_timing(seconds: float, stats: QueryStats) -> str:
+    return (
+        f"app;dur={seconds * 1000:.1f}, "
+        f'db;dur={stats.db_seconds * 1000:.1f};desc="{stats.statements} queries, {stats.rows} rows"'
+    )
+
+
+def _route_template(scope: Scope) -> Optional[str]:
+    """ルーティング後のスコープからパステンプレートを取得"""
+    endpoint = scope.get("endpoint")
+    app = scope.get("app")
+    if endpoint is None or app is None:
+        return None
+    templates = getattr(app.state, "route_templates", None)
+    if templates is None:
+        templates = {
+            route.endpoint: route.path for route in app.routes if getattr(route, "endpoint", None) is not None
+        }
+        app.state.route_templates = templates
+    return templates.get(endpoint)
+
+
+class RequestMetricsMiddleware:
+    def __init__(self, app: ASGIApp, metrics: RequestMetrics = request_metrics,
+                 add_server_timing: bool = os.getenv("SERVER_TIMING", "true").lower() in ("1", "true", "yes", "on")):
+        self.app = app
+        self.metrics = metrics
+        self.add_server_timing = add_server_timing
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        # ルートが決まるまではパスをスロークエリログに出す
+        stats = QueryStats(route=scope["path"])
+        token = current_query_stats.set(stats)
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if self.add_server_timing:
+                    MutableHeaders(scope=message).append(
+                        "Server-Timing", server_timing(time.perf_counter() - start, stats)
+                    )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            route = _route_template(scope) or UNMATCHED_ROUTE
+            self.metrics.observe(scope["method"], route, status, time.perf_counter() - start, stats)
+            current_query_stats.reset(token)
@@ -0,0 +1,37 @@
+"""
+read-your-writes の期限の付与
+
+レプリカを設定している場合（またはレスポンスキャッシュが memory の場合）、書き込みリクエストの成功応答に
+db_primary_until クッキーと X-Primary-Until ヘッダを付ける。
+期限内の読み取りは app.database.replicas.get_read_db がプライマリに送り、
+レスポンスキャッシュも参照しない。
+"""
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.database.replicas import READ_YOUR_WRITES_HEADER, ReplicaRouter, replica_router
+
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+
+class ReadYourWritesMiddleware:
+    def __init__(self, app: ASGIApp, router: ReplicaRouter = replica_router):
+        self.app = app
+        self.router = router
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] in SAFE_METHODS or not self.router.issues_deadlines:
+            await self.app(scope, receive, send)
+            return
+        # コミット前から記録し、処理中にレプリカから読んだ結果もキャッシュに保存させない
+        self.router.note_write()
+
+        async def send_with_deadline(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                self.router.note_write()
+                headers = MutableHeaders(scope=message)
+                headers.append("Set-Cookie", self.router.cookie())
+                headers[READ_YOUR_WRITES_HEADER] = self.router.primary_until()
+            await send(message)
+
+        await self.app(scope, receive, send_with_deadline)
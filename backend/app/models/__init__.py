@@ -1 +1,5 @@
-# データベースモデル
\ No newline at end of file
+# データベースモデル
+# 全文検索インデックスのDDLをテーブル作成時に実行する
+from app.database import search_index  # noqa: F401
+# コミット時にテーブルの変更バージョンを加算する
+from app.database import change_tracking  # noqa: F401
@@ -0,0 +1,11 @@
+from sqlalchemy import Column, String, BigInteger, DateTime
+from sqlalchemy.sql import func
+from app.database.connection import Base
+
+class ChangeVersion(Base):
+    """テーブルごとの変更バージョン（書き込みのコミットごとに加算）"""
+    __tablename__ = "change_versions"
+
+    table_name = Column(String(50), primary_key=True)
+    version = Column(BigInteger, nullable=False, default=0)
+    changed_at = Column(DateTime(timezone=True), server_default=func.now())
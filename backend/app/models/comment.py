@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Text, DateTime, ForeignKey
+from sqlalchemy import Column, String, Text, DateTime, ForeignKey, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 import uuid
@@ -13,4 +13,11 @@ class TaskComment(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     # リレーション
-    task = relationship("Task", back_populates="comments")
\ No newline at end of file
+    task = relationship("Task", back_populates="comments")
+    
+    # インデックス
+    __table_args__ = (
+        # タスクごとのコメント一覧（新しい順のキーセットページング）・件数
+        Index("idx_comments_task_created", task_id, created_at, id),
+        Index("idx_comments_created_at", created_at),
+    )
\ No newline at end of file
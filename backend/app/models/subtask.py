@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, Boolean, DateTime, ForeignKey
+from sqlalchemy import Column, String, Integer, Boolean, DateTime, ForeignKey, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 import uuid
@@ -15,4 +15,13 @@ class SubTask(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     
     # リレーション
-    task = relationship("Task", back_populates="subtasks")
\ No newline at end of file
+    task = relationship("Task", back_populates="subtasks")
+    
+    # インデックス
+    __table_args__ = (
+        Index("idx_subtasks_task_id", task_id),
+        # サブタスク一覧（並び順のキーセットページング）
+        Index("idx_subtasks_task_order", task_id, order_index, id),
+        # 完了サブタスク数の集計用
+        Index("idx_subtasks_task_completed", task_id, completed),
+    )
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Text, Integer, Float, DateTime, Boolean, Enum
+from sqlalchemy import Column, String, Text, Integer, Float, DateTime, Boolean, Enum, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 import uuid
@@ -53,10 +53,36 @@ class Task(Base):
     # その他
     notes = Column(Text)
     
+    # 子レコードの件数（サブタスク・コメントの書き込み時に更新、repair_task_counts.py で再計算）
+    subtask_count = Column(Integer, nullable=False, default=0, server_default="0")
+    completed_subtasks = Column(Integer, nullable=False, default=0, server_default="0")
+    comment_count = Column(Integer, nullable=False, default=0, server_default="0")
+    # サブタスク・コメントの変更回数（タスク詳細の検証子用）
+    children_version = Column(Integer, nullable=False, default=0, server_default="0")
+    
     # システム項目
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     
     # リレーション
-    subtasks = relationship("SubTask", back_populates="task", cascade="all, delete-orphan")
-    comments = relationship("TaskComment", back_populates="task", cascade="all, delete-orphan")
\ No newline at end of file
+    # 子レコードの削除はデータベースの ON DELETE CASCADE に任せる（削除時に読み込まない）
+    subtasks = relationship("SubTask", back_populates="task", cascade="all, delete-orphan", passive_deletes=True)
+    comments = relationship("TaskComment", back_populates="task", cascade="all, delete-orphan", passive_deletes=True)
+    
+    # インデックス（create_tables.sql と同名）
+    __table_args__ = (
+        Index("idx_tasks_category", category),
+        Index("idx_tasks_priority_urgency", priority, urgency),
+        Index("idx_tasks_status", status),
+        Index("idx_tasks_due_date", due_date),
+        # 一覧のキーセットページング用に id を含める
+        Index("idx_tasks_created_at", created_at, id),
+        # マトリックス表示（完了以外）用の部分インデックス
+        Index(
+            "idx_tasks_matrix_open", priority, urgency,
+            postgresql_where=(status != TaskStatus.COMPLETED),
+            sqlite_where=(status != TaskStatus.COMPLETED),
+        ),
+        # カレンダー表示用
+        Index("idx_tasks_planned_start_date", planned_start_date),
+    )
\ No newline at end of file
@@ -1,28 +1,83 @@
 from pydantic import BaseModel
-from typing import List, Dict, Any
+from datetime import date
+from typing import List, Dict, Any, Optional, Union
+
+from app.schemas.subtask import SubTask
+from app.schemas.comment import Comment
 
 # ページング用レスポンス
+# offsetモードは page/total_pages、cursorモードは next_cursor/prev_cursor を返す
+# include_total=false の場合 total/total_pages は null
 class PaginationResponse(BaseModel):
-    page: int
+    page: Optional[int] = None
     limit: int
-    total: int
-    total_pages: int
+    total: Optional[int] = None
+    total_pages: Optional[int] = None
+    next_cursor: Optional[str] = None
+    prev_cursor: Optional[str] = None
 
-# タスク一覧レスポンス
+# タスク一覧・検索レスポンス
+# layout=columns の場合 tasks は項目ごとの配列
 class TaskListResponse(BaseModel):
-    tasks: List[Dict[str, Any]]
+    tasks: Union[List[Dict[str, Any]], Dict[str, List[Any]]]
     pagination: PaginationResponse
 
+# マトリックス集計（/tasks/matrix/summary と /tasks/matrix の summary）
+class MatrixSummaryResponse(BaseModel):
+    total_tasks: int
+    by_quadrant: Dict[str, int]
+    by_cell: Dict[str, int]
+
 # マトリックス表示レスポンス
 class MatrixResponse(BaseModel):
     matrix: Dict[str, List[Dict[str, Any]]]
-    summary: Dict[str, Any]
+    summary: MatrixSummaryResponse
 
 # カレンダー表示レスポンス
+class CalendarRange(BaseModel):
+    start: date
+    end: date
+
 class CalendarResponse(BaseModel):
     calendar_data: Dict[str, List[Dict[str, Any]]]
+    range: CalendarRange
     summary: Dict[str, int]
 
+# インポート結果
+class ImportResponse(BaseModel):
+    imported_tasks: int
+    imported_subtasks: int
+    imported_comments: int
+    last_record: int
+    error_count: int
+    errors: List[Dict[str, Any]]
+    elapsed_seconds: float
+    rows_per_sec: float
+
+# 一括操作レスポンス
+class BulkItemError(BaseModel):
+    index: int
+    id: Optional[str] = None
+    detail: Any
+
+class BulkResponse(BaseModel):
+    succeeded: List[Dict[str, Any]]
+    errors: List[BulkItemError]
+
+# サブタスク・コメント一覧レスポンス（pagination は limit/total/next_cursor/prev_cursor）
+class SubTaskListResponse(BaseModel):
+    subtasks: List[SubTask]
+    pagination: PaginationResponse
+
+class CommentListResponse(BaseModel):
+    comments: List[Comment]
+    pagination: PaginationResponse
+
+# サブタスク並び替えレスポンス
+class SubTaskReorderResponse(BaseModel):
+    task_id: str
+    reordered: int
+
 # エラーレスポンス
 class ErrorDetail(BaseModel):
     field: str
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 
 
@@ -8,9 +8,9 @@ class SubTaskBase(BaseModel):
     title: str = Field(..., max_length=200)
     order_index: int
 
-# サブタスク作成用
+# サブタスク作成用（order_index 省略時は末尾に追加）
 class SubTaskCreate(SubTaskBase):
-    pass
+    order_index: Optional[int] = None
 
 # サブタスク更新用
 class SubTaskUpdate(BaseModel):
@@ -18,6 +18,15 @@ class SubTaskUpdate(BaseModel):
     completed: Optional[bool] = None
     order_index: Optional[int] = None
 
+# サブタスク移動用（after_id の直後 / before_id の直前、どちらも省略時は末尾）
+class SubTaskMove(BaseModel):
+    after_id: Optional[str] = None
+    before_id: Optional[str] = None
+
+# サブタスク並び替え用（タスクの全サブタスクidを新しい順に並べる）
+class SubTaskReorder(BaseModel):
+    ids: List[str] = Field(..., max_length=10000)
+
 # レスポンス用
 class SubTask(SubTaskBase):
     id: str
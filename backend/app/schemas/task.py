@@ -1,8 +1,10 @@
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from typing import Optional, List, Dict, Any
 from datetime import datetime
 
 from app.models.task import TaskCategory, TaskPriority, TaskUrgency, TaskStatus
+from app.schemas.subtask import SubTaskCreate
+from app.schemas.comment import CommentCreate
 
 # ベーススキーマ
 class TaskBase(BaseModel):
@@ -39,6 +41,42 @@ class TaskUpdate(BaseModel):
     actual_hours: Optional[float] = Field(None, ge=0)
     notes: Optional[str] = None
 
+# 一括操作用（各要素は個別に検証し、要素単位でエラーを返す）
+class TaskBulkCreate(BaseModel):
+    tasks: List[Dict[str, Any]] = Field(..., min_length=1, max_length=1000)
+
+class TaskBulkUpdateItem(TaskUpdate):
+    id: str
+
+class TaskBulkUpdate(BaseModel):
+    items: List[Dict[str, Any]] = Field(..., min_length=1, max_length=1000)
+
+class TaskBulkDelete(BaseModel):
+    ids: List[str] = Field(..., min_length=1, max_length=1000)
+
+# インポート用（エクスポート形式の1レコード）
+class SubTaskImport(SubTaskCreate):
+    id: Optional[str] = None
+    order_index: int
+    completed: bool = False
+    created_at: Optional[datetime] = None
+
+class CommentImport(CommentCreate):
+    id: Optional[str] = None
+    created_at: Optional[datetime] = None
+
+class TaskImport(TaskCreate):
+    id: Optional[str] = None
+    status: TaskStatus = TaskStatus.NOT_STARTED
+    progress: int = Field(0, ge=0, le=100)
+    actual_start_date: Optional[datetime] = None
+    actual_end_date: Optional[datetime] = None
+    actual_hours: Optional[float] = Field(None, ge=0)
+    created_at: Optional[datetime] = None
+    updated_at: Optional[datetime] = None
+    subtasks: List[SubTaskImport] = []
+    comments: List[CommentImport] = []
+
 # レスポンス用（基本）
 class Task(TaskBase):
     id: str
@@ -72,8 +110,8 @@ class CommentSimple(BaseModel):
     class Config:
         from_attributes = True
 
-# タスク詳細用（関連データ含む）
-class TaskDetail(Task):
+# エクスポート用（関連データを全件含む）
+class TaskExport(Task):
     subtasks: List[SubTaskSimple] = []
     comments: List[CommentSimple] = []
 
@@ -83,6 +121,20 @@ class TaskWithCounts(Task):
     completed_subtasks: int = 0
     comment_count: int = 0
 
+# 詳細に埋め込んだ関連データのページ情報
+class EmbedPageInfo(BaseModel):
+    limit: int
+    offset: int
+    total: int
+    has_more: bool
+
+# タスク詳細用（関連データ含む、include= で指定したもののみ）
+class TaskDetail(TaskWithCounts):
+    subtasks: Optional[List[SubTaskSimple]] = None
+    comments: Optional[List[CommentSimple]] = None
+    subtasks_page: Optional[EmbedPageInfo] = None
+    comments_page: Optional[EmbedPageInfo] = None
+
 # マトリックス表示用
 class MatrixTask(BaseModel):
     id: str
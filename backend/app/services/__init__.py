@@ -0,0 +1 @@
+# クエリ・集計などのサービス層
@@ -0,0 +1,132 @@
+"""
+タスクの一括作成・更新・削除
+
+有効な要素は1トランザクションで適用し、不正な要素は要素単位のエラーとして返す。
+"""
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.task import Task
+from app.schemas.task import TaskCreate, TaskBulkUpdateItem
+from app.services.summary_cache import SummaryKey, summary_cache, summary_key
+
+
+@dataclass
+class BulkOutcome:
+    succeeded: list = field(default_factory=list)
+    errors: List[dict] = field(default_factory=list)
+    # マトリックス集計キャッシュに反映する (変更前, 変更後) のキー
+    deltas: List[Tuple[Optional[SummaryKey], Optional[SummaryKey]]] = field(default_factory=list)
+
+    def apply_to_summary_cache(self) -> None:
+        """コミット後に呼び出す"""
+        for before, after in self.deltas:
+            summary_cache.apply(before, after)
+
+
+# 更新でnullを指定できない列（TaskUpdateは省略可能なだけでnullも受け付けるため）
+_NOT_NULL_COLUMNS = {column.key for column in Task.__table__.columns if not column.nullable}
+
+
+def _error(index: int, detail: Any, task_id: Optional[str] = None) -> dict:
+    return {"index": index, "id": task_id, "detail": detail}
+
+
+def _validation_detail(e: ValidationError) -> list:
+    return e.errors(include_url=False, include_context=False)
+
+
+def _null_detail(item: TaskBulkUpdateItem) -> list:
+    """NOT NULL列へのnull指定（ValidationErrorと同じ形式）"""
+    return [
+        {"type": "null_not_allowed", "loc": [name], "msg": "Field cannot be null", "input": None}
+        for name, value in item.model_dump(exclude_unset=True).items()
+        if value is None and name in _NOT_NULL_COLUMNS
+    ]
+
+
+async def bulk_create(db: AsyncSession, payloads: List[Dict[str, Any]]) -> BulkOutcome:
+    """複数行INSERT ... RETURNINGで一括作成"""
+    outcome, rows = BulkOutcome(), []
+    for index, payload in enumerate(payloads):
+        try:
+            rows.append(TaskCreate.model_validate(payload).model_dump())
+        except ValidationError as e:
+            outcome.errors.append(_error(index, _validation_detail(e)))
+    if not rows:
+        return outcome
+
+    outcome.succeeded = list((await db.scalars(insert(Task).returning(Task), rows)).all())
+    outcome.deltas = [(None, summary_key(task)) for task in outcome.succeeded]
+    return outcome
+
+
+async def bulk_update(db: AsyncSession, payloads: List[Dict[str, Any]]) -> BulkOutcome:
+    """主キー指定のexecutemany UPDATEで一括更新し、更新後の行をまとめて取得"""
+    outcome, items = BulkOutcome(), []
+    for index, payload in enumerate(payloads):
+        try:
+            item = TaskBulkUpdateItem.model_validate(payload)
+        except ValidationError as e:
+            task_id = payload.get("id") if isinstance(payload, dict) else None
+            outcome.errors.append(_error(index, _validation_detail(e), task_id))
+            continue
+        nulls = _null_detail(item)
+        if nulls:
+            outcome.errors.append(_error(index, nulls, item.id))
+        else:
+            items.append((index, item))
+
+    ids = [item.id for _, item in items]
+    before: Dict[str, SummaryKey] = {}
+    if ids:
+        rows = await db.execute(
+            select(Task.id, Task.priority, Task.urgency, Task.status).where(Task.id.in_(ids))
+        )
+        before = {row.id: (row.priority, row.urgency, row.status) for row in rows}
+
+    changes, seen = [], set()
+    for index, item in items:
+        if item.id not in before:
+            outcome.errors.append(_error(index, "Task not found", item.id))
+        elif item.id in seen:
+            outcome.errors.append(_error(index, "Duplicate id in request", item.id))
+        else:
+            seen.add(item.id)
+            changes.append(item.model_dump(exclude_unset=True))
+    if not changes:
+        return outcome
+
+    await db.execute(update(Task), changes)
+    updated = (await db.scalars(
+        select(Task)
+        .where(Task.id.in_(seen))
+        .execution_options(populate_existing=True)
+    )).all()
+    order = {change["id"]: position for position, change in enumerate(changes)}
+    outcome.succeeded = sorted(updated, key=lambda task: order[task.id])
+    outcome.deltas = [(before[task.id], summary_key(task)) for task in outcome.succeeded]
+    return outcome
+
+
+async def bulk_delete(db: AsyncSession, ids: List[str]) -> BulkOutcome:
+    """DELETE ... WHERE id IN (...) RETURNINGで一括削除"""
+    deleted = (await db.execute(
+        delete(Task)
+        .where(Task.id.in_(ids))
+        .returning(Task.id, Task.priority, Task.urgency, Task.status)
+    )).all()
+    deleted_ids = {row.id for row in deleted}
+    return BulkOutcome(
+        succeeded=[{"id": row.id} for row in deleted],
+        errors=[
+            _error(index, "Task not found", task_id)
+            for index, task_id in enumerate(ids)
+            if task_id not in deleted_ids
+        ],
+        deltas=[((row.priority, row.urgency, row.status), None) for row in deleted],
+    )
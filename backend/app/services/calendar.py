@@ -0,0 +1,199 @@
+"""
+カレンダー表示データ
+
+日付列ごとの範囲検索（インデックスが効く >= / <）を UNION ALL でまとめ、
+イベントに必要な列と日付（SQLで算出）だけを取得する。
+範囲は [開始, 終了) の半開区間で扱い、最終日の0時以降のイベントも含める。
+
+過去の月はほぼ変更されないため、月単位でプロセス内にキャッシュする。
+タスクの書き込み時は該当月（一括処理・インポートは全体）を無効化する。
+各月には取得時の change_versions（tasks）のバージョンを記録し、ETagと同じバージョンの
+場合のみ使う（他プロセスでの書き込み後は取得し直す）。TTL は CALENDAR_CACHE_TTL 秒。
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import func, literal, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.task import Task
+
+# (イベント種別, 日付列)
+EVENT_COLUMNS = (
+    ("due", Task.due_date),
+    ("start", Task.planned_start_date),
+)
+SUMMARY_KEYS = {"due": "due_dates", "start": "start_dates"}
+# 1回の取得で指定できる最大日数
+MAX_RANGE_DAYS = 366
+
+Month = Tuple[int, int]
+DayEvents = Dict[str, List[dict]]
+
+
+def month_start(year: int, month: int) -> datetime:
+    return datetime(year, month, 1)
+
+
+def next_month(year: int, month: int) -> Month:
+    return (year + 1, 1) if month == 12 else (year, month + 1)
+
+
+def months_range(year: int, month: int, months: int) -> Tuple[datetime, datetime]:
+    """year/month から months か月分の [開始, 終了)"""
+    end_year, end_month = year, month
+    for _ in range(months):
+        end_year, end_month = next_month(end_year, end_month)
+    return month_start(year, month), month_start(end_year, end_month)
+
+
+def _month_segments(start: datetime, end: datetime) -> List[Tuple[Month, datetime, datetime]]:
+    """[開始, 終了) を月ごとの区間に分割"""
+    segments = []
+    year, month = start.year, start.month
+    while month_start(year, month) < end:
+        following = month_start(*next_month(year, month))
+        segments.append(((year, month), max(start, month_start(year, month)), min(end, following)))
+        year, month = next_month(year, month)
+    return segments
+
+
+def events_statement(start: datetime, end: datetime):
+    """範囲内のイベントを取得するselect（日付列ごとの範囲検索のUNION ALL）"""
+    parts = [
+        select(
+            func.date(column).label("day"),
+            column.label("at"),
+            literal(event_type).label("type"),
+            Task.id,
+            Task.title,
+            Task.priority,
+            Task.urgency,
+        ).where(column >= start, column < end)
+        for event_type, column in EVENT_COLUMNS
+    ]
+    statement = union_all(*parts).subquery()
+    return select(statement).order_by(statement.c.day, statement.c.at, statement.c.id)
+
+
+async def fetch_events(db: AsyncSession, start: datetime, end: datetime) -> DayEvents:
+    """日付ごとのイベント（日付・時刻順）"""
+    calendar_data: DayEvents = {}
+    for row in (await db.execute(events_statement(start, end))).all():
+        calendar_data.setdefault(str(row.day), []).append({
+            "id": row.id,
+            "title": row.title,
+            "type": row.type,
+            "priority": row.priority.value,
+            "urgency": row.urgency.value,
+        })
+    return calendar_data
+
+
+class CalendarMonthCache:
+    """過去の月のイベントを保持するLRUキャッシュ"""
+
+    def __init__(self, max_months: int = 120, ttl: float = 3600.0):
+        self._lock = threading.Lock()
+        # 月 -> (保存時刻, tasks のバージョン, イベント)
+        self._months: "OrderedDict[Month, Tuple[float, Optional[int], DayEvents]]" = OrderedDict()
+        self.max_months = max_months
+        self.ttl = ttl
+
+    @staticmethod
+    def is_cacheable(month: Month, start: datetime, end: datetime, today: Optional[date] = None) -> bool:
+        """月全体を対象とし、かつ当月より前の月のみキャッシュする"""
+        today = today or date.today()
+        return (
+            month < (today.year, today.month)
+            and start == month_start(*month)
+            and end == month_start(*next_month(*month))
+        )
+
+    def get(self, month: Month, version: Optional[int] = None) -> Optional[DayEvents]:
+        """同じバージョンで保存した月のイベント"""
+        with self._lock:
+            entry = self._months.get(month)
+            if entry is None:
+                return None
+            stored_at, stored_version, events = entry
+            if stored_version != version or time.monotonic() - stored_at > self.ttl:
+                del self._months[month]
+                return None
+            self._months.move_to_end(month)
+            return events
+
+    def put(self, month: Month, events: DayEvents, version: Optional[int] = None) -> None:
+        with self._lock:
+            self._months[month] = (time.monotonic(), version, events)
+            self._months.move_to_end(month)
+            while len(self._months) > self.max_months:
+                self._months.popitem(last=False)
+
+    def invalidate_dates(self, values: Iterable[Optional[datetime]]) -> None:
+        """指定日時を含む月を無効化"""
+        with self._lock:
+            for value in values:
+                if value is not None:
+                    self._months.pop((value.year, value.month), None)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._months.clear()
+
+
+calendar_cache = CalendarMonthCache(
+    max_months=int(os.getenv("CALENDAR_CACHE_MONTHS", "120")),
+    ttl=float(os.getenv("CALENDAR_CACHE_TTL", "3600")),
+)
+
+
+def event_dates(task: Task) -> List[Optional[datetime]]:
+    """タスクのイベント日時（キャッシュ無効化用）"""
+    return [getattr(task, column.key) for _, column in EVENT_COLUMNS]
+
+
+async def build_calendar(db: AsyncSession, start: datetime, end: datetime, cache: CalendarMonthCache = calendar_cache,
+                         store: bool = True, version: Optional[int] = None) -> dict:
+    """[開始, 終了) のカレンダーデータ
+
+    キャッシュ済みの過去月以外は、連続する区間ごとに1クエリで取得する。
+    store=False の場合はキャッシュを参照するだけで、取得した月を保存しない。
+    version は検証子と同じ change_versions（tasks）のバージョン（異なるバージョンの月は使わない）。
+    """
+    calendar_data: DayEvents = {}
+    pending: List[Tuple[Month, datetime, datetime]] = []
+
+    async def flush():
+        if not pending:
+            return
+        events = await fetch_events(db, pending[0][1], pending[-1][2])
+        for month, segment_start, segment_end in pending:
+            if store and cache.is_cacheable(month, segment_start, segment_end):
+                prefix = f"{month[0]:04d}-{month[1]:02d}-"
+                cache.put(month, {day: items for day, items in events.items() if day.startswith(prefix)}, version)
+        calendar_data.update(events)
+        pending.clear()
+
+    for month, segment_start, segment_end in _month_segments(start, end):
+        cached = cache.get(month, version) if cache.is_cacheable(month, segment_start, segment_end) else None
+        if cached is None:
+            pending.append((month, segment_start, segment_end))
+            continue
+        await flush()
+        calendar_data.update(cached)
+    await flush()
+
+    summary = {"due_dates": 0, "start_dates": 0, "milestones": 0}
+    for items in calendar_data.values():
+        for item in items:
+            summary[SUMMARY_KEYS[item["type"]]] += 1
+    return {
+        "calendar_data": dict(sorted(calendar_data.items())),
+        "range": {"start": start.date().isoformat(), "end": (end - timedelta(days=1)).date().isoformat()},
+        "summary": {"total_events": sum(summary.values()), **summary},
+    }
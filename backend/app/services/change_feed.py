@@ -0,0 +1,169 @@
+"""
+変更フィード（タスク・サブタスク・コメントの作成/更新/削除イベント）
+
+ルーターがコミット後に publish() し、ChangeHub が購読者ごとのキューへ配信する。
+- memory（既定）: 同じプロセス内の購読者にのみ配信
+- postgres: PostgreSQL の NOTIFY で全ワーカーに送り、各ワーカーの LISTEN で受信して配信
+
+イベントIDはワーカー内の連番。再接続時の Last-Event-ID が履歴にない場合
+（別ワーカーへの再接続・履歴あふれ）は reset イベントで再取得を促す。
+"""
+import asyncio
+import json
+import logging
+import os
+from collections import deque
+from datetime import datetime, timezone
+from typing import Deque, List, Optional, Set, Tuple
+
+from sqlalchemy.engine import make_url
+
+from app.database.connection import ASYNC_DATABASE_URL
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = "task_changes"
+# 購読者のキューがあふれた場合に送る（購読は終了する）
+OVERFLOW = None
+
+
+class Subscription:
+    __slots__ = ("queue", "task_id")
+
+    def __init__(self, queue_size: int, task_id: Optional[str] = None):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.task_id = task_id
+
+    def wants(self, event: dict) -> bool:
+        return self.task_id is None or event.get("task_id") == self.task_id
+
+
+class ChangeHub:
+    """プロセス内の購読者へのファンアウト"""
+
+    def __init__(self, queue_size: int = 100, history_size: int = 1000):
+        self.queue_size = queue_size
+        self._subscribers: Set[Subscription] = set()
+        self._history: Deque[Tuple[int, dict]] = deque(maxlen=history_size)
+        self._last_id = 0
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def subscribe(
+        self, task_id: Optional[str] = None, last_event_id: Optional[int] = None
+    ) -> Tuple[Subscription, Optional[List[Tuple[int, dict]]]]:
+        """購読を開始し、last_event_id 以降の未配信イベントを返す（履歴にない場合は None）"""
+        subscription = Subscription(self.queue_size, task_id)
+        self._subscribers.add(subscription)
+        if last_event_id is None or last_event_id == self._last_id:
+            return subscription, []
+        if not self._history or not (self._history[0][0] - 1 <= last_event_id < self._last_id):
+            return subscription, None
+        missed = [(event_id, event) for event_id, event in self._history
+                  if event_id > last_event_id and subscription.wants(event)]
+        return subscription, missed
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self._subscribers.discard(subscription)
+
+    def dispatch(self, event: dict) -> None:
+        """イベントをすべての購読者へ配信（イベントループのスレッドから呼ぶこと）"""
+        self._last_id += 1
+        item = (self._last_id, event)
+        self._history.append(item)
+        for subscription in list(self._subscribers):
+            if not subscription.wants(event):
+                continue
+            try:
+                subscription.queue.put_nowait(item)
+            except asyncio.QueueFull:
+                # 読み出しが追いつかない購読者は切断し、再接続時に再取得させる
+                self._subscribers.discard(subscription)
+                subscription.queue.get_nowait()
+                subscription.queue.put_nowait(OVERFLOW)
+
+
+class ChangeFeed:
+    def __init__(self, hub: ChangeHub, backend: str = "memory", database_url: Optional[str] = None):
+        self.hub = hub
+        self.backend = backend
+        self.database_url = database_url
+        self._outbox: Optional[asyncio.Queue] = None
+        self._listen_conn = None
+        self._notify_conn = None
+        self._sender: Optional[asyncio.Task] = None
+
+    def publish(self, entity: str, action: str, entity_id: Optional[str], task_id: Optional[str] = None) -> None:
+        """変更イベントを発行（コミット後に呼ぶ）"""
+        event = {
+            "entity": entity,
+            "action": action,
+            "id": entity_id,
+            "task_id": task_id if task_id is not None else (entity_id if entity == "task" else None),
+            "at": datetime.now(timezone.utc).isoformat(),
+        }
+        if self._outbox is not None:
+            self._outbox.put_nowait(event)
+        else:
+            self.hub.dispatch(event)
+
+    def _asyncpg_dsn(self) -> str:
+        url = make_url(self.database_url)
+        return url.set(drivername="postgresql").render_as_string(hide_password=False)
+
+    async def start(self) -> None:
+        if self.backend != "postgres":
+            return
+        import asyncpg
+
+        dsn = self._asyncpg_dsn()
+        self._listen_conn = await asyncpg.connect(dsn)
+        self._notify_conn = await asyncpg.connect(dsn)
+        await self._listen_conn.add_listener(CHANNEL, self._on_notify)
+        self._outbox = asyncio.Queue()
+        self._sender = asyncio.create_task(self._send_notifications())
+
+    def _on_notify(self, connection, pid, channel, payload) -> None:
+        self.hub.dispatch(json.loads(payload))
+
+    async def _send_notifications(self) -> None:
+        while True:
+            event = await self._outbox.get()
+            try:
+                await self._notify_conn.execute("SELECT pg_notify($1, $2)", CHANNEL, json.dumps(event))
+            except Exception:
+                # 通知できない場合もこのワーカーの購読者には配信する
+                logger.exception("Change feed notify failed")
+                self.hub.dispatch(event)
+
+    async def stop(self) -> None:
+        if self._sender is not None:
+            self._sender.cancel()
+            self._sender = None
+        self._outbox = None
+        for conn in (self._listen_conn, self._notify_conn):
+            if conn is not None:
+                await conn.close()
+        self._listen_conn = self._notify_conn = None
+
+
+def format_event(event_id: int, event: dict) -> str:
+    """Server-Sent Events の1イベント"""
+    return f"id: {event_id}\nevent: change\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
+
+
+def format_reset() -> str:
+    """取りこぼしがあるためクライアントに再取得を促すイベント"""
+    return "event: reset\ndata: {}\n\n"
+
+
+change_feed = ChangeFeed(
+    ChangeHub(
+        queue_size=int(os.getenv("CHANGE_FEED_QUEUE_SIZE", "100")),
+        history_size=int(os.getenv("CHANGE_FEED_HISTORY", "1000")),
+    ),
+    backend=os.getenv("CHANGE_FEED_BACKEND", "memory"),
+    database_url=ASYNC_DATABASE_URL,
+)
@@ -0,0 +1,109 @@
+"""
+条件付きGET（ETag / Last-Modified）
+
+検証子はレスポンスを組み立てる前に、依存するテーブルの変更バージョン
+（change_versions の数行）とリクエストのパス・クエリから作る。
+If-None-Match（なければ If-Modified-Since）が一致すれば 304 を返す。
+タスク詳細は change_versions を使わず、そのタスク行の更新日時・件数・子レコードの変更回数から作る
+（他のタスクへの書き込みで変わらない）。
+"""
+import hashlib
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Iterable, Optional, Tuple
+
+from fastapi import Request, Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.change_version import ChangeVersion
+
+TASK_TABLES = ("tasks",)
+TASK_TREE_TABLES = ("tasks", "subtasks", "task_comments")
+
+
+def _as_utc(value: Optional[datetime]) -> Optional[datetime]:
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+@dataclass
+class Validators:
+    etag: str
+    last_modified: Optional[datetime]
+    # 検証子の元にしたテーブルごとのバージョン（本文をプロセス内キャッシュから作る場合の整合用）
+    versions: Dict[str, int] = field(default_factory=dict)
+
+    def headers(self) -> Dict[str, str]:
+        headers = {"ETag": self.etag, "Cache-Control": "no-cache"}
+        if self.last_modified is not None:
+            headers["Last-Modified"] = format_datetime(self.last_modified, usegmt=True)
+        return headers
+
+    def matches(self, request: Request) -> bool:
+        """リクエストの条件に一致する（=変更なし）か"""
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None:
+            tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+            return "*" in tags or self.etag.removeprefix("W/") in tags
+        if_modified_since = request.headers.get("if-modified-since")
+        if if_modified_since and self.last_modified is not None:
+            try:
+                since = _as_utc(parsedate_to_datetime(if_modified_since))
+            except (TypeError, ValueError):
+                return False
+            return self.last_modified.replace(microsecond=0) <= since
+        return False
+
+    def not_modified(self) -> Response:
+        return Response(status_code=304, headers=self.headers())
+
+
+async def load_versions(db: AsyncSession, tables: Iterable[str]) -> Dict[str, Tuple[int, datetime]]:
+    """テーブルごとの (バージョン, 変更日時)"""
+    rows = await db.execute(
+        select(ChangeVersion.table_name, ChangeVersion.version, ChangeVersion.changed_at)
+        .where(ChangeVersion.table_name.in_(list(tables)))
+    )
+    return {name: (version, changed_at) for name, version, changed_at in rows}
+
+
+def _etag(request: Request, parts: Iterable[str]) -> str:
+    query = "&".join(sorted(f"{key}={value}" for key, value in request.query_params.multi_items()))
+    source = "|".join([request.url.path, query, *parts])
+    return f'W/"{hashlib.sha1(source.encode("utf-8")).hexdigest()[:20]}"'
+
+
+def row_validators(request: Request, last_modified: Optional[datetime], *state) -> Validators:
+    """1行の状態（更新日時と表示に影響する列の値）から検証子を作成"""
+    return Validators(
+        etag=_etag(request, [last_modified.isoformat() if last_modified else "", *map(str, state)]),
+        last_modified=_as_utc(last_modified),
+    )
+
+
+async def validators_for(
+    request: Request,
+    db: AsyncSession,
+    tables: Iterable[str],
+    last_modified: Optional[datetime] = None,
+) -> Validators:
+    """リクエストと依存テーブルのバージョンから検証子を作成"""
+    tables = sorted(tables)
+    versions = await load_versions(db, tables)
+    parts = [
+        *(f"{table}:{versions.get(table, (0, None))[0]}" for table in tables),
+        last_modified.isoformat() if last_modified else "",
+    ]
+    changed = [_as_utc(changed_at) for _, changed_at in versions.values() if changed_at is not None]
+    if last_modified is not None:
+        changed.append(_as_utc(last_modified))
+    return Validators(
+        etag=_etag(request, parts),
+        last_modified=max(changed) if changed else None,
+        versions={table: versions.get(table, (0, None))[0] for table in tables},
+    )
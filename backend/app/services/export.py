@@ -0,0 +1,91 @@
+"""
+タスクのストリーミングエクスポート
+
+サーバーサイドカーソル（yield_per）でタスクを一定件数ずつ読み込み、
+サブタスク・コメントはバッチ単位にselectinloadで取得する。
+出力形式:
+    ndjson: 1行1タスクのJSON（subtasks / comments を配列で含む）
+    csv:    1行1タスク（subtasks / comments 列はJSON文字列）
+"""
+import csv
+import io
+import json
+from typing import AsyncIterator, Iterable, Iterator
+
+from sqlalchemy import select, Select
+from sqlalchemy.orm import selectinload
+
+from app.models.task import Task
+# リレーション解決のためサブタスク・コメントのモデルも読み込む
+from app.models.subtask import SubTask  # noqa: F401
+from app.models.comment import TaskComment  # noqa: F401
+from app.schemas.task import TaskExport
+
+EXPORT_FORMATS = ("ndjson", "csv")
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+EXPORT_BATCH_SIZE = 500
+
+# CSVの列（タスク項目 + 子レコード）
+CSV_FIELDS = list(TaskExport.model_fields)
+
+
+def export_statement(batch_size: int = EXPORT_BATCH_SIZE) -> Select:
+    """エクスポート用のselect（作成日時順・子レコードはバッチ単位で取得）"""
+    return (
+        select(Task)
+        .options(selectinload(Task.subtasks), selectinload(Task.comments))
+        .order_by(Task.created_at, Task.id)
+        .execution_options(yield_per=batch_size)
+    )
+
+
+def task_record(task: Task) -> dict:
+    """タスクをJSON互換のdictに変換"""
+    return TaskExport.model_validate(task).model_dump(mode="json")
+
+
+def ndjson_lines(tasks: Iterable[Task]) -> Iterator[str]:
+    for task in tasks:
+        yield json.dumps(task_record(task), ensure_ascii=False) + "\n"
+
+
+def csv_header() -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerow(CSV_FIELDS)
+    return buffer.getvalue()
+
+
+def csv_lines(tasks: Iterable[Task]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=CSV_FIELDS)
+    for task in tasks:
+        record = task_record(task)
+        record["subtasks"] = json.dumps(record["subtasks"], ensure_ascii=False)
+        record["comments"] = json.dumps(record["comments"], ensure_ascii=False)
+        writer.writerow(record)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+
+def format_chunk(tasks: Iterable[Task], export_format: str) -> str:
+    """1バッチ分のタスクを出力形式の文字列に変換"""
+    lines = ndjson_lines(tasks) if export_format == "ndjson" else csv_lines(tasks)
+    return "".join(lines)
+
+
+async def stream_export(session_factory, export_format: str) -> AsyncIterator[str]:
+    """
+    エクスポート本体（StreamingResponse用）
+
+    レスポンス送信中もセッションを保持するため、依存性注入ではなく専用のセッションを開く。
+    """
+    if export_format == "csv":
+        yield csv_header()
+    async with session_factory() as db:
+        result = await db.stream(export_statement())
+        async for partition in result.scalars().partitions():
+            yield format_chunk(partition, export_format)
+            # 送信済みのオブジェクトをセッションから切り離してメモリを一定に保つ
+            for task in partition:
+                db.expunge(task)
@@ -0,0 +1,320 @@
+"""
+タスクのストリーミングインポート
+
+エクスポート形式（NDJSON / CSV）のファイルを一定件数ずつ読み込み、
+TaskImport（TaskCreate / SubTaskCreate / CommentCreate）で検証してから
+バッチ単位でまとめて書き込む。
+
+- 書き込みは1バッチ1トランザクション。PostgreSQL（psycopg2）ではCOPY、
+  それ以外は executemany（insertmanyvalues）を使用する
+- レコード番号（1始まり）を単位にチェックポイントを記録し、skip で再開できる
+- ファイル内のid（タスク・サブタスク・コメント）が重複・既に存在する場合はエラーとして扱い、
+  そのレコード（タスクと子レコード）は取り込まない
+"""
+import csv
+import io
+import json
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.database.change_tracking import mark_changed
+from app.models.task import Task
+from app.models.subtask import SubTask
+from app.models.comment import TaskComment
+from app.schemas.task import TaskImport
+
+IMPORT_FORMATS = ("ndjson", "csv")
+IMPORT_BATCH_SIZE = 1000
+# 結果に含めるエラー明細の上限
+MAX_REPORTED_ERRORS = 100
+# 既存id確認の IN 句1回あたりの件数（バインド変数の上限対策）
+EXISTING_LOOKUP_CHUNK = 5000
+
+_TASK_COLUMNS = [column.key for column in Task.__table__.columns]
+_SUBTASK_COLUMNS = [column.key for column in SubTask.__table__.columns]
+_COMMENT_COLUMNS = [column.key for column in TaskComment.__table__.columns]
+
+
+@dataclass
+class PreparedBatch:
+    """検証済みの1バッチ分の行"""
+    first_record: int
+    last_record: int
+    tasks: List[dict] = field(default_factory=list)
+    subtasks: List[dict] = field(default_factory=list)
+    comments: List[dict] = field(default_factory=list)
+    # タスク行に対応するレコード番号（既存id検出時のエラー報告用）
+    record_numbers: List[int] = field(default_factory=list)
+    errors: List[dict] = field(default_factory=list)
+
+
+@dataclass
+class ImportStats:
+    """インポートの進捗"""
+    imported_tasks: int = 0
+    imported_subtasks: int = 0
+    imported_comments: int = 0
+    last_record: int = 0
+    error_count: int = 0
+    errors: List[dict] = field(default_factory=list)
+    started_at: float = field(default_factory=time.perf_counter)
+
+    def add(self, batch: PreparedBatch) -> None:
+        self.imported_tasks += len(batch.tasks)
+        self.imported_subtasks += len(batch.subtasks)
+        self.imported_comments += len(batch.comments)
+        self.last_record = batch.last_record
+        self.error_count += len(batch.errors)
+        self.errors.extend(batch.errors[: max(MAX_REPORTED_ERRORS - len(self.errors), 0)])
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started_at
+
+    @property
+    def rows_per_sec(self) -> float:
+        rows = self.imported_tasks + self.imported_subtasks + self.imported_comments
+        return rows / self.elapsed if self.elapsed > 0 else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "imported_tasks": self.imported_tasks,
+            "imported_subtasks": self.imported_subtasks,
+            "imported_comments": self.imported_comments,
+            "last_record": self.last_record,
+            "error_count": self.error_count,
+            "errors": self.errors,
+            "elapsed_seconds": round(self.elapsed, 3),
+            "rows_per_sec": round(self.rows_per_sec, 1),
+        }
+
+
+def iter_records(stream: TextIO, import_format: str) -> Iterator[Tuple[int, Any]]:
+    """(レコード番号, dict) を順に返す。解析できない行は例外オブジェクトを返す"""
+    if import_format == "csv":
+        for number, row in enumerate(csv.DictReader(stream), start=1):
+            try:
+                record = {key: value for key, value in row.items() if value != ""}
+                for key in ("subtasks", "comments"):
+                    if key in record:
+                        record[key] = json.loads(record[key])
+                yield number, record
+            except ValueError as e:
+                yield number, e
+        return
+
+    number = 0
+    for line in stream:
+        if not line.strip():
+            continue
+        number += 1
+        try:
+            yield number, json.loads(line)
+        except ValueError as e:
+            yield number, e
+
+
+def iter_batches(
+    records: Iterable[Tuple[int, Any]],
+    batch_size: int = IMPORT_BATCH_SIZE,
+    skip: int = 0,
+) -> Iterator[PreparedBatch]:
+    """レコード番号 skip 以前を読み飛ばし、batch_size件ずつ検証済みバッチを返す"""
+    chunk: List[Tuple[int, Any]] = []
+    for number, record in records:
+        if number <= skip:
+            continue
+        chunk.append((number, record))
+        if len(chunk) >= batch_size:
+            yield prepare_batch(chunk)
+            chunk = []
+    if chunk:
+        yield prepare_batch(chunk)
+
+
+def prepare_batch(chunk: List[Tuple[int, Any]]) -> PreparedBatch:
+    """レコードを検証し、テーブルごとの行に分解する"""
+    batch = PreparedBatch(first_record=chunk[0][0], last_record=chunk[-1][0])
+    now = datetime.now(timezone.utc)
+    seen_ids, seen_subtask_ids, seen_comment_ids = set(), set(), set()
+    for number, record in chunk:
+        if isinstance(record, Exception):
+            batch.errors.append({"record": number, "detail": f"Invalid record: {record}"})
+            continue
+        try:
+            task = TaskImport.model_validate(record)
+        except ValidationError as e:
+            batch.errors.append({"record": number, "detail": e.errors(include_url=False, include_context=False)})
+            continue
+
+        task_id = task.id or str(uuid.uuid4())
+        if task_id in seen_ids:
+            batch.errors.append({"record": number, "detail": f"Duplicate task id {task_id}"})
+            continue
+        subtask_ids = [subtask.id or str(uuid.uuid4()) for subtask in task.subtasks]
+        comment_ids = [comment.id or str(uuid.uuid4()) for comment in task.comments]
+        duplicate = _first_duplicate("subtask", subtask_ids, seen_subtask_ids) or \
+            _first_duplicate("comment", comment_ids, seen_comment_ids)
+        if duplicate:
+            batch.errors.append({"record": number, "detail": duplicate})
+            continue
+        seen_ids.add(task_id)
+        seen_subtask_ids.update(subtask_ids)
+        seen_comment_ids.update(comment_ids)
+
+        row = task.model_dump(exclude={"subtasks", "comments"})
+        row.update(
+            id=task_id,
+            created_at=task.created_at or now,
+            updated_at=task.updated_at or task.created_at or now,
+            subtask_count=len(task.subtasks),
+            completed_subtasks=sum(1 for subtask in task.subtasks if subtask.completed),
+            comment_count=len(task.comments),
+            # COPYは列の既定値を使わないためNOT NULLの列はすべて値を設定する
+            children_version=0,
+        )
+        batch.tasks.append(row)
+        batch.record_numbers.append(number)
+        for subtask, subtask_id in zip(task.subtasks, subtask_ids):
+            batch.subtasks.append({
+                **subtask.model_dump(),
+                "id": subtask_id,
+                "task_id": task_id,
+                "created_at": subtask.created_at or now,
+            })
+        for comment, comment_id in zip(task.comments, comment_ids):
+            batch.comments.append({
+                **comment.model_dump(),
+                "id": comment_id,
+                "task_id": task_id,
+                "created_at": comment.created_at or now,
+            })
+    return batch
+
+
+def _first_duplicate(kind: str, ids: List[str], seen: set) -> Optional[str]:
+    """レコード内・バッチ内で重複する子レコードidのエラー内容（なければNone）"""
+    record_ids = set()
+    for child_id in ids:
+        if child_id in seen or child_id in record_ids:
+            return f"Duplicate {kind} id {child_id}"
+        record_ids.add(child_id)
+    return None
+
+
+def _lookup_chunks(model, ids: List[str]):
+    """既存idを確認するselect（EXISTING_LOOKUP_CHUNK 件ずつ）"""
+    for start in range(0, len(ids), EXISTING_LOOKUP_CHUNK):
+        yield select(model.id).where(model.id.in_(ids[start:start + EXISTING_LOOKUP_CHUNK]))
+
+
+def _existing_queries(batch: PreparedBatch):
+    """(モデル, select) の一覧（バッチのidのうち既に存在するもの）"""
+    for model, rows in ((Task, batch.tasks), (SubTask, batch.subtasks), (TaskComment, batch.comments)):
+        for statement in _lookup_chunks(model, [row["id"] for row in rows]):
+            yield model, statement
+
+
+def _drop_existing(batch: PreparedBatch, existing: Dict[Any, set]) -> None:
+    """既存idのタスク・子レコードを含むレコードをバッチから除外"""
+    conflicts: Dict[str, str] = {}
+    for row in batch.tasks:
+        if row["id"] in existing.get(Task, ()):
+            conflicts[row["id"]] = f"Task {row['id']} already exists"
+    for model, kind, rows in ((SubTask, "Subtask", batch.subtasks), (TaskComment, "Comment", batch.comments)):
+        for row in rows:
+            if row["id"] in existing.get(model, ()):
+                conflicts.setdefault(row["task_id"], f"{kind} {row['id']} already exists")
+    if not conflicts:
+        return
+    kept_tasks, kept_numbers = [], []
+    for row, number in zip(batch.tasks, batch.record_numbers):
+        if row["id"] in conflicts:
+            batch.errors.append({"record": number, "detail": conflicts[row["id"]]})
+        else:
+            kept_tasks.append(row)
+            kept_numbers.append(number)
+    batch.tasks, batch.record_numbers = kept_tasks, kept_numbers
+    batch.subtasks = [row for row in batch.subtasks if row["task_id"] not in conflicts]
+    batch.comments = [row for row in batch.comments if row["task_id"] not in conflicts]
+    batch.errors.sort(key=lambda error: error["record"])
+
+
+def _copy_value(value) -> Any:
+    """COPY用の値（Enumはデータベース上の名前、NULLは \\N）"""
+    if value is None:
+        return "\\N"
+    if hasattr(value, "name") and hasattr(value, "value"):
+        return value.name
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def copy_buffer(columns: List[str], rows: List[dict]) -> io.StringIO:
+    """COPY FROM STDIN に渡すCSV"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow([_copy_value(row.get(column)) for column in columns])
+    buffer.seek(0)
+    return buffer
+
+
+def _copy_rows(cursor, table: str, columns: List[str], rows: List[dict]) -> None:
+    buffer = copy_buffer(columns, rows)
+    cursor.copy_expert(
+        f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv, NULL '\\N')", buffer
+    )
+
+
+def write_batch(db: Session, batch: PreparedBatch, use_copy: Optional[bool] = None) -> None:
+    """1バッチを同期セッションで書き込んでコミット"""
+    existing: Dict[Any, set] = {}
+    for model, statement in _existing_queries(batch):
+        existing.setdefault(model, set()).update(db.scalars(statement))
+    _drop_existing(batch, existing)
+
+    if use_copy is None:
+        use_copy = db.get_bind().dialect.driver == "psycopg2"
+    if use_copy:
+        # COPYはセッションを経由しないため変更テーブルを明示する
+        mark_changed(db, Task.__tablename__, SubTask.__tablename__, TaskComment.__tablename__)
+        cursor = db.connection().connection.cursor()
+        try:
+            for table, columns, rows in (
+                (Task.__tablename__, _TASK_COLUMNS, batch.tasks),
+                (SubTask.__tablename__, _SUBTASK_COLUMNS, batch.subtasks),
+                (TaskComment.__tablename__, _COMMENT_COLUMNS, batch.comments),
+            ):
+                if rows:
+                    _copy_rows(cursor, table, columns, rows)
+        finally:
+            cursor.close()
+    else:
+        for model, rows in ((Task, batch.tasks), (SubTask, batch.subtasks), (TaskComment, batch.comments)):
+            if rows:
+                db.execute(insert(model.__table__), rows)
+    db.commit()
+
+
+async def write_batch_async(db: AsyncSession, batch: PreparedBatch) -> None:
+    """1バッチを非同期セッションで書き込んでコミット（executemany）"""
+    existing: Dict[Any, set] = {}
+    for model, statement in _existing_queries(batch):
+        existing.setdefault(model, set()).update(await db.scalars(statement))
+    _drop_existing(batch, existing)
+    for model, rows in ((Task, batch.tasks), (SubTask, batch.subtasks), (TaskComment, batch.comments)):
+        if rows:
+            await db.execute(insert(model.__table__), rows)
+    await db.commit()
@@ -0,0 +1,94 @@
+from sqlalchemy import Select, func, literal, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict, List, Optional, Tuple
+
+from app.models.task import Task, TaskPriority, TaskUrgency, TaskStatus
+
+# マトリックスのセルキー（"{priority}_{urgency}"）
+CELL_KEYS = [
+    f"{priority.value}_{urgency.value}"
+    for priority in TaskPriority
+    for urgency in TaskUrgency
+]
+
+# 象限とセルの対応（実際のデータ分布に合わせて定義）
+QUADRANT_CELLS = {
+    "quadrant_1": ["high_high"],
+    "quadrant_2": ["high_low"],
+    "quadrant_3": ["low_high"],
+    "quadrant_4": ["medium_low", "low_medium", "low_low"],
+}
+
+# MatrixTaskに必要な列のみ取得する
+MATRIX_COLUMNS = (Task.id, Task.title, Task.priority, Task.urgency, Task.status, Task.progress)
+
+_open_tasks = Task.status != TaskStatus.COMPLETED
+
+
+def cell_key(priority: TaskPriority, urgency: TaskUrgency) -> str:
+    return f"{priority.value}_{urgency.value}"
+
+
+def quadrant_counts(cell_counts: Dict[str, int]) -> Dict[str, int]:
+    """セル別件数から象限別件数を算出"""
+    return {
+        quadrant: sum(cell_counts.get(key, 0) for key in keys)
+        for quadrant, keys in QUADRANT_CELLS.items()
+    }
+
+
+def cell_tasks_statement(limit_per_cell: Optional[int] = None) -> Select:
+    """セル別のタスクと件数（cell_total、全件取得時は NULL）を返すselect"""
+    if limit_per_cell is None:
+        return select(*MATRIX_COLUMNS, literal(None).label("cell_total")).where(_open_tasks)
+    cell = (Task.priority, Task.urgency)
+    rank = func.row_number().over(
+        partition_by=cell,
+        order_by=(Task.created_at.desc(), Task.id.desc()),
+    ).label("cell_rank")
+    total = func.count().over(partition_by=cell).label("cell_total")
+    ranked = select(*MATRIX_COLUMNS, rank, total).where(_open_tasks).subquery()
+    return (
+        select(*(ranked.c[column.key] for column in MATRIX_COLUMNS), ranked.c.cell_total)
+        .where(ranked.c.cell_rank <= limit_per_cell)
+        .order_by(ranked.c.priority, ranked.c.urgency, ranked.c.cell_rank)
+    )
+
+
+async def fetch_cell_tasks(
+    db: AsyncSession, limit_per_cell: Optional[int] = None
+) -> Tuple[Dict[str, List[dict]], Dict[str, int]]:
+    """
+    セル別のタスクと件数を1ステートメントで取得（limit_per_cell指定時は各セル上位N件）
+
+    件数はタスクと同じ読み取りから求めるため、同じレスポンス内で食い違わない
+    （上位N件のみ返す場合はウィンドウ関数のセル内件数を使う）。
+    """
+    counts = {key: 0 for key in CELL_KEYS}
+    statement = cell_tasks_statement(limit_per_cell)
+    matrix: Dict[str, List[dict]] = {key: [] for key in CELL_KEYS}
+    for task_id, title, priority, urgency, status, progress, cell_total in await db.execute(statement):
+        key = cell_key(priority, urgency)
+        matrix[key].append({
+            "id": task_id,
+            "title": title,
+            "priority": priority.value,
+            "urgency": urgency.value,
+            "status": status.value,
+            "progress": progress,
+        })
+        counts[key] = cell_total if cell_total is not None else counts[key] + 1
+    return matrix, counts
+
+
+async def build_matrix(db: AsyncSession, limit_per_cell: Optional[int] = None) -> dict:
+    """マトリックス表示データを構築（タスクと件数は同じステートメントから）"""
+    matrix, cell_counts = await fetch_cell_tasks(db, limit_per_cell)
+    return {
+        "matrix": matrix,
+        "summary": {
+            "total_tasks": sum(cell_counts.values()),
+            "by_quadrant": quadrant_counts(cell_counts),
+            "by_cell": cell_counts,
+        }
+    }
@@ -0,0 +1,241 @@
+import base64
+import binascii
+import json
+from datetime import datetime
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import Enum, DateTime, Select, func, literal, tuple_
+
+from app.models.task import Task
+from app.models.subtask import SubTask
+from app.models.comment import TaskComment
+
+# キーセットページングで使用できるソート列（NULLを持たない列のみ）
+KEYSET_SORT_COLUMNS = {
+    "created_at", "updated_at", "title", "category", "priority", "urgency", "status",
+}
+
+NEXT = "next"
+PREV = "prev"
+
+
+class CursorError(ValueError):
+    """不正なカーソル"""
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if hasattr(value, "value"):
+        return value.value
+    return value
+
+
+def _decode_value(column, value: Any) -> Any:
+    column_type = column.property.columns[0].type
+    if isinstance(column_type, DateTime):
+        return datetime.fromisoformat(value)
+    if isinstance(column_type, Enum) and column_type.enum_class is not None:
+        return column_type.enum_class(value)
+    return value
+
+
+def _compare_as_julianday(dialect_name: str, column) -> bool:
+    """
+    SQLiteは日時を文字列で保存し、server_defaultとPython側の値で書式が異なるため
+    julianday()で数値化して比較・ソートする
+    """
+    return dialect_name == "sqlite" and isinstance(column.property.columns[0].type, DateTime)
+
+
+def encode_cursor(sort_by: str, sort_order: str, task: Any, direction: str) -> str:
+    """ページ境界のタスク（または結果行）から不透明なカーソル文字列を生成"""
+    payload = {
+        "s": sort_by,
+        "o": sort_order,
+        "v": _encode_value(getattr(task, sort_by)),
+        "id": task.id,
+        "d": direction,
+    }
+    raw = json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, sort_by: str, sort_order: str) -> Dict[str, Any]:
+    """カーソル文字列を復元し、現在のソート条件と一致するか検証"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        column = getattr(Task, payload["s"])
+        payload["v"] = _decode_value(column, payload["v"])
+    except (binascii.Error, ValueError, KeyError, TypeError, AttributeError, UnicodeError) as e:
+        raise CursorError("Invalid cursor") from e
+    if payload["s"] != sort_by or payload["o"] != sort_order:
+        raise CursorError("Cursor does not match sort_by/sort_order")
+    if payload.get("d") not in (NEXT, PREV):
+        raise CursorError("Invalid cursor")
+    return payload
+
+
+def keyset_page(
+    statement: Select,
+    dialect_name: str,
+    sort_by: str,
+    sort_order: str,
+    limit: int,
+    cursor: Optional[str] = None,
+) -> Tuple[Select, str]:
+    """
+    キーセット条件・並び順・件数を適用したselectを返す
+
+    戻り値の方向がPREVの場合、取得結果は逆順になっているため
+    finish_keyset_page()で並べ直すこと。
+    """
+    attribute = getattr(Task, sort_by)
+    wrap = func.julianday if _compare_as_julianday(dialect_name, attribute) else (lambda expr: expr)
+    column = wrap(attribute)
+    descending = sort_order == "desc"
+    direction = NEXT
+    if cursor:
+        payload = decode_cursor(cursor, sort_by, sort_order)
+        direction = payload["d"]
+        boundary = tuple_(column, Task.id)
+        # 列の型でバインドする（Enumは保存形式に変換される）
+        value = tuple_(wrap(literal(payload["v"], attribute.type)), payload["id"])
+        # 降順で次へ / 昇順で前へ は「より小さい」側をたどる
+        if descending == (direction == NEXT):
+            statement = statement.where(boundary < value)
+        else:
+            statement = statement.where(boundary > value)
+
+    # 前ページ取得時は並びを反転し、境界に近い行から取得する
+    reverse = descending != (direction == PREV)
+    if reverse:
+        statement = statement.order_by(None).order_by(column.desc(), Task.id.desc())
+    else:
+        statement = statement.order_by(None).order_by(column.asc(), Task.id.asc())
+
+    # 次ページ有無の判定用に1件多く取得
+    return statement.limit(limit + 1), direction
+
+
+def finish_keyset_page(
+    rows: List[Any],
+    sort_by: str,
+    sort_order: str,
+    limit: int,
+    direction: str,
+    has_cursor: bool,
+) -> Tuple[List[Any], Dict[str, Optional[str]]]:
+    """取得行を表示順に整え、前後ページのカーソルを生成（各行は sort_by と id の列を持つこと）"""
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if direction == PREV:
+        rows.reverse()
+
+    has_next = has_more if direction == NEXT else True
+    has_prev = has_more if direction == PREV else has_cursor
+
+    next_cursor = prev_cursor = None
+    if rows:
+        first_task, last_task = rows[0], rows[-1]
+        if has_next:
+            next_cursor = encode_cursor(sort_by, sort_order, last_task, NEXT)
+        if has_prev:
+            prev_cursor = encode_cursor(sort_by, sort_order, first_task, PREV)
+    return rows, {"next_cursor": next_cursor, "prev_cursor": prev_cursor}
+
+
+@dataclass(frozen=True)
+class ChildOrder:
+    """タスク配下の一覧（サブタスク・コメント）の並び順。最後の列は一意な id"""
+    kind: str
+    columns: Tuple[Any, ...]
+    descending: bool = False
+
+
+# インデックス (task_id, created_at, id) / (task_id, order_index, id) の順
+COMMENT_ORDER = ChildOrder("comment", (TaskComment.created_at, TaskComment.id), descending=True)
+SUBTASK_ORDER = ChildOrder("subtask", (SubTask.order_index, SubTask.id))
+
+
+def encode_child_cursor(order: ChildOrder, row: Any) -> str:
+    """行の並び順キーからカーソルを生成（before / after のどちらにも渡せる）"""
+    payload = {"k": order.kind, "v": [_encode_value(getattr(row, column.key)) for column in order.columns]}
+    raw = json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_child_cursor(order: ChildOrder, cursor: str) -> List[Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        kind, values = payload["k"], payload["v"]
+        if kind == order.kind and len(values) == len(order.columns):
+            return [_decode_value(column, value) for column, value in zip(order.columns, values)]
+    except (binascii.Error, ValueError, KeyError, TypeError, AttributeError, UnicodeError) as e:
+        raise CursorError("Invalid cursor") from e
+    raise CursorError("Invalid cursor")
+
+
+def child_keyset_page(
+    statement: Select,
+    dialect_name: str,
+    order: ChildOrder,
+    limit: int,
+    before: Optional[str] = None,
+    after: Optional[str] = None,
+) -> Tuple[Select, str]:
+    """
+    before / after のカーソルより前・後の limit 件を取得するselectを返す
+
+    方向がPREV（before 指定）の場合は逆順で取得するため finish_child_page() で並べ直すこと。
+    """
+    if before and after:
+        raise CursorError("Specify either before or after")
+    wraps = [
+        func.julianday if _compare_as_julianday(dialect_name, column) else (lambda expr: expr)
+        for column in order.columns
+    ]
+    columns = [wrap(column) for wrap, column in zip(wraps, order.columns)]
+    direction = PREV if before else NEXT
+    cursor = before or after
+    if cursor:
+        values = decode_child_cursor(order, cursor)
+        boundary = tuple_(*columns)
+        value = tuple_(*(
+            wrap(literal(value, column.type)) for wrap, column, value in zip(wraps, order.columns, values)
+        ))
+        # 降順で後へ / 昇順で前へ は「より小さい」側をたどる
+        if order.descending == (direction == NEXT):
+            statement = statement.where(boundary < value)
+        else:
+            statement = statement.where(boundary > value)
+
+    reverse = order.descending != (direction == PREV)
+    statement = statement.order_by(None).order_by(
+        *(column.desc() if reverse else column.asc() for column in columns)
+    )
+    # 続きの有無の判定用に1件多く取得
+    return statement.limit(limit + 1), direction
+
+
+def finish_child_page(
+    rows: List[Any], order: ChildOrder, limit: int, direction: str, has_cursor: bool
+) -> Tuple[List[Any], Dict[str, Optional[str]]]:
+    """取得行を表示順に整え、前後ページのカーソルを生成（next_cursor は after、prev_cursor は before に渡す）"""
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if direction == PREV:
+        rows.reverse()
+    has_next = has_more if direction == NEXT else True
+    has_prev = has_more if direction == PREV else has_cursor
+
+    cursors = {"next_cursor": None, "prev_cursor": None}
+    if rows:
+        if has_next:
+            cursors["next_cursor"] = encode_child_cursor(order, rows[-1])
+        if has_prev:
+            cursors["prev_cursor"] = encode_child_cursor(order, rows[0])
+    return rows, cursors
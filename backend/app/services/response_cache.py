@@ -0,0 +1,394 @@
+"""
+読み取りAPIのレスポンスキャッシュ
+
+キーはエンドポイント名と正規化したパラメータ（None除外・名前順・列挙型は値）から作る。
+各エントリには依存するデータのタグ（tasks:list / task:{id} など）を付け、
+書き込み後はコミットしてから影響するタグだけを無効化する。
+エントリはJSONエンコード済みの本文と検証子（ETag / Last-Modified）を保持するため、
+ヒット時はデータベースにアクセスせず200または304を返す。
+圧縮の最小サイズ以上の本文は保存時に gzip / brotli で圧縮しておき、ヒットのたびには圧縮しない。
+
+バックエンド（RESPONSE_CACHE_BACKEND）
+- memory: プロセス内のLRU+TTL（既定）。他ワーカーでの書き込みはTTL経過まで反映されないため、
+  書き込んだクライアントにはTTL以上の read-your-writes 期限を返し、期限内はキャッシュを使わない
+- redis: Redis互換サーバを全ワーカーで共有（redis パッケージが必要）
+- none: キャッシュしない
+"""
+import base64
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from datetime import date, datetime
+from enum import Enum
+from typing import Dict, Iterable, Optional, Set, Tuple
+from urllib.parse import urlencode
+
+import orjson
+from fastapi import Request, Response
+from pydantic import BaseModel
+
+from app.database.replicas import replica_router
+from app.middleware.compression import compression_settings
+from app.services.etag import Validators
+
+logger = logging.getLogger(__name__)
+
+TAG_LIST = "tasks:list"
+TAG_SEARCH = "tasks:search"
+TAG_MATRIX = "tasks:matrix"
+TAG_CALENDAR = "tasks:calendar"
+
+
+def task_tag(task_id: str) -> str:
+    """タスク詳細（サブタスク・コメント含む）のタグ"""
+    return f"task:{task_id}"
+
+
+def _param_value(value) -> str:
+    if isinstance(value, Enum):
+        return str(value.value)
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+def cache_key(endpoint: str, **params) -> str:
+    """エンドポイント名と正規化したパラメータからキーを作成"""
+    query = urlencode(sorted(
+        (name, _param_value(value)) for name, value in params.items() if value is not None
+    ))
+    return f"{endpoint}?{query}"
+
+
+def _encode_default(value):
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json")
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def encode_json(payload) -> bytes:
+    """ORJSONResponseと同じ形式でエンコード（列挙型・日時はorjsonが直接変換）"""
+    return orjson.dumps(payload, default=_encode_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+@dataclass
+class CachedResponse:
+    body: bytes
+    etag: str
+    last_modified: Optional[datetime]
+    # 圧縮済みの本文（Content-Encoding ごと）
+    encoded: Dict[str, bytes] = field(default_factory=dict)
+
+    @classmethod
+    def build(cls, body: bytes, validators: Validators, precompress: bool = True) -> "CachedResponse":
+        encoded = {}
+        if (
+            precompress
+            and len(body) >= compression_settings.minimum_size
+            and compression_settings.allows("application/json")
+        ):
+            encoded = {
+                encoding: compression_settings.compress(body, encoding)
+                for encoding in compression_settings.encodings
+            }
+        return cls(body=body, etag=validators.etag, last_modified=validators.last_modified, encoded=encoded)
+
+    @property
+    def validators(self) -> Validators:
+        return Validators(etag=self.etag, last_modified=self.last_modified)
+
+    def respond(self, request: Request) -> Response:
+        validators = self.validators
+        if validators.matches(request):
+            return validators.not_modified()
+        headers = validators.headers()
+        body = self.body
+        if self.encoded:
+            headers["Vary"] = "Accept-Encoding"
+            encoding = compression_settings.negotiate(request.headers.get("accept-encoding"))
+            if encoding in self.encoded:
+                body = self.encoded[encoding]
+                headers["Content-Encoding"] = encoding
+        return Response(content=body, media_type="application/json", headers=headers)
+
+    def dumps(self) -> str:
+        return json.dumps({
+            "body": self.body.decode("utf-8"),
+            "etag": self.etag,
+            "last_modified": self.last_modified.isoformat() if self.last_modified else None,
+            "encoded": {
+                encoding: base64.b64encode(body).decode("ascii") for encoding, body in self.encoded.items()
+            },
+        })
+
+    @classmethod
+    def loads(cls, raw) -> "CachedResponse":
+        data = json.loads(raw)
+        return cls(
+            body=data["body"].encode("utf-8"),
+            etag=data["etag"],
+            last_modified=datetime.fromisoformat(data["last_modified"]) if data["last_modified"] else None,
+            encoded={encoding: base64.b64decode(body) for encoding, body in data.get("encoded", {}).items()},
+        )
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    invalidations: int = 0
+
+    def as_dict(self) -> dict:
+        lookups = self.hits + self.misses
+        return {**asdict(self), "hit_ratio": round(self.hits / lookups, 4) if lookups else None}
+
+
+class MemoryCacheBackend:
+    """プロセス内のLRU+TTLキャッシュ（タグ→キーの索引付き）"""
+
+    name = "memory"
+
+    def __init__(self, stats: CacheStats, max_entries: int = 1000, ttl: float = 30.0):
+        self.stats = stats
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[float, CachedResponse, Tuple[str, ...]]]" = OrderedDict()
+        self._tags: Dict[str, Set[str]] = {}
+
+    def _remove(self, key: str) -> None:
+        _, _, tags = self._entries.pop(key)
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            expires_at, entry, _ = item
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                self.stats.expirations += 1
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    async def set(self, key: str, entry: CachedResponse, tags: Tuple[str, ...]) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + self.ttl, entry, tags)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+                self.stats.evictions += 1
+
+    async def invalidate(self, tags: Iterable[str]) -> int:
+        with self._lock:
+            keys = set()
+            for tag in tags:
+                keys.update(self._tags.pop(tag, ()))
+            for key in keys:
+                if key in self._entries:
+                    self._remove(key)
+            return len(keys)
+
+    async def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+
+    async def describe(self) -> dict:
+        return {"entries": len(self._entries), "max_entries": self.max_entries, "ttl": self.ttl}
+
+    async def close(self) -> None:
+        pass
+
+
+class RedisCacheBackend:
+    """Redis互換サーバのキャッシュ（タグはSETでキーを保持）"""
+
+    name = "redis"
+
+    def __init__(self, stats: CacheStats, url: str, ttl: float = 30.0, prefix: str = "respcache:"):
+        import redis.asyncio as redis
+
+        self.stats = stats
+        self.ttl = ttl
+        self.prefix = prefix
+        self._client = redis.from_url(url)
+
+    def _key(self, key: str) -> str:
+        return f"{self.prefix}k:{key}"
+
+    def _tag(self, tag: str) -> str:
+        return f"{self.prefix}t:{tag}"
+
+    async def get(self, key: str) -> Optional[CachedResponse]:
+        raw = await self._client.get(self._key(key))
+        return CachedResponse.loads(raw) if raw is not None else None
+
+    async def set(self, key: str, entry: CachedResponse, tags: Tuple[str, ...]) -> None:
+        ttl_ms = int(self.ttl * 1000)
+        async with self._client.pipeline(transaction=True) as pipe:
+            pipe.set(self._key(key), entry.dumps(), px=ttl_ms)
+            for tag in tags:
+                pipe.sadd(self._tag(tag), self._key(key))
+                # タグはエントリより長く保持する（期限切れのキーが残っても削除が空振りするだけ）
+                pipe.pexpire(self._tag(tag), ttl_ms * 2)
+            await pipe.execute()
+
+    async def invalidate(self, tags: Iterable[str]) -> int:
+        tag_keys = [self._tag(tag) for tag in tags]
+        async with self._client.pipeline(transaction=False) as pipe:
+            for tag_key in tag_keys:
+                pipe.smembers(tag_key)
+            members = await pipe.execute()
+        keys = set().union(*members) if members else set()
+        if keys or tag_keys:
+            await self._client.delete(*keys, *tag_keys)
+        return len(keys)
+
+    async def clear(self) -> None:
+        batch = []
+        async for key in self._client.scan_iter(match=f"{self.prefix}*", count=500):
+            batch.append(key)
+            if len(batch) >= 500:
+                await self._client.delete(*batch)
+                batch = []
+        if batch:
+            await self._client.delete(*batch)
+
+    async def describe(self) -> dict:
+        # LRUによる追い出しはサーバ側で行われるためサーバの統計を返す
+        info = await self._client.info("stats")
+        return {"ttl": self.ttl, "server_evicted_keys": info.get("evicted_keys")}
+
+    async def close(self) -> None:
+        await self._client.close()
+
+
+class CacheLookup:
+    """1リクエスト分の参照結果（ミス時は store で応答を作成して保存する）"""
+
+    def __init__(self, cache: "ResponseCache", request: Request, key: str, tags: Tuple[str, ...],
+                 response: Optional[Response]):
+        self.cache = cache
+        self.request = request
+        self.key = key
+        self.tags = tags
+        self.response = response
+        self.generation = cache.generation
+
+    async def store(self, payload, validators: Validators) -> Response:
+        # キャッシュしない場合の圧縮はミドルウェアに任せる
+        entry = CachedResponse.build(encode_json(payload), validators, precompress=self.cache.backend is not None)
+        await self.cache.put(self, entry)
+        return entry.respond(self.request)
+
+
+class ResponseCache:
+    def __init__(self, backend_name: str = "memory", max_entries: int = 1000, ttl: float = 30.0,
+                 redis_url: Optional[str] = None):
+        self.stats = CacheStats()
+        if backend_name == "redis":
+            self.backend = RedisCacheBackend(self.stats, redis_url or "redis://localhost:6379/0", ttl)
+        elif backend_name == "memory":
+            self.backend = MemoryCacheBackend(self.stats, max_entries, ttl)
+        else:
+            self.backend = None
+        # 無効化の回数（参照中に書き込みがあった場合の古い結果の保存を防ぐ）
+        self.generation = 0
+
+    async def lookup(self, request: Request, key: str, tags: Iterable[str]) -> CacheLookup:
+        """キャッシュを参照し、ヒットすれば lookup.response に200/304の応答を設定"""
+        tags = tuple(tags)
+        if self.backend is None:
+            return CacheLookup(self, request, key, tags, None)
+        # 直前に書き込んだクライアントには、無効化が届いていない可能性のあるエントリを返さない
+        if replica_router.in_read_your_writes_window(request):
+            self.stats.misses += 1
+            return CacheLookup(self, request, key, tags, None)
+        try:
+            entry = await self.backend.get(key)
+        except Exception:
+            logger.exception("Response cache get failed")
+            entry = None
+        if entry is None:
+            self.stats.misses += 1
+            return CacheLookup(self, request, key, tags, None)
+        self.stats.hits += 1
+        return CacheLookup(self, request, key, tags, entry.respond(request))
+
+    async def put(self, lookup: CacheLookup, entry: CachedResponse) -> None:
+        if self.backend is None or lookup.generation != self.generation:
+            return
+        # 書き込み直後にレプリカから読んだ結果は古い可能性がある
+        if replica_router.may_be_stale(lookup.request):
+            return
+        try:
+            await self.backend.set(lookup.key, entry, lookup.tags)
+            self.stats.stores += 1
+        except Exception:
+            logger.exception("Response cache set failed")
+
+    async def invalidate(self, *tags: str) -> None:
+        """タグの付いたエントリを削除（コミット後に呼ぶ）"""
+        self.generation += 1
+        if self.backend is None:
+            return
+        try:
+            self.stats.invalidations += await self.backend.invalidate(tags)
+        except Exception:
+            logger.exception("Response cache invalidate failed")
+
+    async def invalidate_task(self, *task_ids: str) -> None:
+        """タスク行の作成・更新・削除"""
+        await self.invalidate(TAG_LIST, TAG_SEARCH, TAG_MATRIX, TAG_CALENDAR, *map(task_tag, task_ids))
+
+    async def invalidate_task_children(self, task_id: str) -> None:
+        """サブタスク・コメントの変更（件数と詳細のみ影響し、マトリックス・カレンダーは対象外）"""
+        await self.invalidate(TAG_LIST, TAG_SEARCH, task_tag(task_id))
+
+    async def clear(self) -> None:
+        self.generation += 1
+        if self.backend is not None:
+            await self.backend.clear()
+
+    async def status(self) -> dict:
+        if self.backend is None:
+            return {"backend": "none", **self.stats.as_dict()}
+        try:
+            backend = await self.backend.describe()
+        except Exception as e:
+            backend = {"error": str(e)}
+        return {"backend": self.backend.name, **backend, **self.stats.as_dict()}
+
+    async def close(self) -> None:
+        if self.backend is not None:
+            await self.backend.close()
+
+
+response_cache = ResponseCache(
+    backend_name=os.getenv("RESPONSE_CACHE_BACKEND", "memory"),
+    max_entries=int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "1000")),
+    ttl=float(os.getenv("RESPONSE_CACHE_TTL", "30")),
+    redis_url=os.getenv("REDIS_URL"),
+)
+if isinstance(response_cache.backend, MemoryCacheBackend):
+    replica_router.require_read_your_writes(response_cache.backend.ttl)
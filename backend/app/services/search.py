@@ -0,0 +1,85 @@
+"""
+タスクの全文検索
+
+タイトル・説明・メモ・コメント本文を対象に、空白区切りの全語を含むタスクを探す。
+- SQLite: FTS5（trigram）の task_search を MATCH し、bm25でランク付け
+- PostgreSQL: pg_trgm のGINインデックスが効く ILIKE で絞り込み、word_similarityでランク付け
+  （pg_trgm を作成できなかった場合はランク付けせず作成日時順）
+トライグラムは3文字未満の語に使えないため、短い語を含む場合はLIKEの走査で検索する。
+"""
+from typing import List
+
+from sqlalchemy import Select, and_, column, func, literal, literal_column, select, table, true
+
+from app.database import search_index
+from app.database.search_index import SEARCH_DOCUMENT_SQL, SEARCH_TABLE
+from app.models.task import Task
+from app.models.comment import TaskComment
+
+MIN_TRIGRAM_TERM_LENGTH = 3
+
+_search_table = table(SEARCH_TABLE, column("task_id"))
+_search_match = literal_column(SEARCH_TABLE)
+_document = literal_column(SEARCH_DOCUMENT_SQL)
+
+
+def search_terms(query: str) -> List[str]:
+    """検索語に分割（全角スペースも区切りとして扱う）"""
+    return query.split()
+
+
+def _use_fts(dialect_name: str, terms: List[str]) -> bool:
+    return dialect_name == "sqlite" and all(len(term) >= MIN_TRIGRAM_TERM_LENGTH for term in terms)
+
+
+def _fts_query(terms: List[str]) -> str:
+    """FTS5のクエリ文字列（各語をフレーズとして AND 検索）"""
+    return " ".join('"' + term.replace('"', '""') + '"' for term in terms)
+
+
+def _like_filter(terms: List[str]):
+    """各語がタスク本文またはコメントに含まれる条件"""
+    conditions = []
+    for term in terms:
+        pattern = "%" + term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+        conditions.append(Task.id.in_(
+            select(Task.id).where(_document.ilike(pattern, escape="\\"))
+            .union(select(TaskComment.task_id).where(TaskComment.content.ilike(pattern, escape="\\")))
+        ))
+    return conditions
+
+
+def search_filter(dialect_name: str, query: str):
+    """一覧のフィルタ条件として使う検索条件"""
+    terms = search_terms(query)
+    if not terms:
+        return true()
+    if _use_fts(dialect_name, terms):
+        return Task.id.in_(
+            select(_search_table.c.task_id).where(_search_match.op("MATCH")(_fts_query(terms)))
+        )
+    return and_(*_like_filter(terms))
+
+
+def ranked_search(dialect_name: str, query: str) -> Select:
+    """(Task, rank) を関連度の高い順に返すselect"""
+    terms = search_terms(query)
+    if _use_fts(dialect_name, terms):
+        # bm25は小さいほど関連度が高い（重み: タイトル > 説明 > メモ > コメント、task_id は対象外）
+        rank = -func.bm25(_search_match, 0.0, 10.0, 4.0, 2.0, 1.0)
+        return (
+            select(Task, rank.label("rank"))
+            .join(_search_table, _search_table.c.task_id == Task.id)
+            .where(_search_match.op("MATCH")(_fts_query(terms)))
+            .order_by(rank.desc(), Task.created_at.desc(), Task.id.desc())
+        )
+
+    if dialect_name == "postgresql" and search_index.trigram_enabled:
+        rank = func.word_similarity(query, _document)
+    else:
+        rank = literal(0.0)
+    return (
+        select(Task, rank.label("rank"))
+        .where(*_like_filter(terms))
+        .order_by(rank.desc(), Task.created_at.desc(), Task.id.desc())
+    )
@@ -0,0 +1,178 @@
+"""
+サブタスクの並び順（疎な order_index）
+
+order_index は ORDER_GAP 間隔で採番し、移動では前後のサブタスクの中間値を
+移動するサブタスク1行にだけ設定する（兄弟の order_index は変更しない）。
+
+- 中間に整数の余地がない場合は、そのタスクのサブタスクを並び順を保ったまま
+  ORDER_GAP 間隔に振り直して（1ステートメント）から移動する
+- 移動後の隙間が REBALANCE_THRESHOLD 未満になった場合は、次の移動が1行で済むよう
+  応答後にバックグラウンドで振り直す
+- 並び替え（全件の順列指定）は CASE 式の1ステートメントで更新する
+
+同じ order_index のサブタスクは id 順に並べる。
+"""
+import logging
+from typing import List, Optional, Set, Tuple
+
+from sqlalchemy import case, func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.subtask import SubTask
+from app.services.response_cache import response_cache
+from app.services.task_counts import adjust_counts
+
+logger = logging.getLogger(__name__)
+
+ORDER_GAP = 1024
+REBALANCE_THRESHOLD = 16
+
+# 並び順（order_index が同じ場合は id）
+ORDER_BY = (SubTask.order_index, SubTask.id)
+
+
+class OrderError(ValueError):
+    """移動先・並び替えの指定が不正"""
+
+
+def key_between(prev: Optional[int], next: Optional[int]) -> Optional[int]:
+    """prev と next の間の order_index（余地がなければ None）"""
+    if prev is None and next is None:
+        return ORDER_GAP
+    if prev is None:
+        return next - ORDER_GAP
+    if next is None:
+        return prev + ORDER_GAP
+    if next - prev < 2:
+        return None
+    return (prev + next) // 2
+
+
+async def next_order_index(db: AsyncSession, task_id: str) -> int:
+    """末尾に追加する order_index"""
+    last = await db.scalar(select(func.max(SubTask.order_index)).where(SubTask.task_id == task_id))
+    return key_between(last, None)
+
+
+async def _sibling_key(db: AsyncSession, task_id: str, sibling_id: str) -> int:
+    key = await db.scalar(
+        select(SubTask.order_index).where(SubTask.id == sibling_id, SubTask.task_id == task_id)
+    )
+    if key is None:
+        raise OrderError(f"Subtask {sibling_id} is not in task {task_id}")
+    return key
+
+
+async def neighbor_keys(
+    db: AsyncSession, subtask: SubTask, after_id: Optional[str], before_id: Optional[str]
+) -> Tuple[Optional[int], Optional[int]]:
+    """
+    移動先の前後の order_index
+
+    after_id: その直後に移動 / before_id: その直前に移動 / どちらもなし: 末尾に移動
+    """
+    if subtask.id in (after_id, before_id):
+        raise OrderError("Cannot move a subtask relative to itself")
+    siblings = select(SubTask.order_index).where(SubTask.task_id == subtask.task_id, SubTask.id != subtask.id)
+    # 基準と同じ order_index の兄弟がいる場合は prev == next となり、振り直しの対象になる
+    if after_id is not None:
+        prev = await _sibling_key(db, subtask.task_id, after_id)
+        next = await db.scalar(
+            siblings.where(SubTask.order_index >= prev, SubTask.id != after_id)
+            .order_by(SubTask.order_index).limit(1)
+        )
+        return prev, next
+    if before_id is not None:
+        next = await _sibling_key(db, subtask.task_id, before_id)
+        prev = await db.scalar(
+            siblings.where(SubTask.order_index <= next, SubTask.id != before_id)
+            .order_by(SubTask.order_index.desc()).limit(1)
+        )
+        return prev, next
+    return await db.scalar(select(func.max(SubTask.order_index)).where(
+        SubTask.task_id == subtask.task_id, SubTask.id != subtask.id
+    )), None
+
+
+async def rebalance(db: AsyncSession, task_id: str) -> int:
+    """並び順を保ったまま ORDER_GAP 間隔に振り直し、更新件数を返す（コミットは呼び出し側）"""
+    ranked = (
+        select(SubTask.id, func.row_number().over(order_by=ORDER_BY).label("position"))
+        .where(SubTask.task_id == task_id)
+        .subquery()
+    )
+    result = await db.execute(
+        update(SubTask)
+        .where(SubTask.id == ranked.c.id)
+        .values(order_index=ranked.c.position * ORDER_GAP)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
+
+
+async def move_subtask(
+    db: AsyncSession, subtask: SubTask, after_id: Optional[str] = None, before_id: Optional[str] = None
+) -> bool:
+    """
+    サブタスクを移動し、隙間が少なくなった場合は True（バックグラウンドでの振り直しを推奨）
+
+    コミットは呼び出し側で行う。
+    """
+    if after_id is not None and before_id is not None:
+        raise OrderError("Specify either after_id or before_id")
+    prev, next = await neighbor_keys(db, subtask, after_id, before_id)
+    key = key_between(prev, next)
+    if key is None:
+        await rebalance(db, subtask.task_id)
+        # 一括UPDATEはセッションに反映されないため読み直す（古い値と同じキーだとUPDATEされない）
+        await db.refresh(subtask, ["order_index"])
+        prev, next = await neighbor_keys(db, subtask, after_id, before_id)
+        key = key_between(prev, next)
+    subtask.order_index = key
+    gaps = [abs(key - neighbor) for neighbor in (prev, next) if neighbor is not None]
+    return bool(gaps) and min(gaps) < REBALANCE_THRESHOLD
+
+
+async def reorder_subtasks(db: AsyncSession, task_id: str, ids: List[str]) -> int:
+    """ids の順に並べ替える（ids はタスクの全サブタスクの順列、コミットは呼び出し側）"""
+    if len(set(ids)) != len(ids):
+        raise OrderError("Duplicate subtask ids")
+    existing = set(await db.scalars(select(SubTask.id).where(SubTask.task_id == task_id)))
+    if set(ids) != existing:
+        missing = len(existing - set(ids))
+        unknown = len(set(ids) - existing)
+        raise OrderError(
+            f"ids must list every subtask of the task exactly once ({missing} missing, {unknown} unknown)"
+        )
+    if not ids:
+        return 0
+    result = await db.execute(
+        update(SubTask)
+        .where(SubTask.task_id == task_id)
+        .values(order_index=case(
+            {subtask_id: (position + 1) * ORDER_GAP for position, subtask_id in enumerate(ids)},
+            value=SubTask.id,
+        ))
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
+
+
+_rebalancing: Set[str] = set()
+
+
+async def rebalance_in_background(session_factory, task_id: str) -> None:
+    """応答後に振り直す（BackgroundTasks から呼ぶ、同じタスクの重複実行はしない）"""
+    if task_id in _rebalancing:
+        return
+    _rebalancing.add(task_id)
+    try:
+        async with session_factory() as db:
+            await rebalance(db, task_id)
+            await adjust_counts(db, task_id)
+            await db.commit()
+        await response_cache.invalidate_task_children(task_id)
+    except Exception:
+        logger.exception("Subtask rebalance failed for task %s", task_id)
+    finally:
+        _rebalancing.discard(task_id)
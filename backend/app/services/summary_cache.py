@@ -0,0 +1,140 @@
+"""
+マトリックス集計のプロセス内キャッシュ
+
+(priority, urgency, status) ごとの件数を保持し、タスクの作成・更新・削除の
+コミット後に差分で更新する。取りこぼしは定期的な突き合わせ（reconcile）で
+データベースの値に補正される。
+
+集計時の change_versions（tasks）のバージョンを保持し、参照時のバージョンと
+異なれば再集計する（sync）。他プロセスでの書き込みもバージョンの加算で検出するため、
+ETag（同じバージョンから作る）と本文が食い違わない。
+/tasks/matrix/summary のみで使う（/tasks/matrix はセルのタスクと同じクエリから件数を求める）。
+"""
+import asyncio
+import logging
+import threading
+from collections import Counter
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.change_version import ChangeVersion
+from app.models.task import Task, TaskPriority, TaskUrgency, TaskStatus
+from app.services.matrix import CELL_KEYS, cell_key, quadrant_counts
+
+logger = logging.getLogger(__name__)
+
+SummaryKey = Tuple[TaskPriority, TaskUrgency, TaskStatus]
+
+
+def summary_key(task: Task) -> SummaryKey:
+    """タスクの集計キー"""
+    return (task.priority, task.urgency, task.status)
+
+
+class TaskSummaryCache:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts: Counter = Counter()
+        self._loaded = False
+        # 差分適用の回数（突き合わせ中の更新検出用）
+        self._version = 0
+        # 集計時の change_versions（tasks）のバージョン
+        self._tasks_version: Optional[int] = None
+
+    @staticmethod
+    async def _count_from_db(db: AsyncSession) -> Counter:
+        rows = (await db.execute(
+            select(Task.priority, Task.urgency, Task.status, func.count())
+            .group_by(Task.priority, Task.urgency, Task.status)
+        )).all()
+        return Counter({(priority, urgency, status): count for priority, urgency, status, count in rows})
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    async def sync(self, db: AsyncSession, tasks_version: int) -> None:
+        """tasks のバージョンが集計時と異なれば再集計"""
+        if not self._loaded or self._tasks_version != tasks_version:
+            await self.reconcile(db)
+
+    async def reconcile(self, db: AsyncSession) -> Dict[SummaryKey, int]:
+        """
+        データベースの集計値と突き合わせて補正し、差分を返す
+
+        バージョンは集計より先に読む（集計の方が新しい場合は次の sync で再集計される）。
+        集計中に差分が適用された場合は結果が古い可能性があるため置き換えない。
+        """
+        version = self._version
+        tasks_version = await db.scalar(
+            select(ChangeVersion.version).where(ChangeVersion.table_name == Task.__tablename__)
+        )
+        counts = await self._count_from_db(db)
+        with self._lock:
+            if self._loaded and version != self._version:
+                return {}
+            previous = self._counts if self._loaded else counts
+            drift = {
+                key: counts.get(key, 0) - previous.get(key, 0)
+                for key in set(counts) | set(previous)
+                if counts.get(key, 0) != previous.get(key, 0)
+            }
+            self._counts = counts
+            self._tasks_version = tasks_version
+            self._loaded = True
+            return drift
+
+    def apply(self, before: Optional[SummaryKey], after: Optional[SummaryKey]) -> None:
+        """コミット済みの変更を差分で反映（作成: before=None / 削除: after=None）"""
+        if before == after:
+            return
+        with self._lock:
+            if not self._loaded:
+                return
+            if before is not None:
+                self._counts[before] -= 1
+            if after is not None:
+                self._counts[after] += 1
+            self._version += 1
+
+    def invalidate(self) -> None:
+        """次回参照時にデータベースから再集計させる"""
+        with self._lock:
+            self._loaded = False
+            self._version += 1
+
+    def cell_counts(self) -> Dict[str, int]:
+        """完了以外のタスクのセル別件数"""
+        counts = {key: 0 for key in CELL_KEYS}
+        with self._lock:
+            for (priority, urgency, status), count in self._counts.items():
+                if status != TaskStatus.COMPLETED and count:
+                    counts[cell_key(priority, urgency)] += count
+        return counts
+
+    def summary(self) -> dict:
+        """マトリックスのsummary（/tasks/matrix と同じ形式）"""
+        cell_counts = self.cell_counts()
+        return {
+            "total_tasks": sum(cell_counts.values()),
+            "by_quadrant": quadrant_counts(cell_counts),
+            "by_cell": cell_counts,
+        }
+
+
+summary_cache = TaskSummaryCache()
+
+
+async def run_reconciler(session_factory, interval: float) -> None:
+    """定期的にキャッシュをデータベースと突き合わせる"""
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            async with session_factory() as db:
+                drift = await summary_cache.reconcile(db)
+            if drift:
+                logger.info("Summary cache reconciled: %d keys corrected", len(drift))
+        except Exception:
+            logger.exception("Summary cache reconcile failed")
@@ -0,0 +1,119 @@
+"""
+タスクの子レコード件数（非正規化列）の維持
+
+tasks.subtask_count / completed_subtasks / comment_count は一覧・詳細で
+子テーブルを数えずに済むよう、サブタスク・コメントの書き込みと同じ
+トランザクションで差分を加算する（UPDATE ... SET n = n + 1 のため同時書き込みでも崩れない）。
+インポートは取り込むレコードの件数を直接設定する。
+同じUPDATEで tasks.children_version も加算し、タスク詳細の検証子はこの行だけから作る
+（件数の更新は change_versions の tasks を加算しないため、マトリックス・カレンダーの検証子は変わらない）。
+
+ずれが生じた場合（直接のSQL操作など）は repair_counts() で子テーブルから再計算する。
+"""
+from typing import Callable, List, Optional, Tuple
+
+from sqlalchemy import Update, func, inspect, or_, select, text, update
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.database.change_tracking import SKIP_CHANGE_VERSION
+from app.models.task import Task
+from app.models.subtask import SubTask
+from app.models.comment import TaskComment
+
+COUNT_COLUMNS = ("subtask_count", "completed_subtasks", "comment_count")
+# 起動時に既存テーブルへ追加する列（件数列と子レコードの変更回数）
+DENORMALIZED_COLUMNS = COUNT_COLUMNS + ("children_version",)
+REPAIR_BATCH_SIZE = 1000
+
+
+def adjust_counts_statement(task_id: str, subtasks: int = 0, completed: int = 0, comments: int = 0) -> Update:
+    """件数に差分を加算し、子レコードの変更回数を進めるUPDATE"""
+    values = {"children_version": Task.children_version + 1}
+    if subtasks:
+        values["subtask_count"] = Task.subtask_count + subtasks
+    if completed:
+        values["completed_subtasks"] = Task.completed_subtasks + completed
+    if comments:
+        values["comment_count"] = Task.comment_count + comments
+    # 件数の更新ではタスクの更新日時を変えない（onupdateを抑止）
+    values["updated_at"] = Task.updated_at
+    return (
+        update(Task)
+        .where(Task.id == task_id)
+        .values(**values)
+        .execution_options(**{SKIP_CHANGE_VERSION: True})
+    )
+
+
+async def adjust_counts(db: AsyncSession, task_id: str, subtasks: int = 0, completed: int = 0, comments: int = 0) -> None:
+    """件数に差分を加算（コミットは呼び出し側で行う、差分がなくても子レコードの変更として記録する）"""
+    await db.execute(adjust_counts_statement(task_id, subtasks, completed, comments))
+
+
+def actual_counts():
+    """子テーブルから数えた件数（相関サブクエリ）"""
+    return {
+        "subtask_count": (
+            select(func.count(SubTask.id)).where(SubTask.task_id == Task.id).correlate(Task).scalar_subquery()
+        ),
+        "completed_subtasks": (
+            select(func.count(SubTask.id))
+            .where(SubTask.task_id == Task.id, SubTask.completed.is_(True))
+            .correlate(Task)
+            .scalar_subquery()
+        ),
+        "comment_count": (
+            select(func.count(TaskComment.id)).where(TaskComment.task_id == Task.id).correlate(Task).scalar_subquery()
+        ),
+    }
+
+
+def repair_statement(task_ids: List[str]) -> Update:
+    """指定タスクのうち件数がずれている行のみ再計算するUPDATE"""
+    counts = actual_counts()
+    return (
+        update(Task)
+        .where(Task.id.in_(task_ids), or_(*(getattr(Task, name) != value for name, value in counts.items())))
+        .values(**counts, updated_at=Task.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def ensure_count_columns(engine: Engine) -> List[str]:
+    """既存の tasks テーブルに件数列（と子レコードの変更回数）がなければ追加し、追加した列名を返す"""
+    existing = {column["name"] for column in inspect(engine).get_columns(Task.__tablename__)}
+    missing = [name for name in DENORMALIZED_COLUMNS if name not in existing]
+    with engine.begin() as conn:
+        for name in missing:
+            conn.execute(text(f"ALTER TABLE {Task.__tablename__} ADD COLUMN {name} INTEGER NOT NULL DEFAULT 0"))
+    return missing
+
+
+def repair_counts(
+    db: Session,
+    batch_size: int = REPAIR_BATCH_SIZE,
+    on_batch: Optional[Callable[[int, int], None]] = None,
+) -> Tuple[int, int]:
+    """
+    全タスクの件数を id 順のバッチで再計算し、(確認件数, 修正件数) を返す
+
+    バッチごとにコミットするため、長時間のロックを取らない。
+    """
+    checked = fixed = 0
+    last_id = None
+    while True:
+        query = select(Task.id).order_by(Task.id).limit(batch_size)
+        if last_id is not None:
+            query = query.where(Task.id > last_id)
+        task_ids = list(db.scalars(query))
+        if not task_ids:
+            break
+        fixed += db.execute(repair_statement(task_ids)).rowcount
+        db.commit()
+        checked += len(task_ids)
+        last_id = task_ids[-1]
+        if on_batch is not None:
+            on_batch(checked, fixed)
+    return checked, fixed
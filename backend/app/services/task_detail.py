@@ -0,0 +1,79 @@
+"""
+タスク詳細の組み立て
+
+関連データのクエリ数をタスクの規模によらず一定にする。
+- タスク本体と集計値（サブタスク数・完了数・コメント数）: 1クエリ（fields= の列のみ）
+- サブタスク・コメント: include= で指定したものだけ、それぞれ上限付きの1クエリ
+
+selectinload は親ごとの LIMIT を付けられないため、親が1件の詳細では
+同じ形（task_id で絞り込み）に LIMIT/OFFSET を付けたクエリで埋め込む。
+"""
+from dataclasses import dataclass
+from typing import Optional, Sequence
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.task import Task
+from app.models.subtask import SubTask
+from app.models.comment import TaskComment
+from app.services.task_query import task_columns, with_counts
+
+DETAIL_INCLUDES = ("subtasks", "comments")
+SUBTASK_COLUMNS = (SubTask.id, SubTask.title, SubTask.completed, SubTask.order_index, SubTask.created_at)
+COMMENT_COLUMNS = (TaskComment.id, TaskComment.content, TaskComment.created_at)
+
+
+@dataclass
+class EmbedPage:
+    limit: int
+    offset: int = 0
+
+    def meta(self, returned: int, total: int) -> dict:
+        return {
+            "limit": self.limit,
+            "offset": self.offset,
+            "total": total,
+            "has_more": self.offset + returned < total,
+        }
+
+
+async def load_task_detail(
+    db: AsyncSession,
+    task_id: str,
+    fields: Sequence[str],
+    include: Sequence[str],
+    subtasks_page: EmbedPage,
+    comments_page: EmbedPage,
+) -> Optional[dict]:
+    """タスク詳細を辞書で返す（存在しない場合はNone）"""
+    row = (await db.execute(
+        with_counts(select(*task_columns(fields))).where(Task.id == task_id)
+    )).first()
+    if row is None:
+        return None
+    detail = dict(row._mapping)
+
+    if "subtasks" in include:
+        subtasks = (await db.execute(
+            select(*SUBTASK_COLUMNS)
+            .where(SubTask.task_id == task_id)
+            .order_by(SubTask.order_index, SubTask.id)
+            .offset(subtasks_page.offset)
+            .limit(subtasks_page.limit)
+        )).mappings().all()
+        detail["subtasks"] = [dict(subtask) for subtask in subtasks]
+        detail["subtasks_page"] = subtasks_page.meta(len(subtasks), detail["subtask_count"])
+
+    if "comments" in include:
+        # 新しい順（詳細画面は最新のコメントから表示する）
+        comments = (await db.execute(
+            select(*COMMENT_COLUMNS)
+            .where(TaskComment.task_id == task_id)
+            .order_by(TaskComment.created_at.desc(), TaskComment.id.desc())
+            .offset(comments_page.offset)
+            .limit(comments_page.limit)
+        )).mappings().all()
+        detail["comments"] = [dict(comment) for comment in comments]
+        detail["comments_page"] = comments_page.meta(len(comments), detail["comment_count"])
+    return detail
@@ -0,0 +1,94 @@
+from sqlalchemy import func, select, Select
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from app.models.task import Task
+from app.schemas.task import Task as TaskSchema, TaskWithCounts
+
+# fields= で指定できる列（レスポンスのTaskと同じ項目、id は常に含める）
+TASK_FIELDS = tuple(TaskSchema.model_fields)
+# 一覧で指定できる集計値
+COUNT_FIELDS = ("subtask_count", "completed_subtasks", "comment_count")
+LIST_FIELDS = TASK_FIELDS + COUNT_FIELDS
+
+
+class FieldsError(ValueError):
+    """不正な fields / include 指定"""
+
+
+def parse_names(value: Optional[str], allowed: Iterable[str], label: str) -> Optional[List[str]]:
+    """カンマ区切りの名前を検証して重複を除いたリストにする（未指定はNone）"""
+    if value is None:
+        return None
+    names = list(dict.fromkeys(name.strip() for name in value.split(",") if name.strip()))
+    unknown = [name for name in names if name not in allowed]
+    if unknown:
+        raise FieldsError(f"Unknown {label}: {', '.join(unknown)}")
+    return names
+
+
+def parse_fields(value: Optional[str], allowed: Sequence[str] = TASK_FIELDS) -> Sequence[str]:
+    """fields= を列名リストに変換（未指定は allowed の全項目）"""
+    names = parse_names(value, allowed, "fields")
+    if names is None:
+        return allowed
+    return ["id", *(name for name in names if name != "id")]
+
+
+def task_columns(fields: Sequence[str]) -> list:
+    """列名に対応するTaskの列（SQLで取得する列を絞る）"""
+    return [getattr(Task, name) for name in fields]
+
+
+def _count_columns(names: Sequence[str] = COUNT_FIELDS):
+    """タスク1件あたりの集計値（書き込み時に維持している tasks の列）"""
+    return [getattr(Task, name) for name in names]
+
+
+def count_of(statement: Select) -> Select:
+    """selectの結果件数を数えるselect"""
+    return select(func.count()).select_from(statement.order_by(None).subquery())
+
+
+def with_counts(statement: Select, names: Sequence[str] = COUNT_FIELDS) -> Select:
+    """Task（または列を絞ったTask）のselectに集計列を追加（1ステートメントで取得）"""
+    return statement.add_columns(*_count_columns(names))
+
+
+def rows_to_tasks_with_counts(rows) -> List[TaskWithCounts]:
+    """with_counts()の結果行をTaskWithCountsに変換"""
+    return [
+        TaskWithCounts.model_validate(task).model_copy(update={
+            "subtask_count": subtask_count,
+            "completed_subtasks": completed_subtasks,
+            "comment_count": comment_count,
+        })
+        for task, subtask_count, completed_subtasks, comment_count in rows
+    ]
+
+
+def _field_positions(rows, fields: Sequence[str]) -> List[tuple]:
+    """fields の各項目が結果行の何列目か"""
+    if not rows:
+        return []
+    keys = rows[0]._fields
+    return [(name, keys.index(name)) for name in fields]
+
+
+def rows_to_records(rows, fields: Sequence[str]) -> List[dict]:
+    """列を絞ったselectの結果行を fields の項目のdictに変換"""
+    positions = _field_positions(rows, fields)
+    return [{name: row[index] for name, index in positions} for row in rows]
+
+
+def rows_to_columns(rows, fields: Sequence[str]) -> Dict[str, list]:
+    """列を絞ったselectの結果行を項目ごとの配列に変換（compact形式）"""
+    if not rows:
+        return {name: [] for name in fields}
+    return {name: [row[index] for row in rows] for name, index in _field_positions(rows, fields)}
+
+
+def render_rows(rows, fields: Sequence[str], layout: str = "rows"):
+    """一覧の結果行をレスポンス形式に変換（rows: 1行1dict / columns: 項目ごとの配列）"""
+    if layout == "columns":
+        return rows_to_columns(rows, fields)
+    return rows_to_records(rows, fields)
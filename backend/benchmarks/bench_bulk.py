@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+一括操作APIとループ呼び出しのスループット比較ベンチマーク
+
+N件のタスクを単体API（1件1トランザクション）と一括API（1リクエスト1トランザクション）で
+作成・更新・削除し、所要時間・items/sec・SQLステートメント数を比較する。
+
+実行: python -m benchmarks.bench_bulk --items 500
+"""
+import argparse
+import time
+
+from benchmarks.common import QueryCounter, reset_database
+
+from fastapi.testclient import TestClient
+from main import app
+
+
+def task_payload(i: int) -> dict:
+    return {"title": f"一括ベンチ {i}", "category": "work", "priority": "medium", "urgency": "low"}
+
+
+def run(label: str, fn):
+    with QueryCounter() as counter:
+        start = time.perf_counter()
+        count = fn()
+        elapsed = time.perf_counter() - start
+    print(f"{label:<14} {elapsed * 1000:>10.1f} {count / elapsed:>12.1f} {counter.count:>9}")
+
+
+def run_benchmark(items: int):
+    reset_database()
+    with TestClient(app) as client:
+        base = "/api/v1/tasks"
+        print(f"{'operation':<14} {'time(ms)':>10} {'items/sec':>12} {'queries':>9}")
+
+        looped_ids = []
+        def loop_create():
+            for i in range(items):
+                looped_ids.append(client.post(f"{base}/", json=task_payload(i)).json()["id"])
+            return items
+        run("create/loop", loop_create)
+
+        bulk_ids = []
+        def bulk_create():
+            response = client.post(f"{base}/bulk", json={"tasks": [task_payload(i) for i in range(items)]})
+            bulk_ids.extend(task["id"] for task in response.json()["succeeded"])
+            return len(bulk_ids)
+        run("create/bulk", bulk_create)
+
+        def loop_update():
+            for task_id in looped_ids:
+                client.put(f"{base}/{task_id}", json={"status": "completed"})
+            return len(looped_ids)
+        run("update/loop", loop_update)
+
+        def bulk_update():
+            items_payload = [{"id": task_id, "status": "completed"} for task_id in bulk_ids]
+            return len(client.put(f"{base}/bulk", json={"items": items_payload}).json()["succeeded"])
+        run("update/bulk", bulk_update)
+
+        def loop_delete():
+            for task_id in looped_ids:
+                client.delete(f"{base}/{task_id}")
+            return len(looped_ids)
+        run("delete/loop", loop_delete)
+
+        def bulk_delete():
+            response = client.request("DELETE", f"{base}/bulk", json={"ids": bulk_ids})
+            return len(response.json()["succeeded"])
+        run("delete/bulk", bulk_delete)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=500)
+    args = parser.parse_args()
+    run_benchmark(min(args.items, 1000))
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+変更フィード（SSE）の購読者あたりのメモリと配信レイテンシ
+
+ASGIアプリをプロセス内で直接呼び出し、待機中の購読者を指定数だけ接続して
+tracemalloc のメモリ増分から1接続あたりのコストを求める。
+その後タスクを1件作成し、全購読者にイベントが届くまでの時間を計測する。
+（ソケット・HTTPサーバー側のバッファは含まない）
+
+実行: python -m benchmarks.bench_change_feed --subscribers 1000 5000
+"""
+import argparse
+import asyncio
+import gc
+import json
+import time
+import tracemalloc
+
+from benchmarks.common import reset_database
+
+from main import app
+from app.database.connection import async_engine
+from app.services.change_feed import change_feed
+
+STREAM_PATH = "/api/v1/changes/stream"
+
+
+def _scope(method: str, path: str) -> dict:
+    return {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": method, "scheme": "http", "path": path, "raw_path": path.encode(),
+        "query_string": b"", "root_path": "",
+        "headers": [(b"host", b"bench"), (b"accept", b"text/event-stream"), (b"content-type", b"application/json")],
+        "client": ("127.0.0.1", 0), "server": ("bench", 80),
+    }
+
+
+class Subscriber:
+    """待機中のSSE接続（切断されるまで receive がブロックする）"""
+
+    def __init__(self, delivered: asyncio.Queue):
+        self.disconnected = asyncio.Event()
+        self.delivered = delivered
+        self.task = asyncio.create_task(app(_scope("GET", STREAM_PATH), self.receive, self.send))
+
+    async def receive(self):
+        await self.disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(self, message):
+        if message["type"] == "http.response.body" and b"event: change" in message.get("body", b""):
+            self.delivered.put_nowait(time.perf_counter())
+
+
+async def request(method: str, path: str, body: dict) -> int:
+    messages = []
+    payload = json.dumps(body).encode()
+    sent = False
+
+    async def receive():
+        nonlocal sent
+        if not sent:
+            sent = True
+            return {"type": "http.request", "body": payload, "more_body": False}
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        messages.append(message)
+
+    await app(_scope(method, path), receive, send)
+    return messages[0]["status"]
+
+
+async def wait_for_subscribers(count: int, timeout: float = 60.0):
+    deadline = time.perf_counter() + timeout
+    while change_feed.hub.subscriber_count < count:
+        if time.perf_counter() > deadline:
+            raise TimeoutError(f"only {change_feed.hub.subscriber_count}/{count} subscribers connected")
+        await asyncio.sleep(0.01)
+
+
+async def measure(count: int) -> dict:
+    delivered: asyncio.Queue = asyncio.Queue()
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    subscribers = [Subscriber(delivered) for _ in range(count)]
+    await wait_for_subscribers(count)
+    # 初回の retry 行の送信まで進める
+    await asyncio.sleep(0.1)
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    await create_task()
+    last = start
+    for _ in range(count):
+        last = await asyncio.wait_for(delivered.get(), 30)
+    fan_out = last - start
+
+    for subscriber in subscribers:
+        subscriber.disconnected.set()
+    await asyncio.gather(*(subscriber.task for subscriber in subscribers), return_exceptions=True)
+    return {
+        "subscribers": count,
+        "bytes_per_subscriber": (after - before) / count,
+        "fan_out_ms": fan_out * 1000,
+    }
+
+
+async def create_task() -> None:
+    status = await request("POST", "/api/v1/tasks/", {
+        "title": "change feed", "category": "work", "priority": "high", "urgency": "high",
+    })
+    assert status == 200, status
+
+
+async def run_benchmark(counts):
+    reset_database()
+    # 初回リクエストの初期化コストを計測から除く
+    await create_task()
+    print(f"{'subscribers':>11} {'KB/conn':>8} {'fan-out ms':>10}")
+    for count in counts:
+        result = await measure(count)
+        print(f"{result['subscribers']:>11} {result['bytes_per_subscriber'] / 1024:>8.1f} {result['fan_out_ms']:>10.1f}")
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--subscribers", type=int, nargs="+", default=[1000, 5000])
+    args = parser.parse_args()
+    asyncio.run(run_benchmark(args.subscribers))
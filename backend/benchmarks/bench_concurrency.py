@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+同時リクエスト時のスループット比較ベンチマーク
+
+同期Session（イベントループをブロックする従来方式）と非同期Session（現在のルーター）で
+タスク一覧APIを並列に呼び出し、requests/sec を比較する。
+
+SQLiteでは通信遅延がないため、--latency-ms で1ステートメントごとの遅延を
+ドライバの実行スレッド上で再現する。PostgreSQLで計測する場合は DATABASE_URL を指定し
+--latency-ms 0 で実行する。
+
+同期方式ではセッションの返却がレスポンス送信後になるため、同時実行数が
+コネクションプール上限（既定15）を超えるとイベントループがプール待ちで停止する。
+比較のため既定の同時実行数はプール上限未満にしている。
+
+実行: python -m benchmarks.bench_concurrency --concurrency 10 --requests 200
+"""
+import argparse
+import asyncio
+import sqlite3
+import time
+
+from benchmarks.common import reset_database, seed_tasks
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from app.database.connection import engine, async_engine, get_db
+from app.models.task import Task
+from app.services.task_query import with_counts, rows_to_tasks_with_counts
+from main import app
+
+
+def legacy_app() -> FastAPI:
+    """同期Sessionを async def 内で使う従来方式のアプリ"""
+    legacy = FastAPI()
+
+    @legacy.get("/api/v1/tasks/")
+    async def get_tasks(limit: int = 20, db: Session = Depends(get_db)):
+        statement = with_counts(select(Task)).order_by(Task.created_at.desc()).limit(limit)
+        rows = db.execute(statement).all()
+        return {"tasks": [task.model_dump() for task in rows_to_tasks_with_counts(rows)]}
+
+    return legacy
+
+
+def simulate_latency(latency: float):
+    """SQLiteの各ステートメント実行時に遅延を入れる（実行スレッドをブロックする）"""
+    def on_connect(dbapi_connection, connection_record):
+        raw = dbapi_connection
+        if not isinstance(raw, sqlite3.Connection):
+            # aiosqlite: AsyncAdapt_aiosqlite_connection -> aiosqlite.Connection -> sqlite3.Connection
+            raw = dbapi_connection._connection._conn
+        raw.set_trace_callback(lambda statement: time.sleep(latency))
+
+    for target in (engine, async_engine.sync_engine):
+        if target.dialect.name == "sqlite":
+            event.listen(target, "connect", on_connect)
+
+
+async def measure(target: FastAPI, concurrency: int, total: int) -> float:
+    """並列にリクエストを送り requests/sec を返す"""
+    semaphore = asyncio.Semaphore(concurrency)
+    transport = httpx.ASGITransport(app=target)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def call():
+            async with semaphore:
+                response = await client.get("/api/v1/tasks/", params={"limit": 20})
+                assert response.status_code == 200, response.text
+
+        await call()  # ウォームアップ
+        start = time.perf_counter()
+        await asyncio.gather(*(call() for _ in range(total)))
+        return total / (time.perf_counter() - start)
+
+
+async def run_benchmark(concurrency: int, total: int):
+    legacy_rps = await measure(legacy_app(), concurrency, total)
+    async_rps = await measure(app, concurrency, total)
+    await async_engine.dispose()
+    print(f"{'mode':>10} {'req/s':>9}")
+    print(f"{'sync':>10} {legacy_rps:>9.1f}")
+    print(f"{'async':>10} {async_rps:>9.1f}")
+    print(f"speedup: {async_rps / legacy_rps:.2f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--tasks", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    reset_database()
+    seed_tasks(args.tasks)
+    if args.latency_ms > 0:
+        simulate_latency(args.latency_ms / 1000)
+    asyncio.run(run_benchmark(args.concurrency, args.requests))
+
+
+if __name__ == "__main__":
+    main()
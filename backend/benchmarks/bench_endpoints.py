@@ -0,0 +1,284 @@
+#!/usr/bin/env python3
+"""
+APIエンドポイントのベンチマーク
+
+benchmarks.dataset の合成データ（--tasks 件）を投入し、FastAPIアプリをASGIトランスポート経由で
+プロセス内から呼び出して、エンドポイントごとに次を計測する。
+- レイテンシ（平均・p50/p90/p95/p99・最大）とスループット
+- リクエストあたりのSQL数・DB時間・取得行数（Server-Timing ヘッダの db 値）
+- リクエスト処理中のPythonヒープの増分ピーク（tracemalloc、レイテンシ計測とは別に実行）
+
+レスポンスキャッシュは既定で無効（--cache で有効）、圧縮も既定で無効（--accept-encoding で指定）。
+DATABASE_URL を指定するとローカルのPostgreSQLなどで計測できる（未指定時は一時ディレクトリのSQLite）。
+
+--output で結果をJSONに保存し、--compare で保存済みの結果と比較する。
+p95 が --tolerance を超えて悪化したか、SQL数が増えたエンドポイントがあれば終了コード1。
+
+実行（--reuse は DATABASE_URL を指定して同じデータベースを使う場合）:
+    python -m benchmarks.bench_endpoints --tasks 100000 --output baseline.json
+    python -m benchmarks.bench_endpoints --tasks 100000 --reuse --compare baseline.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import re
+import subprocess
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional
+
+# アプリのimport前に設定する（キャッシュ無効・Server-Timing有効）
+_CACHE_ENABLED = "--cache" in sys.argv
+os.environ["RESPONSE_CACHE_BACKEND"] = os.environ.get("RESPONSE_CACHE_BACKEND", "memory") if _CACHE_ENABLED else "none"
+os.environ["SERVER_TIMING"] = "true"
+
+from benchmarks.common import reset_database  # noqa: F401  (DATABASE_URL の既定値を設定)
+from benchmarks.dataset import NOUNS, prepare_database, sample_task_ids
+
+import httpx
+import sqlalchemy
+
+from app.database.connection import async_engine
+from main import app
+
+API = "/api/v1"
+SERVER_TIMING_DB = re.compile(r'db;dur=([\d.]+);desc="(\d+) queries, (\d+) rows"')
+PERCENTILES = (50, 90, 95, 99)
+
+
+@dataclass
+class Scenario:
+    name: str
+    # リクエスト番号 -> (パス, クエリ)
+    request: Callable[[int], tuple]
+
+
+def build_scenarios(task_count: int, task_ids: List[str], cursor: Optional[str]) -> List[Scenario]:
+    def by_id(suffix: str = "", **params):
+        return lambda i: (f"{API}/tasks/{task_ids[i % len(task_ids)]}{suffix}", params)
+
+    middle_page = max(1, task_count // 20 // 2)
+    scenarios = [
+        Scenario("list", lambda i: (f"{API}/tasks/", {})),
+        Scenario("list_no_total", lambda i: (f"{API}/tasks/", {"include_total": "false"})),
+        Scenario("list_filtered", lambda i: (f"{API}/tasks/", {
+            "category": "work", "status": "in_progress", "sort_by": "due_date", "sort_order": "asc",
+        })),
+        Scenario("list_deep_offset", lambda i: (f"{API}/tasks/", {"page": middle_page, "include_total": "false"})),
+        Scenario("list_columns", lambda i: (f"{API}/tasks/", {
+            "limit": 100, "fields": "id,title,status,due_date", "layout": "columns", "include_total": "false",
+        })),
+        Scenario("search", lambda i: (f"{API}/tasks/search", {"q": NOUNS[i % len(NOUNS)]})),
+        Scenario("detail", by_id()),
+        Scenario("detail_lean", by_id(fields="id,title,status", include="")),
+        Scenario("subtasks", by_id("/subtasks")),
+        Scenario("comments", by_id("/comments")),
+        Scenario("matrix", lambda i: (f"{API}/tasks/matrix", {"limit_per_cell": 20})),
+        Scenario("matrix_summary", lambda i: (f"{API}/tasks/matrix/summary", {})),
+        Scenario("calendar", lambda i: (f"{API}/tasks/calendar", {"year": 2025, "month": i % 12 + 1})),
+    ]
+    if cursor:
+        scenarios.insert(4, Scenario("list_cursor", lambda i: (f"{API}/tasks/", {
+            "paging": "cursor", "cursor": cursor, "include_total": "false",
+        })))
+    return scenarios
+
+
+def percentile(values: List[float], q: float) -> float:
+    """線形補間のパーセンタイル（values は昇順）"""
+    if not values:
+        return 0.0
+    position = (len(values) - 1) * q / 100
+    lower = int(position)
+    upper = min(lower + 1, len(values) - 1)
+    return values[lower] + (values[upper] - values[lower]) * (position - lower)
+
+
+def summarize(values: List[float], digits: int = 3) -> Dict[str, float]:
+    ordered = sorted(values)
+    result = {"mean": round(sum(ordered) / len(ordered), digits) if ordered else 0.0}
+    result.update({f"p{q}": round(percentile(ordered, q), digits) for q in PERCENTILES})
+    result["max"] = round(ordered[-1], digits) if ordered else 0.0
+    return result
+
+
+async def run_scenario(client: httpx.AsyncClient, scenario: Scenario, requests: int, warmup: int,
+                       concurrency: int, memory_samples: int) -> dict:
+    latencies, queries, db_ms, rows, sizes = [], [], [], [], []
+    errors = 0
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def call(i: int, record: bool):
+        nonlocal errors
+        path, params = scenario.request(i)
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.get(path, params=params)
+            elapsed = time.perf_counter() - start
+        if not record:
+            return
+        if response.status_code != 200:
+            errors += 1
+            return
+        latencies.append(elapsed * 1000)
+        sizes.append(len(response.content))
+        match = SERVER_TIMING_DB.search(response.headers.get("server-timing", ""))
+        if match:
+            db_ms.append(float(match.group(1)))
+            queries.append(int(match.group(2)))
+            rows.append(int(match.group(3)))
+
+    for i in range(warmup):
+        await call(i, False)
+    started = time.perf_counter()
+    await asyncio.gather(*(call(i, True) for i in range(requests)))
+    wall = time.perf_counter() - started
+
+    # ヒープ計測は逐次に実行（tracemalloc による遅延をレイテンシに含めない）
+    peaks = []
+    tracemalloc.start()
+    try:
+        for i in range(memory_samples):
+            path, params = scenario.request(i)
+            tracemalloc.reset_peak()
+            base = tracemalloc.get_traced_memory()[0]
+            await client.get(path, params=params)
+            peaks.append((tracemalloc.get_traced_memory()[1] - base) / 1024)
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "requests": requests,
+        "errors": errors,
+        "throughput_rps": round(len(latencies) / wall, 1) if wall else 0.0,
+        "latency_ms": summarize(latencies),
+        "queries": summarize(queries, 2),
+        "db_ms": summarize(db_ms),
+        "rows": summarize(rows, 1),
+        "response_bytes": summarize(sizes, 0),
+        "peak_alloc_kb": summarize(peaks, 1),
+    }
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _max_rss_mb() -> Optional[float]:
+    try:
+        import resource
+    except ImportError:
+        # Windows
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux はKB、macOS はバイト
+    return round(rss / 1024 / (1024 if sys.platform == "darwin" else 1), 1)
+
+
+async def run_benchmark(args) -> dict:
+    task_ids = sample_task_ids(args.tasks, 100, args.seed)
+    transport = httpx.ASGITransport(app=app)
+    headers = {"Accept-Encoding": args.accept_encoding}
+    results = {}
+    async with app.router.lifespan_context(app):
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", headers=headers) as client:
+            first = await client.get(f"{API}/tasks/", params={"paging": "cursor", "include_total": "false"})
+            first.raise_for_status()
+            cursor = first.json().get("pagination", {}).get("next_cursor")
+            scenarios = build_scenarios(args.tasks, task_ids, cursor)
+            if args.scenarios:
+                scenarios = [scenario for scenario in scenarios if scenario.name in args.scenarios]
+            print(f"{'endpoint':>17} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'req/s':>7} "
+                  f"{'queries':>7} {'heap KB':>8} {'errors':>6}")
+            for scenario in scenarios:
+                result = await run_scenario(
+                    client, scenario, args.requests, args.warmup, args.concurrency, args.memory_samples
+                )
+                results[scenario.name] = result
+                latency = result["latency_ms"]
+                print(f"{scenario.name:>17} {latency['p50']:>8.2f} {latency['p95']:>8.2f} {latency['p99']:>8.2f} "
+                      f"{result['throughput_rps']:>7.0f} {result['queries']['mean']:>7.1f} "
+                      f"{result['peak_alloc_kb']['p50']:>8.0f} {result['errors']:>6}")
+    await async_engine.dispose()
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "commit": _git_commit(),
+            "python": platform.python_version(),
+            "sqlalchemy": sqlalchemy.__version__,
+            "database": async_engine.dialect.name,
+            "tasks": args.tasks,
+            "seed": args.seed,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "cache": _CACHE_ENABLED,
+            "accept_encoding": args.accept_encoding,
+        },
+        "process": {"max_rss_mb": _max_rss_mb()},
+        "scenarios": results,
+    }
+
+
+def compare(current: dict, baseline: dict, tolerance: float) -> bool:
+    """基準の結果と比較して表示し、悪化したエンドポイントがあれば True"""
+    regressed = False
+    print(f"\n比較対象: {baseline['meta'].get('commit')} ({baseline['meta'].get('timestamp')})")
+    print(f"{'endpoint':>17} {'p50 ms':>17} {'p95 ms':>17} {'queries':>11}")
+    for name, result in current["scenarios"].items():
+        base = baseline["scenarios"].get(name)
+        if base is None:
+            continue
+        p50, p95 = result["latency_ms"]["p50"], result["latency_ms"]["p95"]
+        base_p50, base_p95 = base["latency_ms"]["p50"], base["latency_ms"]["p95"]
+        queries, base_queries = result["queries"]["mean"], base["queries"]["mean"]
+        slower = base_p95 > 0 and p95 > base_p95 * (1 + tolerance)
+        more_queries = queries > base_queries + 0.5
+        flag = "  ✗" if slower or more_queries else ""
+        regressed = regressed or slower or more_queries
+        print(f"{name:>17} {base_p50:>7.2f} → {p50:>7.2f} {base_p95:>7.2f} → {p95:>7.2f} "
+              f"{base_queries:>4.1f} → {queries:>4.1f}{flag}")
+    return regressed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--reuse", action="store_true", help="投入済みのデータセットを使う（不足分のみ追加）")
+    parser.add_argument("--requests", type=int, default=200, help="エンドポイントごとの計測リクエスト数")
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--memory-samples", type=int, default=20)
+    parser.add_argument("--scenarios", nargs="+", help="計測するエンドポイント名（省略時は全件）")
+    parser.add_argument("--accept-encoding", default="identity")
+    parser.add_argument("--cache", action="store_true", help="レスポンスキャッシュを有効にする")
+    parser.add_argument("--output", help="結果のJSONファイル")
+    parser.add_argument("--compare", help="比較する結果のJSONファイル")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="p95 の悪化を許容する割合")
+    args = parser.parse_args()
+
+    prepare_database(args.tasks, args.seed, reuse=args.reuse)
+    results = asyncio.run(run_benchmark(args))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, ensure_ascii=False, indent=2)
+        print(f"\n✓ 結果を保存しました: {args.output}")
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+エクスポートのスループットとメモリ使用量ベンチマーク
+
+件数を増やしてもピークメモリ（tracemalloc）がほぼ一定であることを確認する。
+
+実行: python -m benchmarks.bench_export --sizes 1000 5000 20000
+"""
+import argparse
+import asyncio
+import time
+import tracemalloc
+
+from benchmarks.common import reset_database, seed_tasks
+
+from app.database.connection import AsyncSessionLocal, async_engine
+from app.services.export import stream_export
+
+
+async def measure(export_format: str):
+    total_bytes = 0
+    tracemalloc.start()
+    start = time.perf_counter()
+    async for chunk in stream_export(AsyncSessionLocal, export_format):
+        total_bytes += len(chunk.encode("utf-8"))
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, total_bytes, peak
+
+
+async def run_benchmark(sizes, export_format: str):
+    print(f"{'tasks':>8} {'time(s)':>8} {'tasks/sec':>10} {'MB out':>8} {'peak MB':>8}")
+    for size in sizes:
+        await async_engine.dispose()
+        reset_database()
+        seed_tasks(size)
+        elapsed, total_bytes, peak = await measure(export_format)
+        print(f"{size:>8} {elapsed:>8.2f} {size / elapsed:>10.0f} "
+              f"{total_bytes / 1e6:>8.1f} {peak / 1e6:>8.1f}")
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 5000, 20000])
+    parser.add_argument("--format", choices=["ndjson", "csv"], default="ndjson")
+    args = parser.parse_args()
+    asyncio.run(run_benchmark(args.sizes, args.format))
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+インポートのスループットベンチマーク
+
+合成データのNDJSONファイル（既定100万タスク、各タスクにサブタスク・コメント付き）を生成し、
+import_tasks.py と同じ経路でバッチサイズごとの rows/sec を計測する。
+
+実行: python -m benchmarks.bench_import --rows 1000000 --batch-sizes 1000 5000
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+from datetime import datetime, timedelta, timezone
+
+from benchmarks.common import reset_database
+
+from import_tasks import import_tasks
+from app.models.task import TaskCategory, TaskPriority, TaskUrgency, TaskStatus
+
+
+def write_synthetic_file(path: str, rows: int, subtasks_per_task: int, comments_per_task: int, seed: int = 0):
+    """合成データのNDJSONを書き出す（id省略、インポート時に採番）"""
+    rng = random.Random(seed)
+    base = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    with open(path, "w", encoding="utf-8") as f:
+        for i in range(rows):
+            created = base + timedelta(minutes=i)
+            f.write(json.dumps({
+                "title": f"Task {i}",
+                "description": "benchmark",
+                "category": rng.choice(list(TaskCategory)).value,
+                "priority": rng.choice(list(TaskPriority)).value,
+                "urgency": rng.choice(list(TaskUrgency)).value,
+                "status": rng.choice(list(TaskStatus)).value,
+                "due_date": (created + timedelta(days=rng.randint(0, 60))).isoformat(),
+                "created_at": created.isoformat(),
+                "subtasks": [
+                    {"title": f"Subtask {j}", "order_index": j, "completed": rng.random() < 0.5}
+                    for j in range(subtasks_per_task)
+                ],
+                "comments": [{"content": f"Comment {j}"} for j in range(comments_per_task)],
+            }, ensure_ascii=False))
+            f.write("\n")
+
+
+def run_benchmark(rows: int, batch_sizes, subtasks_per_task: int, comments_per_task: int):
+    fd, path = tempfile.mkstemp(suffix=".ndjson")
+    os.close(fd)
+    try:
+        write_synthetic_file(path, rows, subtasks_per_task, comments_per_task)
+        print(f"input: {rows} tasks, {os.path.getsize(path) / 1e6:.1f} MB")
+        print(f"{'batch':>8} {'time(s)':>8} {'tasks/sec':>10} {'rows/sec':>10}")
+        for batch_size in batch_sizes:
+            reset_database()
+            stats = import_tasks(path, "ndjson", batch_size)
+            print(f"{batch_size:>8} {stats.elapsed:>8.2f} "
+                  f"{stats.imported_tasks / stats.elapsed:>10.0f} {stats.rows_per_sec:>10.0f}")
+    finally:
+        os.remove(path)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1000, 5000])
+    parser.add_argument("--subtasks", type=int, default=3)
+    parser.add_argument("--comments", type=int, default=2)
+    args = parser.parse_args()
+    run_benchmark(args.rows, args.batch_sizes, args.subtasks, args.comments)
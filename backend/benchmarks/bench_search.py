@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+全文検索のレイテンシベンチマーク
+
+語彙からランダムに組み立てたタイトル・説明・コメントを持つタスク（既定100万件）を投入し、
+従来の title LIKE '%語%' の走査、全列LIKE走査、全文検索インデックス（ranked_search）の
+1ページ（20件）取得レイテンシを比較する。
+
+実行: python -m benchmarks.bench_search --rows 1000000 --repeat 5
+"""
+import argparse
+import random
+import statistics
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from benchmarks.common import reset_database
+
+from sqlalchemy import and_, insert, select
+
+from app.database.connection import SessionLocal, engine
+from app.models.task import Task, TaskCategory, TaskPriority, TaskUrgency, TaskStatus
+from app.models.comment import TaskComment
+from app.services.search import _like_filter, ranked_search
+
+VOCABULARY = [
+    "レポート", "会議", "資料", "見積", "請求書", "設計", "レビュー", "デプロイ", "障害", "調査",
+    "買い物", "掃除", "予約", "旅行", "勉強", "試験", "読書", "運動", "引っ越し", "確定申告",
+    "release", "backend", "frontend", "database", "migration", "invoice", "meeting", "deploy",
+]
+# 頻出語（約7%のタスクに出現）と、1件程度しか一致しない語（タイトル末尾の連番）
+QUERIES = ["確定申告", "migration", "障害 調査", "デプロイ", "54321", "レビュー 77777"]
+PAGE_SIZE = 20
+
+
+def seed(rows: int, batch_size: int = 10000, seed: int = 0):
+    """語彙を組み合わせたタスクとコメント（1件ずつ）を一括投入"""
+    rng = random.Random(seed)
+    base = datetime(2024, 1, 1)
+    db = SessionLocal()
+    try:
+        for start in range(0, rows, batch_size):
+            tasks, comments = [], []
+            for i in range(start, min(start + batch_size, rows)):
+                task_id = str(uuid.uuid4())
+                created = base + timedelta(seconds=i)
+                tasks.append({
+                    "id": task_id,
+                    "title": " ".join(rng.sample(VOCABULARY, 2)) + f" {i}",
+                    "description": "".join(rng.sample(VOCABULARY, 4)),
+                    "notes": None,
+                    "category": rng.choice(list(TaskCategory)),
+                    "priority": rng.choice(list(TaskPriority)),
+                    "urgency": rng.choice(list(TaskUrgency)),
+                    "status": rng.choice(list(TaskStatus)),
+                    "created_at": created,
+                    "updated_at": created,
+                })
+                comments.append({
+                    "id": str(uuid.uuid4()), "task_id": task_id,
+                    "content": "、".join(rng.sample(VOCABULARY, 3)), "created_at": created,
+                })
+            db.execute(insert(Task.__table__), tasks)
+            db.execute(insert(TaskComment.__table__), comments)
+            db.commit()
+    finally:
+        db.close()
+
+
+def title_like(query: str):
+    """変更前の実装（タイトルのみ LIKE '%語%'）"""
+    return (
+        select(Task).where(and_(*(Task.title.contains(term) for term in query.split())))
+        .order_by(Task.created_at.desc())
+    )
+
+
+def all_columns_like(query: str):
+    """全列LIKE走査（インデックスなし）"""
+    return select(Task).where(*_like_filter(query.split())).order_by(Task.created_at.desc())
+
+
+def measure(build, query: str, repeat: int):
+    timings = []
+    with engine.connect() as conn:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            rows = conn.execute(build(query).limit(PAGE_SIZE)).all()
+            timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings), len(rows)
+
+
+def run_benchmark(rows: int, repeat: int):
+    reset_database()
+    start = time.perf_counter()
+    seed(rows)
+    print(f"seeded {rows} tasks in {time.perf_counter() - start:.1f}s")
+    dialect = engine.dialect.name
+    strategies = [
+        ("title LIKE", title_like),
+        ("all LIKE", all_columns_like),
+        ("full-text", lambda q: ranked_search(dialect, q)),
+    ]
+    print(f"{'query':<14} " + " ".join(f"{name + ' ms':>14}" for name, _ in strategies))
+    for query in QUERIES:
+        cells = []
+        for _, build in strategies:
+            median, found = measure(build, query, repeat)
+            cells.append(f"{median:>9.1f} ({found:>2})")
+        print(f"{query:<14} " + " ".join(cells))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    run_benchmark(args.rows, args.repeat)
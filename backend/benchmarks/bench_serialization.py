@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+タスク一覧1ページ（100件）のシリアライズ負荷ベンチマーク
+
+データベースから取得済みの行をJSONのバイト列にするまでの時間を比較する。
+- legacy: from_orm().dict() + jsonable_encoder + json.dumps（従来の経路）
+- pydantic: model_validate + TypeAdapter.dump_json（pydantic-coreで直接JSON化）
+- rows+orjson: 列を絞った結果行をdict化してorjsonでエンコード（現在の一覧API）
+- columns+orjson: 同上の layout=columns
+実行: python -m benchmarks.bench_serialization [--iterations N]
+"""
+import argparse
+import json
+import timeit
+import warnings
+from typing import List
+
+from benchmarks.common import SessionLocal, reset_database, seed_tasks
+
+from fastapi.encoders import jsonable_encoder
+from pydantic import TypeAdapter
+from sqlalchemy import select
+
+from app.models.task import Task
+from app.schemas.task import TaskWithCounts
+from app.services.response_cache import encode_json
+from app.services.task_query import (
+    LIST_FIELDS, TASK_FIELDS, render_rows, rows_to_tasks_with_counts, task_columns, with_counts
+)
+
+PAGE_SIZE = 100
+
+
+def legacy(rows) -> bytes:
+    tasks = []
+    for task, subtask_count, completed_subtasks, comment_count in rows:
+        item = TaskWithCounts.from_orm(task).dict()
+        item.update(
+            subtask_count=subtask_count, completed_subtasks=completed_subtasks, comment_count=comment_count
+        )
+        tasks.append(item)
+    return json.dumps(jsonable_encoder({"tasks": tasks}), ensure_ascii=False).encode("utf-8")
+
+
+_task_list = TypeAdapter(List[TaskWithCounts])
+
+
+def pydantic_v2(rows) -> bytes:
+    return _task_list.dump_json(rows_to_tasks_with_counts(rows))
+
+
+def rows_orjson(rows) -> bytes:
+    return encode_json({"tasks": render_rows(rows, LIST_FIELDS)})
+
+
+def columns_orjson(rows) -> bytes:
+    return encode_json({"tasks": render_rows(rows, LIST_FIELDS, "columns")})
+
+
+def run_benchmark(iterations: int):
+    reset_database()
+    seed_tasks(PAGE_SIZE)
+    db = SessionLocal()
+    try:
+        entity_rows = db.execute(with_counts(select(Task)).limit(PAGE_SIZE)).all()
+        column_rows = db.execute(with_counts(select(*task_columns(TASK_FIELDS))).limit(PAGE_SIZE)).all()
+    finally:
+        db.close()
+
+    cases = [
+        ("legacy", legacy, entity_rows),
+        ("pydantic", pydantic_v2, entity_rows),
+        ("rows+orjson", rows_orjson, column_rows),
+        ("columns+orjson", columns_orjson, column_rows),
+    ]
+    print(f"{PAGE_SIZE} tasks/page, {iterations} iterations")
+    print(f"{'path':>14} {'us/page':>9} {'bytes':>8}")
+    baseline = None
+    with warnings.catch_warnings():
+        # from_orm / dict は非推奨警告を出す
+        warnings.simplefilter("ignore")
+        for name, encode, rows in cases:
+            size = len(encode(rows))
+            seconds = timeit.timeit(lambda: encode(rows), number=iterations) / iterations
+            baseline = baseline or seconds
+            print(f"{name:>14} {seconds * 1e6:>9.0f} {size:>8}  x{baseline / seconds:.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+    run_benchmark(args.iterations)
@@ -0,0 +1,35 @@
+#!/usr/bin/env python3
+"""
+タスク一覧APIのクエリ数ベンチマーク
+
+ページサイズを増やしてもSQLステートメント数が一定であることを確認する。
+実行: python -m benchmarks.bench_task_list
+"""
+import time
+
+from benchmarks.common import QueryCounter, reset_database, seed_tasks
+
+from fastapi.testclient import TestClient
+from main import app
+
+PAGE_SIZES = [10, 20, 50, 100]
+
+
+def run_benchmark():
+    reset_database()
+    seed_tasks(max(PAGE_SIZES))
+
+    with TestClient(app) as client:
+        print(f"{'limit':>6} {'queries':>8} {'time(ms)':>9}")
+        for limit in PAGE_SIZES:
+            with QueryCounter() as counter:
+                start = time.perf_counter()
+                response = client.get("/api/v1/tasks/", params={"limit": limit})
+                elapsed = (time.perf_counter() - start) * 1000
+            assert response.status_code == 200, response.text
+            assert len(response.json()["tasks"]) == limit
+            print(f"{limit:>6} {counter.count:>8} {elapsed:>9.1f}")
+
+
+if __name__ == "__main__":
+    run_benchmark()
@@ -0,0 +1,81 @@
+"""
+ベンチマーク共通処理
+
+DATABASE_URL が未設定の場合は一時ディレクトリのSQLiteを使用する。
+appパッケージより先にimportすること。
+"""
+import os
+import random
+import tempfile
+from datetime import datetime, timedelta
+
+if "DATABASE_URL" not in os.environ:
+    _db_path = os.path.join(tempfile.mkdtemp(prefix="task_bench_"), "bench.db")
+    os.environ["DATABASE_URL"] = f"sqlite:///{_db_path}"
+
+from sqlalchemy import event
+
+from app.database.connection import engine, async_engine, SessionLocal, Base
+from app.models.task import Task, TaskCategory, TaskPriority, TaskUrgency, TaskStatus
+from app.models.subtask import SubTask
+from app.models.comment import TaskComment
+
+
+class QueryCounter:
+    """エンジンで実行されたSQLステートメント数を数える（APIは非同期エンジンを使用）"""
+
+    def __init__(self, binds=(engine, async_engine.sync_engine)):
+        self.binds = binds
+        self.count = 0
+
+    def _on_execute(self, conn, cursor, statement, parameters, context, executemany):
+        self.count += 1
+
+    def __enter__(self):
+        self.count = 0
+        for bind in self.binds:
+            event.listen(bind, "before_cursor_execute", self._on_execute)
+        return self
+
+    def __exit__(self, *exc):
+        for bind in self.binds:
+            event.remove(bind, "before_cursor_execute", self._on_execute)
+
+
+def reset_database():
+    """テーブルを作り直す"""
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+
+def seed_tasks(count: int, subtasks_per_task: int = 3, comments_per_task: int = 2, seed: int = 0):
+    """ベンチマーク用のタスクを一括投入"""
+    rng = random.Random(seed)
+    now = datetime.now()
+    db = SessionLocal()
+    try:
+        for i in range(count):
+            task = Task(
+                title=f"ベンチマークタスク {i}",
+                description="ベンチマーク用のタスク",
+                category=rng.choice(list(TaskCategory)),
+                priority=rng.choice(list(TaskPriority)),
+                urgency=rng.choice(list(TaskUrgency)),
+                status=rng.choice(list(TaskStatus)),
+                progress=rng.randint(0, 100),
+                due_date=now + timedelta(days=rng.randint(-30, 60)),
+            )
+            task.subtasks = [
+                SubTask(title=f"サブタスク {j}", completed=rng.random() < 0.5, order_index=j + 1)
+                for j in range(subtasks_per_task)
+            ]
+            task.comments = [
+                TaskComment(content=f"コメント {j}") for j in range(comments_per_task)
+            ]
+            task.subtask_count = subtasks_per_task
+            task.completed_subtasks = sum(1 for subtask in task.subtasks if subtask.completed)
+            task.comment_count = comments_per_task
+            db.add(task)
+        db.commit()
+    finally:
+        db.close()
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+"""
+決定的な合成データセットの生成
+
+タスク番号とシードだけから各タスク（サブタスク・コメントを含む）を生成するため、
+同じ --tasks / --seed なら件数や生成順・途中再開によらず同じ内容・同じidになる。
+レコードはエクスポート形式で、読み込みはインポートと同じ経路
+（PostgreSQLではCOPY、それ以外は executemany）で行う。
+
+分布
+- 作成日時: 2026-01-01までの3年間。新しい期間ほど件数が多い（件数は経過日数の平方根に比例）
+- サブタスク: 0件が約3割、多くは1〜10件、まれに数十件（平均約4件）
+- コメント: 0件が約4割、ごく一部のタスクに数十〜数百件が集中（平均約2件）
+- 期限: 8割に設定（作成から中央値2週間の対数正規分布）。古いタスクほど完了済みが多い
+- 分類・優先度・緊急度は偏りのある重み付き
+
+実行:
+    python -m benchmarks.dataset --tasks 100000                      # DATABASE_URL に投入
+    python -m benchmarks.dataset --tasks 100000 --output tasks.ndjson  # ファイルに出力
+"""
+import argparse
+import json
+import math
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Iterator, List
+
+from benchmarks.common import reset_database
+
+from sqlalchemy import func, select
+
+from app.database.connection import SessionLocal
+from app.models.task import Task, TaskCategory, TaskPriority, TaskUrgency, TaskStatus
+from app.services.importer import IMPORT_BATCH_SIZE, ImportStats, iter_batches, write_batch
+
+# 実行日によらず同じデータにするため固定
+DEFAULT_END = datetime(2026, 1, 1, tzinfo=timezone.utc)
+DEFAULT_DAYS = 3 * 365
+
+CATEGORY_WEIGHTS = {TaskCategory.WORK: 50, TaskCategory.PRIVATE: 25, TaskCategory.STUDY: 15, TaskCategory.OTHER: 10}
+PRIORITY_WEIGHTS = {TaskPriority.HIGH: 20, TaskPriority.MEDIUM: 50, TaskPriority.LOW: 30}
+URGENCY_WEIGHTS = {TaskUrgency.HIGH: 15, TaskUrgency.MEDIUM: 45, TaskUrgency.LOW: 40}
+
+# (件数の範囲, 重み)
+SUBTASK_FANOUT = [((0, 0), 30), ((1, 3), 35), ((4, 10), 30), ((11, 50), 5)]
+COMMENT_FANOUT = [((0, 0), 40), ((1, 3), 45), ((4, 10), 13), ((11, 50), 1.8), ((51, 300), 0.2)]
+
+NOUNS = [
+    "企画書", "週次レビュー", "定例会議", "見積", "請求書", "契約書", "採用面接", "研修資料", "バグ修正", "API設計",
+    "データベース移行", "画面デザイン", "負荷試験", "リリース準備", "ユーザー調査", "議事録", "予算案", "監視設定",
+    "ドキュメント", "英語学習", "資格試験", "引っ越し", "確定申告", "健康診断", "旅行計画", "読書メモ",
+]
+VERBS = ["作成", "確認", "準備", "更新", "対応", "整理", "検討", "実装", "提出", "見直し"]
+PHRASES = [
+    "関係者に共有する", "期限までに完了させる", "前回の指摘を反映する", "手順を文書化する", "優先度を見直す",
+    "必要な資料を集める", "レビューを依頼する", "進捗を報告する", "課題を洗い出す", "結果をまとめる",
+]
+
+
+def _choice(rng: random.Random, weights: dict):
+    return rng.choices(list(weights), weights=list(weights.values()))[0]
+
+
+def _fanout(rng: random.Random, buckets) -> int:
+    (low, high), = rng.choices([bucket for bucket, _ in buckets], weights=[weight for _, weight in buckets])
+    return rng.randint(low, high)
+
+
+def _sentence(rng: random.Random, words: int) -> str:
+    return "。".join(f"{rng.choice(NOUNS)}の{rng.choice(PHRASES)}" for _ in range(words)) + "。"
+
+
+def _uuid(rng: random.Random) -> str:
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def task_rng(index: int, seed: int = 0) -> random.Random:
+    """タスク番号ごとの乱数（他のタスクの生成有無に依存しない）"""
+    return random.Random(seed * 1_000_000_007 + index)
+
+
+def task_id(index: int, seed: int = 0) -> str:
+    """index 番目のタスクのid（データベースを引かずにサンプリングするため）"""
+    return _uuid(task_rng(index, seed))
+
+
+def generate_task(index: int, count: int, seed: int = 0, end: datetime = DEFAULT_END,
+                  days: int = DEFAULT_DAYS) -> dict:
+    """index 番目（0始まり）のタスクをエクスポート形式で生成"""
+    rng = task_rng(index, seed)
+    record_id = _uuid(rng)
+    start = end - timedelta(days=days)
+    created = start + timedelta(days=days * math.sqrt((index + rng.random()) / count))
+    # 作成からの経過日数が長いほど完了・保留の割合を増やす
+    age = (end - created).days
+    done_ratio = min(0.9, age / 180)
+    roll = rng.random()
+    if roll < done_ratio:
+        status = TaskStatus.COMPLETED
+    elif roll < done_ratio + 0.05:
+        status = TaskStatus.ON_HOLD
+    elif roll < done_ratio + 0.05 + (1 - done_ratio) * 0.4:
+        status = TaskStatus.IN_PROGRESS
+    else:
+        status = TaskStatus.NOT_STARTED
+
+    due_date = planned_start = planned_end = actual_start = actual_end = None
+    if rng.random() < 0.8:
+        due_date = created + timedelta(days=min(365.0, rng.lognormvariate(math.log(14), 0.9)))
+    if rng.random() < 0.4:
+        planned_start = created + timedelta(days=rng.uniform(0, 7))
+        planned_end = planned_start + timedelta(days=rng.uniform(1, 30))
+    if status in (TaskStatus.IN_PROGRESS, TaskStatus.COMPLETED, TaskStatus.ON_HOLD):
+        actual_start = created + timedelta(days=rng.uniform(0, 10))
+    if status == TaskStatus.COMPLETED:
+        actual_end = actual_start + timedelta(days=rng.lognormvariate(math.log(5), 0.8))
+    updated = max(value for value in (created, actual_start, actual_end) if value is not None)
+
+    estimated = round(rng.lognormvariate(math.log(4), 0.8), 1) if rng.random() < 0.6 else None
+    subtask_count = _fanout(rng, SUBTASK_FANOUT)
+    completed_ratio = 1.0 if status == TaskStatus.COMPLETED else rng.random() * 0.8
+    subtasks = [
+        {
+            "id": _uuid(rng),
+            "title": f"{rng.choice(NOUNS)}の{rng.choice(VERBS)}",
+            "order_index": position + 1,
+            "completed": rng.random() < completed_ratio,
+            "created_at": (created + timedelta(minutes=rng.randint(0, 60 * 24))).isoformat(),
+        }
+        for position in range(subtask_count)
+    ]
+    comment_count = _fanout(rng, COMMENT_FANOUT)
+    comments = [
+        {
+            "id": _uuid(rng),
+            "content": _sentence(rng, rng.randint(1, 3)),
+            "created_at": (created + timedelta(hours=rng.uniform(0, max(1.0, age * 24.0)))).isoformat(),
+        }
+        for _ in range(comment_count)
+    ]
+    return {
+        "id": record_id,
+        "title": f"{rng.choice(NOUNS)}の{rng.choice(VERBS)} #{index}",
+        "description": _sentence(rng, rng.randint(1, 4)) if rng.random() < 0.7 else None,
+        "category": _choice(rng, CATEGORY_WEIGHTS).value,
+        "priority": _choice(rng, PRIORITY_WEIGHTS).value,
+        "urgency": _choice(rng, URGENCY_WEIGHTS).value,
+        "status": status.value,
+        "progress": 100 if status == TaskStatus.COMPLETED else (rng.randint(5, 95) if actual_start else 0),
+        "due_date": due_date and due_date.isoformat(),
+        "planned_start_date": planned_start and planned_start.isoformat(),
+        "planned_end_date": planned_end and planned_end.isoformat(),
+        "actual_start_date": actual_start and actual_start.isoformat(),
+        "actual_end_date": actual_end and actual_end.isoformat(),
+        "estimated_hours": estimated,
+        "actual_hours": round(estimated * rng.uniform(0.6, 1.8), 1) if estimated and actual_end else None,
+        "notes": _sentence(rng, 1) if rng.random() < 0.2 else None,
+        "created_at": created.isoformat(),
+        "updated_at": updated.isoformat(),
+        "subtasks": subtasks,
+        "comments": comments,
+    }
+
+
+def generate_records(count: int, seed: int = 0, start: int = 0) -> Iterator[dict]:
+    """start 番目から count 件目までのタスク"""
+    for index in range(start, count):
+        yield generate_task(index, count, seed)
+
+
+def sample_task_ids(count: int, samples: int, seed: int = 0) -> List[str]:
+    """データセット内のタスクidを決定的に抽出"""
+    rng = random.Random(seed)
+    return [task_id(rng.randrange(count), seed) for _ in range(samples)]
+
+
+def write_ndjson(path: str, count: int, seed: int = 0) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        for record in generate_records(count, seed):
+            f.write(json.dumps(record, ensure_ascii=False))
+            f.write("\n")
+
+
+def load_dataset(count: int, seed: int = 0, batch_size: int = IMPORT_BATCH_SIZE,
+                 start: int = 0, progress: bool = True) -> ImportStats:
+    """DATABASE_URL のデータベースに投入（start 以降のタスクのみ）"""
+    stats = ImportStats(last_record=start)
+    records = ((index + 1, record) for index, record in enumerate(generate_records(count, seed, start), start))
+    db = SessionLocal()
+    try:
+        for batch in iter_batches(records, batch_size):
+            write_batch(db, batch)
+            stats.add(batch)
+            if progress:
+                print(
+                    f"\r{stats.last_record}/{count} tasks ({stats.rows_per_sec:.0f} rows/sec)",
+                    end="", file=sys.stderr
+                )
+    finally:
+        db.close()
+    if progress:
+        print(file=sys.stderr)
+    return stats
+
+
+def existing_tasks() -> int:
+    db = SessionLocal()
+    try:
+        return db.scalar(select(func.count()).select_from(Task))
+    finally:
+        db.close()
+
+
+def prepare_database(count: int, seed: int = 0, batch_size: int = IMPORT_BATCH_SIZE, reuse: bool = False) -> None:
+    """
+    データセットを用意する
+
+    reuse=True の場合は既存のタスクを残し、不足分（既存件数以降の番号）のみ追加する
+    （同じ --seed で途中まで投入したデータベースの再開用）。
+    """
+    start = 0
+    if reuse:
+        start = existing_tasks()
+        if start >= count:
+            return
+    else:
+        reset_database()
+    began = time.perf_counter()
+    stats = load_dataset(count, seed, batch_size, start)
+    print(
+        f"✓ タスク{stats.imported_tasks}件 / サブタスク{stats.imported_subtasks}件 / "
+        f"コメント{stats.imported_comments}件を投入しました ({time.perf_counter() - began:.1f}秒)",
+        file=sys.stderr
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=10_000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--batch-size", type=int, default=5000)
+    parser.add_argument("--output", help="NDJSONファイルに出力（省略時はデータベースに投入）")
+    parser.add_argument("--reuse", action="store_true", help="既存データを残して不足分のみ追加")
+    args = parser.parse_args()
+
+    if args.output:
+        write_ndjson(args.output, args.tasks, args.seed)
+    else:
+        prepare_database(args.tasks, args.seed, args.batch_size, args.reuse)
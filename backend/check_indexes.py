@@ -0,0 +1,43 @@
+#!/usr/bin/env python3
+"""
+インデックス利用確認スクリプト
+
+主要クエリのEXPLAIN結果を取得し、想定したインデックスが使われているか確認する。
+"""
+import sys
+from dotenv import load_dotenv
+
+load_dotenv()
+
+def check_indexes(verbose: bool = False) -> bool:
+    """インデックス利用状況をチェック"""
+    from app.database.connection import engine
+    from app.database.index_check import run_checks
+
+    with engine.connect() as conn:
+        try:
+            results = run_checks(conn)
+        except ValueError as e:
+            print(f"✗ {e}")
+            return False
+
+    for result in results:
+        mark = "✓" if result.ok else "✗"
+        used = ", ".join(sorted(result.used)) or "なし"
+        expected = ", ".join(sorted(result.expected))
+        print(f"{mark} {result.check.name}: 使用={used} / 想定={expected}")
+        if verbose or not result.ok:
+            print(f"    {result.plan}")
+
+    failed = [r for r in results if not r.ok]
+    print()
+    if failed:
+        print(f"✗ {len(failed)}件のクエリで想定インデックスが使われていません")
+        print("  python -m app.database.init_db を実行してインデックスを作成してください")
+    else:
+        print("✓ すべてのクエリで想定インデックスが使われています")
+    return not failed
+
+if __name__ == "__main__":
+    ok = check_indexes(verbose="-v" in sys.argv)
+    sys.exit(0 if ok else 1)
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+タスクエクスポートスクリプト
+
+全タスクをサブタスク・コメント付きでNDJSONまたはCSVに出力する。
+サーバーサイドカーソルで一定件数ずつ読み込むため、件数に関わらずメモリ使用量は一定。
+
+使い方:
+    python export_tasks.py --format ndjson --output tasks.ndjson
+    python export_tasks.py --format csv > tasks.csv
+"""
+import argparse
+import sys
+import time
+from dotenv import load_dotenv
+
+load_dotenv()
+
+def export_tasks(export_format: str, output, batch_size: int) -> int:
+    """タスクを出力し、件数を返す"""
+    from app.database.connection import SessionLocal
+    from app.services.export import csv_header, export_statement, format_chunk
+
+    db = SessionLocal()
+    count = 0
+    start = time.perf_counter()
+    try:
+        if export_format == "csv":
+            output.write(csv_header())
+        result = db.execute(export_statement(batch_size))
+        for partition in result.scalars().partitions():
+            output.write(format_chunk(partition, export_format))
+            count += len(partition)
+            for task in partition:
+                db.expunge(task)
+            elapsed = time.perf_counter() - start
+            print(f"\r{count} tasks ({count / elapsed:.0f} tasks/sec)", end="", file=sys.stderr)
+    finally:
+        db.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"\n✓ {count}件をエクスポートしました ({elapsed:.1f}秒, {count / elapsed if elapsed else 0:.0f} tasks/sec)", file=sys.stderr)
+    return count
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="タスクをNDJSON/CSVでエクスポート")
+    parser.add_argument("--format", choices=["ndjson", "csv"], default="ndjson")
+    parser.add_argument("--output", help="出力ファイル（省略時は標準出力）")
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8", newline="") as f:
+            export_tasks(args.format, f, args.batch_size)
+    else:
+        export_tasks(args.format, sys.stdout, args.batch_size)
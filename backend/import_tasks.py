@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+タスクインポートスクリプト
+
+export_tasks.py の出力形式（NDJSON / CSV）を読み込み、サブタスク・コメントを含めて
+バッチ単位で登録する。PostgreSQLではCOPY、それ以外は executemany で書き込む。
+--checkpoint を指定するとバッチのコミットごとに進捗を記録し、再実行時に続きから再開する。
+
+使い方:
+    python import_tasks.py tasks.ndjson --checkpoint import.ckpt.json
+    python import_tasks.py tasks.csv --format csv --batch-size 5000
+"""
+import argparse
+import json
+import os
+import sys
+from dotenv import load_dotenv
+
+load_dotenv()
+
+def load_checkpoint(path: str, source: str) -> int:
+    """チェックポイントから再開位置（最後にコミットしたレコード番号）を返す"""
+    if not path or not os.path.exists(path):
+        return 0
+    with open(path, encoding="utf-8") as f:
+        checkpoint = json.load(f)
+    if checkpoint.get("source") != source:
+        sys.exit(f"✗ チェックポイントは別のファイル用です: {checkpoint.get('source')}")
+    return checkpoint["record"]
+
+def save_checkpoint(path: str, source: str, stats) -> None:
+    """チェックポイントを書き込む（一時ファイル経由で置き換え）"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({
+            "source": source,
+            "record": stats.last_record,
+            "imported_tasks": stats.imported_tasks,
+            "error_count": stats.error_count,
+        }, f)
+    os.replace(tmp_path, path)
+
+def import_tasks(source: str, import_format: str, batch_size: int, checkpoint: str = None, use_copy=None):
+    """ファイルを取り込み、ImportStatsを返す"""
+    from app.database.connection import SessionLocal
+    from app.services.importer import ImportStats, iter_batches, iter_records, write_batch
+
+    source = os.path.abspath(source)
+    skip = load_checkpoint(checkpoint, source)
+    if skip:
+        print(f"レコード {skip} の続きから再開します", file=sys.stderr)
+
+    stats = ImportStats(last_record=skip)
+    db = SessionLocal()
+    try:
+        with open(source, encoding="utf-8-sig", newline="") as f:
+            for batch in iter_batches(iter_records(f, import_format), batch_size, skip):
+                write_batch(db, batch, use_copy)
+                stats.add(batch)
+                if checkpoint:
+                    save_checkpoint(checkpoint, source, stats)
+                for error in batch.errors:
+                    print(f"\n  レコード {error['record']}: {error['detail']}", file=sys.stderr)
+                print(
+                    f"\r{stats.last_record} records, {stats.imported_tasks} tasks "
+                    f"({stats.rows_per_sec:.0f} rows/sec)",
+                    end="", file=sys.stderr
+                )
+    finally:
+        db.close()
+
+    print(
+        f"\n✓ タスク{stats.imported_tasks}件 / サブタスク{stats.imported_subtasks}件 / "
+        f"コメント{stats.imported_comments}件をインポートしました "
+        f"({stats.elapsed:.1f}秒, {stats.rows_per_sec:.0f} rows/sec, エラー{stats.error_count}件)",
+        file=sys.stderr
+    )
+    return stats
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="NDJSON/CSVからタスクをインポート")
+    parser.add_argument("source", help="入力ファイル")
+    parser.add_argument("--format", choices=["ndjson", "csv"], help="省略時は拡張子から判定")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    parser.add_argument("--checkpoint", help="進捗を記録するファイル（再実行時に続きから再開）")
+    parser.add_argument("--no-copy", action="store_true", help="PostgreSQLでもCOPYを使わない")
+    args = parser.parse_args()
+
+    import_format = args.format or ("csv" if args.source.lower().endswith(".csv") else "ndjson")
+    stats = import_tasks(
+        args.source, import_format, args.batch_size, args.checkpoint,
+        use_copy=False if args.no_copy else None
+    )
+    sys.exit(1 if stats.error_count else 0)
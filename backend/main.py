@@ -1,11 +1,21 @@
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+import asyncio
 import os
 from dotenv import load_dotenv
-from app.api import tasks, subtasks, comments
-from app.database.connection import engine
-from app.models import task, subtask, comment
+from app.api import tasks, subtasks, comments, metrics, changes
+from app.middleware.compression import CompressionMiddleware
+from app.middleware.metrics import RequestMetricsMiddleware
+from app.middleware.read_your_writes import ReadYourWritesMiddleware
+from app.database.connection import engine, async_engine, AsyncSessionLocal
+from app.database.init_db import create_indexes, migrate_task_counts
+from app.database.replicas import replica_router
+from app.models import task, subtask, comment, change_version
+from app.services.summary_cache import run_reconciler
+from app.services.change_feed import change_feed
+from app.services.response_cache import response_cache
 
 # 環境変数を読み込み
 load_dotenv()
@@ -16,8 +26,22 @@ async def lifespan(app: FastAPI):
     print("Starting Task Management API...")
     # データベーステーブル作成
     task.Base.metadata.create_all(bind=engine)
+    migrate_task_counts()
+    create_indexes()
+    # マトリックス集計キャッシュの定期突き合わせ
+    reconcile_interval = float(os.getenv("SUMMARY_RECONCILE_INTERVAL", "300"))
+    reconciler = asyncio.create_task(run_reconciler(AsyncSessionLocal, reconcile_interval))
+    # 変更フィード（CHANGE_FEED_BACKEND=postgres の場合は LISTEN を開始）
+    await change_feed.start()
+    # 読み取りレプリカの死活・遅延チェック（DATABASE_REPLICA_URLS 指定時）
+    await replica_router.start()
     yield
     # アプリケーション終了時の処理
+    reconciler.cancel()
+    await change_feed.stop()
+    await response_cache.close()
+    await replica_router.close()
+    await async_engine.dispose()
     print("Shutting down Task Management API...")
 
 # FastAPIアプリケーションの作成
@@ -25,7 +49,9 @@ app = FastAPI(
     title="タスク管理アプリ API",
     description="個人用タスク管理アプリケーションのRESTful API",
     version="1.0.0",
-    lifespan=lifespan
+    lifespan=lifespan,
+    # レスポンスはorjsonでエンコードする
+    default_response_class=ORJSONResponse
 )
 
 # CORS設定
@@ -36,8 +62,19 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # 条件付きGETの検証子をフロントエンドから参照できるようにする
+    expose_headers=["ETag", "Last-Modified", "Server-Timing", "X-Primary-Until"],
 )
 
+# 書き込み後の読み取りをプライマリに送る期限の付与（レプリカ設定時のみ）
+app.add_middleware(ReadYourWritesMiddleware)
+
+# レスポンス圧縮（COMPRESSION_MIN_SIZE 以上かつ許可したContent-Typeのみ）
+app.add_middleware(CompressionMiddleware)
+
+# ルート別のレイテンシ・SQL数の計測（最も外側に置き、圧縮を含めて計測する）
+app.add_middleware(RequestMetricsMiddleware)
+
 # ルートエンドポイント
 @app.get("/")
 async def root():
@@ -47,6 +84,10 @@ async def root():
 app.include_router(tasks.router, prefix="/api/v1")
 app.include_router(subtasks.router, prefix="/api/v1")
 app.include_router(comments.router, prefix="/api/v1")
+app.include_router(changes.router, prefix="/api/v1")
+
+# メトリクス
+app.include_router(metrics.router)
 
 # ヘルスチェック
 @app.get("/health")
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+タスク件数の再計算スクリプト
+
+tasks テーブルの subtask_count / completed_subtasks / comment_count を
+子テーブルから数え直し、ずれている行だけを更新する。
+件数列のない既存データベースには列を追加してから再計算する。
+
+使い方:
+    python repair_task_counts.py
+    python repair_task_counts.py --batch-size 5000
+"""
+import argparse
+import sys
+import time
+from dotenv import load_dotenv
+
+load_dotenv()
+
+def repair_task_counts(batch_size: int) -> int:
+    """件数を再計算し、修正した件数を返す"""
+    from app.database.connection import SessionLocal, engine
+    from app.services.task_counts import ensure_count_columns, repair_counts
+
+    added = ensure_count_columns(engine)
+    if added:
+        print(f"列を追加しました: {', '.join(added)}", file=sys.stderr)
+
+    start = time.perf_counter()
+
+    def progress(checked: int, fixed: int):
+        print(f"\r{checked} tasks checked, {fixed} fixed", end="", file=sys.stderr)
+
+    db = SessionLocal()
+    try:
+        checked, fixed = repair_counts(db, batch_size, progress)
+    finally:
+        db.close()
+
+    elapsed = time.perf_counter() - start
+    print(f"\n✓ {checked}件を確認し、{fixed}件を修正しました ({elapsed:.1f}秒)", file=sys.stderr)
+    return fixed
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="タスクのサブタスク・コメント件数を再計算")
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args()
+
+    repair_task_counts(args.batch_size)
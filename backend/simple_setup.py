@@ -21,6 +21,7 @@ def setup_database():
         from app.models.task import Task, TaskCategory, TaskPriority, TaskUrgency, TaskStatus
         from app.models.subtask import SubTask
         from app.models.comment import TaskComment
+        from app.services.task_counts import repair_counts
         from datetime import datetime, timedelta
         
         db = SessionLocal()
@@ -88,6 +89,9 @@ def setup_database():
             db.add(comment)
         
         db.commit()
+        
+        # サブタスク・コメントの件数列を反映
+        repair_counts(db)
         db.close()
         
         print("OK: データベースセットアップ完了!")
@@ -0,0 +1,66 @@
+"""
+APIテストの共通設定
+
+一時ディレクトリのSQLiteを使い、アプリのlifespanを1回だけ起動する。
+各テストの前にデータとプロセス内のキャッシュを空にする。
+appパッケージより先に環境変数を設定するため、ここでimportする。
+"""
+import os
+import re
+import tempfile
+
+_db_path = os.path.join(tempfile.mkdtemp(prefix="task_test_"), "test.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{_db_path}"
+os.environ.pop("ASYNC_DATABASE_URL", None)
+os.environ["DATABASE_REPLICA_URLS"] = ""
+os.environ["RESPONSE_CACHE_BACKEND"] = "memory"
+os.environ["CHANGE_FEED_BACKEND"] = "memory"
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import delete
+
+from app.database.connection import engine
+from app.models.task import Task
+from app.models.subtask import SubTask
+from app.models.comment import TaskComment
+from app.services.calendar import calendar_cache
+from app.services.response_cache import response_cache
+from app.services.summary_cache import summary_cache
+from main import app
+
+API = "/api/v1"
+
+
+def sql_statements(response) -> int:
+    """Server-Timing の db 項目から発行されたSQL数を取得"""
+    return int(re.search(r'desc="(\d+) queries', response.headers["server-timing"]).group(1))
+
+
+@pytest.fixture(scope="session")
+def client():
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture(autouse=True)
+def clean(client):
+    with engine.begin() as conn:
+        for model in (TaskComment, SubTask, Task):
+            conn.execute(delete(model))
+    summary_cache.invalidate()
+    calendar_cache.invalidate()
+    client.portal.call(response_cache.clear)
+    client.cookies.clear()
+    yield
+
+
+@pytest.fixture
+def make_task(client):
+    """APIでタスクを作成して返す"""
+    def make(**fields):
+        payload = {"title": "task", "category": "work", "priority": "medium", "urgency": "medium", **fields}
+        response = client.post(f"{API}/tasks/", json=payload)
+        assert response.status_code == 200, response.text
+        return response.json()
+    return make
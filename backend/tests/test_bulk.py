@@ -0,0 +1,60 @@
+from conftest import API
+
+VALID = {"title": "bulk", "category": "work", "priority": "high", "urgency": "low"}
+
+
+def test_bulk_create_reports_invalid_items(client):
+    response = client.post(f"{API}/tasks/bulk", json={"tasks": [VALID, {"title": "missing category"}, VALID]})
+    assert response.status_code == 200
+    body = response.json()
+    assert len(body["succeeded"]) == 2
+    assert [error["index"] for error in body["errors"]] == [1]
+
+
+def test_bulk_create_atomic_rolls_back_on_error(client):
+    response = client.post(f"{API}/tasks/bulk?atomic=true", json={"tasks": [VALID, {"title": "x"}]})
+    assert response.status_code == 422
+    assert client.get(f"{API}/tasks/").json()["pagination"]["total"] == 0
+
+
+def test_bulk_update_per_item_errors(client, make_task):
+    first, second = make_task(), make_task()
+    response = client.put(f"{API}/tasks/bulk", json={"items": [
+        {"id": first["id"], "status": "completed"},
+        {"id": "missing", "title": "x"},
+        {"id": first["id"], "title": "again"},
+        {"id": second["id"], "progress": 500},
+    ]})
+    assert response.status_code == 200
+    body = response.json()
+    assert [task["id"] for task in body["succeeded"]] == [first["id"]]
+    assert body["succeeded"][0]["status"] == "completed"
+    errors = {error["index"]: error for error in body["errors"]}
+    assert set(errors) == {1, 2, 3}
+    assert errors[1]["detail"] == "Task not found"
+    assert errors[2]["detail"] == "Duplicate id in request"
+
+
+def test_bulk_update_rejects_null_for_required_columns(client, make_task):
+    first, second = make_task(title="keep"), make_task()
+    response = client.put(f"{API}/tasks/bulk", json={"items": [
+        {"id": first["id"], "title": None},
+        {"id": second["id"], "status": None, "notes": None, "title": "renamed"},
+        {"id": first["id"], "description": None},
+    ]})
+    assert response.status_code == 200
+    body = response.json()
+    assert [error["index"] for error in body["errors"]] == [0, 1]
+    assert body["errors"][0]["detail"][0]["loc"] == ["title"]
+    assert [error["loc"] for error in body["errors"][1]["detail"]] == [["status"]]
+    # nullable な列はnullで更新できる
+    assert [task["id"] for task in body["succeeded"]] == [first["id"]]
+    assert client.get(f"{API}/tasks/{first['id']}").json()["title"] == "keep"
+
+
+def test_bulk_delete_reports_missing_ids(client, make_task):
+    task = make_task()
+    body = client.request("DELETE", f"{API}/tasks/bulk", json={"ids": [task["id"], "missing"]}).json()
+    assert body["succeeded"] == [{"id": task["id"]}]
+    assert body["errors"] == [{"index": 1, "id": "missing", "detail": "Task not found"}]
+    assert client.get(f"{API}/tasks/{task['id']}").status_code == 404
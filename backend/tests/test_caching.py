@@ -0,0 +1,104 @@
+import time
+
+from sqlalchemy import update
+
+from app.database.connection import engine
+from app.models.task import Task
+from conftest import API
+
+
+def test_etag_returns_304_until_data_changes(client, make_task):
+    task = make_task()
+    first = client.get(f"{API}/tasks/")
+    etag = first.headers["etag"]
+    assert client.get(f"{API}/tasks/", headers={"If-None-Match": etag}).status_code == 304
+
+    client.put(f"{API}/tasks/{task['id']}", json={"title": "changed"})
+    changed = client.get(f"{API}/tasks/", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+
+
+def test_etag_depends_on_query(client, make_task):
+    make_task()
+    etag = client.get(f"{API}/tasks/", params={"limit": 5}).headers["etag"]
+    assert client.get(f"{API}/tasks/", params={"limit": 6}, headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_detail_etag(client, make_task):
+    task = make_task()
+    url = f"{API}/tasks/{task['id']}"
+    etag = client.get(url).headers["etag"]
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+    client.post(f"{url}/comments", json={"content": "new"})
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 200
+
+
+def test_response_cache_is_invalidated_by_writes(client, make_task):
+    task = make_task(title="before")
+    assert client.get(f"{API}/tasks/").json()["tasks"][0]["title"] == "before"
+    # 2回目はキャッシュから返る
+    assert client.get(f"{API}/tasks/").json()["tasks"][0]["title"] == "before"
+
+    client.put(f"{API}/tasks/{task['id']}", json={"title": "after"})
+    assert client.get(f"{API}/tasks/").json()["tasks"][0]["title"] == "after"
+
+    detail = client.get(f"{API}/tasks/{task['id']}").json()
+    assert detail["comment_count"] == 0
+    client.post(f"{API}/tasks/{task['id']}/comments", json={"content": "c"})
+    assert client.get(f"{API}/tasks/{task['id']}").json()["comment_count"] == 1
+    assert client.get(f"{API}/tasks/").json()["tasks"][0]["comment_count"] == 1
+
+
+def test_matrix_summary_follows_writes(client, make_task):
+    task = make_task(priority="high", urgency="high")
+    summary = client.get(f"{API}/tasks/matrix/summary").json()
+    assert summary["total_tasks"] == 1
+    client.put(f"{API}/tasks/{task['id']}", json={"status": "completed"})
+    assert client.get(f"{API}/tasks/matrix/summary").json()["total_tasks"] == 0
+
+
+def test_writer_skips_response_cache_within_deadline(client, make_task):
+    task = make_task(title="before")
+    client.cookies.clear()
+    assert client.get(f"{API}/tasks/").json()["tasks"][0]["title"] == "before"
+
+    # 他ワーカーでの書き込み（このプロセスのキャッシュは無効化されない）
+    with engine.begin() as conn:
+        conn.execute(update(Task).where(Task.id == task["id"]).values(title="elsewhere"))
+
+    assert client.get(f"{API}/tasks/").json()["tasks"][0]["title"] == "before"
+    deadline = {"X-Primary-Until": f"{time.time() + 60:.3f}"}
+    assert client.get(f"{API}/tasks/", headers=deadline).json()["tasks"][0]["title"] == "elsewhere"
+
+    written = client.post(f"{API}/tasks/", json={"title": "t", "category": "work", "priority": "low", "urgency": "low"})
+    assert float(written.headers["X-Primary-Until"]) > time.time()
+
+
+def test_detail_etag_ignores_other_tasks(client, make_task):
+    task = make_task()
+    other = make_task()
+    url = f"{API}/tasks/{task['id']}"
+    etag = client.get(url).headers["etag"]
+    client.put(f"{API}/tasks/{other['id']}", json={"title": "changed"})
+    client.post(f"{API}/tasks/{other['id']}/comments", json={"content": "c"})
+    assert client.get(url, headers={"If-None-Match": etag}).status_code == 304
+
+
+def test_detail_etag_follows_subtask_edits(client, make_task):
+    task = make_task()
+    url = f"{API}/tasks/{task['id']}"
+    subtask = client.post(f"{url}/subtasks", json={"title": "before"}).json()
+    etag = client.get(url).headers["etag"]
+    client.put(f"{API}/subtasks/{subtask['id']}", json={"title": "after"})
+    changed = client.get(url, headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.json()["subtasks"][0]["title"] == "after"
+
+
+def test_child_writes_keep_matrix_etag(client, make_task):
+    task = make_task()
+    etag = client.get(f"{API}/tasks/matrix").headers["etag"]
+    client.post(f"{API}/tasks/{task['id']}/comments", json={"content": "c"})
+    client.post(f"{API}/tasks/{task['id']}/subtasks", json={"title": "s"})
+    assert client.get(f"{API}/tasks/matrix", headers={"If-None-Match": etag}).status_code == 304
@@ -0,0 +1,70 @@
+from datetime import datetime
+
+from sqlalchemy import update
+
+from app.database.connection import SessionLocal
+from app.models.task import Task
+from app.services.response_cache import response_cache
+from conftest import API
+
+
+def _calendar(client, **params):
+    return client.get(f"{API}/tasks/calendar", params=params)
+
+
+def test_month_range_includes_last_day_and_excludes_next_month(client, make_task):
+    inside = make_task(title="inside", due_date="2024-03-31T23:30:00")
+    make_task(title="outside", due_date="2024-04-01T00:00:00")
+    body = _calendar(client, year=2024, month=3).json()
+    assert body["range"] == {"start": "2024-03-01", "end": "2024-03-31"}
+    events = [event for day in body["calendar_data"].values() for event in day]
+    assert [event["id"] for event in events] == [inside["id"]]
+    assert body["summary"]["due_dates"] == 1
+
+
+def test_multi_month_range_crosses_year(client, make_task):
+    make_task(due_date="2024-12-15T09:00:00")
+    make_task(due_date="2025-01-15T09:00:00")
+    body = _calendar(client, year=2024, month=12, months=2).json()
+    assert body["range"] == {"start": "2024-12-01", "end": "2025-01-31"}
+    assert body["summary"]["due_dates"] == 2
+
+
+def test_week_and_explicit_ranges(client, make_task):
+    make_task(planned_start_date="2024-05-08T10:00:00")
+    week = _calendar(client, week_of="2024-05-09").json()
+    assert week["range"] == {"start": "2024-05-06", "end": "2024-05-12"}
+    assert week["summary"]["start_dates"] == 1
+    explicit = _calendar(client, start_date="2024-05-09", end_date="2024-05-31").json()
+    assert explicit["summary"]["start_dates"] == 0
+
+
+def test_invalid_ranges_return_400(client):
+    assert _calendar(client).status_code == 400
+    assert _calendar(client, start_date="2024-05-10", end_date="2024-05-01").status_code == 400
+    assert _calendar(client, start_date="2024-01-01", end_date="2025-06-01").status_code == 400
+    assert _calendar(client, year=2024, month=13).status_code == 422
+
+
+def test_ranges_ending_after_year_9999_return_400(client):
+    assert _calendar(client, year=9999, month=12).status_code == 400
+    assert _calendar(client, year=9999, month=11, months=2).status_code == 400
+    assert _calendar(client, week_of="9999-12-30").status_code == 400
+    assert _calendar(client, start_date="9999-12-01", end_date="9999-12-31").status_code == 400
+    assert _calendar(client, year=9999, month=11).status_code == 200
+
+
+def test_past_month_follows_writes_from_other_workers(client, make_task):
+    task = make_task(title="moved", due_date="2024-05-10T09:00:00")
+    first = _calendar(client, year=2024, month=3)
+    assert first.json()["calendar_data"] == {}
+
+    # 他ワーカーでの書き込み（このプロセスの月キャッシュは無効化されない）
+    with SessionLocal() as db:
+        db.execute(update(Task).where(Task.id == task["id"]).values(due_date=datetime(2024, 3, 5, 9)))
+        db.commit()
+    client.portal.call(response_cache.clear)
+
+    second = _calendar(client, year=2024, month=3)
+    assert second.headers["etag"] != first.headers["etag"]
+    assert list(second.json()["calendar_data"]) == ["2024-03-05"]
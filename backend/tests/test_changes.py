@@ -0,0 +1,109 @@
+import asyncio
+import json
+
+from app.api.changes import stream_changes
+from app.services.change_feed import OVERFLOW, ChangeHub, change_feed
+from conftest import API
+
+
+def _event(task_id, entity="task"):
+    return {"entity": entity, "action": "updated", "id": task_id, "task_id": task_id}
+
+
+def test_hub_filters_by_task_and_replays_history():
+    hub = ChangeHub(history_size=3)
+    everything, _ = hub.subscribe()
+    only_a, _ = hub.subscribe("a")
+    for task_id in ("a", "b", "a", "b"):
+        hub.dispatch(_event(task_id))
+    assert everything.queue.qsize() == 4
+    assert [event["task_id"] for _, event in [only_a.queue.get_nowait() for _ in range(2)]] == ["a", "a"]
+    assert hub.subscribe("a", last_event_id=2)[1] == [(3, _event("a"))]
+    assert hub.subscribe(last_event_id=4)[1] == []
+    # 履歴（直近3件）より前・未来のIDは再取得が必要
+    assert hub.subscribe(last_event_id=0)[1] is None
+    assert hub.subscribe(last_event_id=9)[1] is None
+    assert hub.subscribe(last_event_id=-1)[1] is None
+
+
+def test_hub_drops_subscriber_whose_queue_overflows():
+    hub = ChangeHub(queue_size=2)
+    slow, _ = hub.subscribe()
+    fast, _ = hub.subscribe()
+    for task_id in ("a", "b"):
+        hub.dispatch(_event(task_id))
+    fast.queue.get_nowait()
+    fast.queue.get_nowait()
+    hub.dispatch(_event("c"))
+    assert hub.subscriber_count == 1
+    # 最古のイベントを捨てて OVERFLOW を入れる
+    assert slow.queue.get_nowait()[1]["task_id"] == "b"
+    assert slow.queue.get_nowait() is OVERFLOW
+    assert fast.queue.get_nowait()[1]["task_id"] == "c"
+
+
+def _parse(chunk):
+    fields = dict(line.split(": ", 1) for line in chunk.strip().splitlines())
+    return fields.get("event"), json.loads(fields["data"]) if "data" in fields else None
+
+
+def test_stream_sends_events_and_resumes(client, make_task):
+    response = client.portal.call(stream_changes, None, None)
+    body = response.body_iterator
+    try:
+        assert client.portal.call(body.__anext__) == "retry: 3000\n\n"
+        task = make_task()
+        client.post(f"{API}/tasks/{task['id']}/comments", json={"content": "c"})
+        first = client.portal.call(body.__anext__)
+        kind, event = _parse(first)
+        assert kind == "change"
+        assert (event["entity"], event["action"], event["id"]) == ("task", "created", task["id"])
+        kind, event = _parse(client.portal.call(body.__anext__))
+        assert (event["entity"], event["action"], event["task_id"]) == ("comment", "created", task["id"])
+    finally:
+        client.portal.call(body.aclose)
+    assert client.get(f"{API}/changes/status").json()["subscribers"] == 0
+
+    # 受信済みのIDから再接続すると以降のイベントだけを受け取る
+    first_id = first.split("\n", 1)[0].removeprefix("id: ")
+    body = client.portal.call(stream_changes, task["id"], first_id).body_iterator
+    try:
+        client.portal.call(body.__anext__)
+        kind, event = _parse(client.portal.call(body.__anext__))
+        assert (kind, event["entity"]) == ("change", "comment")
+    finally:
+        client.portal.call(body.aclose)
+
+    body = client.portal.call(stream_changes, None, "garbage").body_iterator
+    try:
+        client.portal.call(body.__anext__)
+        assert _parse(client.portal.call(body.__anext__)) == ("reset", {})
+    finally:
+        client.portal.call(body.aclose)
+
+
+def test_client_disconnect_removes_subscriber(client):
+    async def run():
+        response = await stream_changes(None, None)
+        disconnected = asyncio.Event()
+        sent, subscribers = [], []
+
+        async def receive():
+            await disconnected.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            sent.append(message)
+            if message.get("body"):
+                subscribers.append(change_feed.hub.subscriber_count)
+                disconnected.set()
+
+        scope = {"type": "http", "method": "GET", "path": f"{API}/changes/stream", "headers": []}
+        serving = asyncio.create_task(response(scope, receive, send))
+        await asyncio.wait_for(serving, 5)
+        return sent, subscribers
+
+    sent, subscribers = client.portal.call(run)
+    assert sent[0]["status"] == 200
+    assert subscribers == [1]
+    assert change_feed.hub.subscriber_count == 0
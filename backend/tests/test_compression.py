@@ -0,0 +1,97 @@
+import gzip
+
+import pytest
+
+from app.middleware import compression
+from app.middleware.compression import CompressionSettings, compression_settings
+from conftest import API
+
+
+def _many_tasks(make_task, count=12):
+    for i in range(count):
+        make_task(title=f"t{i}", description="圧縮される説明文" * 10)
+
+
+def test_negotiate_prefers_server_order_within_the_same_weight():
+    settings = CompressionSettings(encodings=("br", "gzip"))
+    assert settings.negotiate("gzip, br") == "br"
+    assert settings.negotiate("br;q=0.5, gzip") == "gzip"
+    assert settings.negotiate("*") == "br"
+    assert settings.negotiate("*, br;q=0") == "gzip"
+    assert settings.negotiate("br;q=0, gzip;q=0") is None
+    assert settings.negotiate("gzip;q=abc") is None
+    assert settings.negotiate("identity") is None
+    assert settings.negotiate(None) is None
+    assert CompressionSettings(encodings=("gzip",)).negotiate("br") is None
+
+
+def test_settings_from_env(monkeypatch):
+    monkeypatch.setenv("COMPRESSION_MIN_SIZE", "10")
+    monkeypatch.setenv("COMPRESSION_CONTENT_TYPES", "application/json, text/csv")
+    monkeypatch.setattr(compression, "brotli", None)
+    settings = CompressionSettings.from_env()
+    assert settings.minimum_size == 10
+    assert settings.allows("application/json; charset=utf-8")
+    assert not settings.allows("text/event-stream")
+    # brotli 未インストール時は br を使わない
+    assert settings.encodings == ("gzip",)
+
+
+def test_gzip_only_above_minimum_size(client, make_task):
+    _many_tasks(make_task)
+    plain = client.get(f"{API}/tasks/", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+    assert len(plain.content) >= compression_settings.minimum_size
+    compressed = client.get(f"{API}/tasks/", headers={"Accept-Encoding": "gzip"})
+    assert compressed.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in compressed.headers["vary"]
+    assert int(compressed.headers["content-length"]) < len(plain.content)
+    assert compressed.json() == plain.json()
+
+    small = client.get(f"{API}/changes/status", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in small.headers
+
+
+def test_streaming_export_is_compressed_per_chunk(client, make_task):
+    _many_tasks(make_task)
+    plain = client.get(f"{API}/tasks/export", headers={"Accept-Encoding": "identity"})
+    with client.stream("GET", f"{API}/tasks/export", headers={"Accept-Encoding": "gzip"}) as response:
+        assert response.headers["content-encoding"] == "gzip"
+        assert "content-length" not in response.headers
+        raw = b"".join(response.iter_raw())
+    assert gzip.decompress(raw) == plain.content
+
+
+def test_brotli_when_installed(client, make_task):
+    brotli = pytest.importorskip("brotli")
+    _many_tasks(make_task)
+    settings = CompressionSettings(encodings=("br", "gzip"))
+    body = b'{"tasks": []}' * 200
+    assert brotli.decompress(settings.compress(body, "br")) == body
+    process, finish = settings.stream_compressor("br")
+    assert brotli.decompress(process(body[:100]) + process(body[100:]) + finish()) == body
+    if "br" in compression_settings.encodings:
+        response = client.get(f"{API}/tasks/", headers={"Accept-Encoding": "br"})
+        assert response.headers["content-encoding"] == "br"
+
+
+def test_cache_hits_return_precompressed_body(client, make_task, monkeypatch):
+    _many_tasks(make_task)
+    client.cookies.clear()
+    calls = []
+    compress = CompressionSettings.compress
+    monkeypatch.setattr(CompressionSettings, "compress", lambda self, body, encoding: (
+        calls.append(encoding) or compress(self, body, encoding)
+    ))
+    first = client.get(f"{API}/tasks/", headers={"Accept-Encoding": "gzip"})
+    # 保存時に1回だけ圧縮する
+    assert calls == list(compression_settings.encodings)
+    calls.clear()
+    hit = client.get(f"{API}/tasks/", headers={"Accept-Encoding": "gzip"})
+    assert calls == []
+    assert hit.headers["content-encoding"] == "gzip"
+    assert hit.json() == first.json()
+    plain = client.get(f"{API}/tasks/", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in plain.headers
+    assert plain.json() == first.json()
+    assert calls == []
@@ -0,0 +1,69 @@
+import csv
+import io
+import json
+
+from app.database.connection import AsyncSessionLocal
+from app.services import export
+from conftest import API
+
+
+def _tasks_with_children(client, make_task, count=3):
+    ids = []
+    for i in range(count):
+        task_id = make_task(title=f"t{i}", description='改行\nと "引用符", カンマ')["id"]
+        client.post(f"{API}/tasks/{task_id}/subtasks", json={"title": f"s{i}"})
+        client.post(f"{API}/tasks/{task_id}/comments", json={"content": f"c{i}"})
+        ids.append(task_id)
+    return ids
+
+
+def test_ndjson_export_includes_children(client, make_task):
+    ids = _tasks_with_children(client, make_task)
+    with client.stream("GET", f"{API}/tasks/export") as response:
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        assert response.headers["content-disposition"] == 'attachment; filename="tasks.ndjson"'
+        records = [json.loads(line) for line in response.iter_lines() if line]
+    assert sorted(record["id"] for record in records) == sorted(ids)
+    for record in records:
+        index = record["title"][1:]
+        assert record["description"] == '改行\nと "引用符", カンマ'
+        assert [subtask["title"] for subtask in record["subtasks"]] == [f"s{index}"]
+        assert [comment["content"] for comment in record["comments"]] == [f"c{index}"]
+
+
+def test_csv_export_quotes_text_and_embeds_children_as_json(client, make_task):
+    ids = _tasks_with_children(client, make_task)
+    response = client.get(f"{API}/tasks/export", params={"format": "csv"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.reader(io.StringIO(response.text)))
+    assert rows[0] == export.CSV_FIELDS
+    records = [dict(zip(rows[0], row)) for row in rows[1:]]
+    assert sorted(record["id"] for record in records) == sorted(ids)
+    for record in records:
+        assert record["description"] == '改行\nと "引用符", カンマ'
+        assert len(json.loads(record["subtasks"])) == 1
+        assert json.loads(record["comments"])[0]["content"] == f"c{record['title'][1:]}"
+
+
+def test_export_without_tasks(client):
+    assert client.get(f"{API}/tasks/export").text == ""
+    assert client.get(f"{API}/tasks/export", params={"format": "csv"}).text == export.csv_header()
+    assert client.get(f"{API}/tasks/export", params={"format": "xml"}).status_code == 422
+
+
+def test_export_streams_one_chunk_per_batch(client, make_task, monkeypatch):
+    ids = _tasks_with_children(client, make_task, count=5)
+    statement = export.export_statement
+    monkeypatch.setattr(export, "export_statement", lambda: statement(batch_size=2))
+
+    async def collect():
+        return [chunk async for chunk in export.stream_export(AsyncSessionLocal, "ndjson")]
+
+    chunks = client.portal.call(collect)
+    assert [chunk.count("\n") for chunk in chunks] == [2, 2, 1]
+    records = [json.loads(line) for chunk in chunks for line in chunk.splitlines()]
+    assert sorted(record["id"] for record in records) == sorted(ids)
+    # 後続バッチでも子レコードが読み込まれている
+    assert all(len(record["subtasks"]) == len(record["comments"]) == 1 for record in records)
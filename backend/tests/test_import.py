@@ -0,0 +1,119 @@
+import csv
+import json
+
+from app.models.comment import TaskComment
+from app.models.subtask import SubTask
+from app.models.task import Task
+from app.services.importer import copy_buffer, prepare_batch
+from conftest import API
+
+
+def _record(title, **fields):
+    return {"title": title, "category": "work", "priority": "low", "urgency": "low", **fields}
+
+
+def _ndjson(*records):
+    return "".join(
+        (record if isinstance(record, str) else json.dumps(record, ensure_ascii=False)) + "\n"
+        for record in records
+    ).encode("utf-8")
+
+
+def _import(client, content, **params):
+    return client.post(
+        f"{API}/tasks/import", params=params, files={"file": ("tasks.ndjson", content, "application/x-ndjson")}
+    )
+
+
+def test_import_with_children_and_counts(client):
+    response = _import(client, _ndjson(_record(
+        "imported",
+        id="11111111-1111-4111-8111-111111111111",
+        subtasks=[{"title": "s1", "order_index": 1, "completed": True}, {"title": "s2", "order_index": 2}],
+        comments=[{"content": "c1"}],
+    )))
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["imported_tasks"], body["imported_subtasks"], body["imported_comments"]) == (1, 2, 1)
+    task = client.get(f"{API}/tasks/11111111-1111-4111-8111-111111111111").json()
+    assert (task["subtask_count"], task["completed_subtasks"], task["comment_count"]) == (2, 1, 1)
+
+
+def test_import_rejects_invalid_and_duplicate_records(client):
+    task_id = "22222222-2222-4222-8222-222222222222"
+    response = _import(client, _ndjson(
+        _record("ok", id=task_id),
+        "{not json",
+        {"title": "missing fields"},
+        _record("duplicate", id=task_id),
+    ))
+    body = response.json()
+    assert body["imported_tasks"] == 1
+    assert body["last_record"] == 4
+    assert [error["record"] for error in body["errors"]] == [2, 3, 4]
+
+
+def test_import_rejects_existing_task_ids(client, make_task):
+    existing = make_task()
+    body = _import(client, _ndjson(_record("again", id=existing["id"]), _record("new"))).json()
+    assert body["imported_tasks"] == 1
+    assert body["errors"] == [{"record": 1, "detail": f"Task {existing['id']} already exists"}]
+
+
+def test_import_resumes_after_skip(client):
+    content = _ndjson(*(_record(f"r{i}") for i in range(5)))
+    body = _import(client, content, skip=3, batch_size=1).json()
+    assert body["imported_tasks"] == 2
+    assert body["last_record"] == 5
+    titles = sorted(task["title"] for task in client.get(f"{API}/tasks/").json()["tasks"])
+    assert titles == ["r3", "r4"]
+
+
+def test_import_rejects_duplicate_child_ids(client):
+    sub_id, comment_id = "33333333-3333-4333-8333-333333333333", "44444444-4444-4444-8444-444444444444"
+    body = _import(client, _ndjson(
+        _record("first", subtasks=[{"id": sub_id, "title": "s", "order_index": 1}], comments=[{"id": comment_id, "content": "c"}]),
+        _record("same subtask", subtasks=[{"id": sub_id, "title": "s", "order_index": 1}]),
+        _record("same comment", comments=[{"id": comment_id, "content": "c"}]),
+        _record("twice in one record", subtasks=[
+            {"id": "55555555-5555-4555-8555-555555555555", "title": "a", "order_index": 1},
+            {"id": "55555555-5555-4555-8555-555555555555", "title": "b", "order_index": 2},
+        ]),
+    )).json()
+    assert (body["imported_tasks"], body["imported_subtasks"], body["imported_comments"]) == (1, 1, 1)
+    assert [error["record"] for error in body["errors"]] == [2, 3, 4]
+    assert body["errors"][0]["detail"] == f"Duplicate subtask id {sub_id}"
+
+
+def test_import_rejects_existing_child_ids(client, make_task):
+    task_id = make_task()["id"]
+    subtask_id = client.post(f"{API}/tasks/{task_id}/subtasks", json={"title": "s"}).json()["id"]
+    comment_id = client.post(f"{API}/tasks/{task_id}/comments", json={"content": "c"}).json()["id"]
+    response = _import(client, _ndjson(
+        _record("reuses subtask", subtasks=[{"id": subtask_id, "title": "s", "order_index": 1}]),
+        _record("ok", comments=[{"content": "fresh"}]),
+        _record("reuses comment", comments=[{"id": comment_id, "content": "c"}]),
+    ), batch_size=10)
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["imported_tasks"], body["imported_subtasks"], body["imported_comments"]) == (1, 0, 1)
+    assert body["errors"] == [
+        {"record": 1, "detail": f"Subtask {subtask_id} already exists"},
+        {"record": 3, "detail": f"Comment {comment_id} already exists"},
+    ]
+    assert body["last_record"] == 3
+    # 除外したレコードのタスクは作成されない
+    assert client.get(f"{API}/tasks/").json()["pagination"]["total"] == 2
+
+
+def test_copy_rows_fill_not_null_columns():
+    # PostgreSQLのCOPYは列の既定値を使わないため、NOT NULL列に \N を書かない
+    batch = prepare_batch([(1, _record(
+        "copied", subtasks=[{"title": "s1", "order_index": 1}], comments=[{"content": "c1"}],
+    ))])
+    assert not batch.errors
+    for model, rows in ((Task, batch.tasks), (SubTask, batch.subtasks), (TaskComment, batch.comments)):
+        columns = [column.key for column in model.__table__.columns]
+        not_null = [i for i, column in enumerate(model.__table__.columns) if not column.nullable]
+        for values in csv.reader(copy_buffer(columns, rows)):
+            assert [columns[i] for i in not_null if values[i] == "\\N"] == []
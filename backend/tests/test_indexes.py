@@ -0,0 +1,32 @@
+from types import SimpleNamespace
+
+import pytest
+
+from app.database.connection import engine
+from app.database.index_check import CHECKS, explain, run_checks
+from app.services.matrix import cell_tasks_statement
+
+
+def test_representative_queries_use_expected_indexes(client):
+    with engine.connect() as conn:
+        results = run_checks(conn)
+    failed = {result.check.name: result.plan for result in results if not result.ok}
+    assert not failed
+
+
+def test_keyset_checks_use_the_query_expression():
+    list_check = next(check for check in CHECKS if check.name.startswith("一覧"))
+    sql = str(list_check.build("sqlite").compile(compile_kwargs={"literal_binds": True}))
+    assert "julianday(tasks.created_at)" in sql
+
+
+def test_matrix_checks_use_the_served_statement():
+    matrix_checks = [check for check in CHECKS if check.name.startswith("マトリックス")]
+    built = {str(check.build("sqlite")) for check in matrix_checks}
+    assert built == {str(cell_tasks_statement()), str(cell_tasks_statement(limit_per_cell=20))}
+
+
+def test_unsupported_dialect_raises_value_error():
+    conn = SimpleNamespace(dialect=SimpleNamespace(name="mysql"))
+    with pytest.raises(ValueError):
+        explain(conn, CHECKS[0])
@@ -0,0 +1,54 @@
+from sqlalchemy import insert, update
+
+from app.database.connection import SessionLocal, engine
+from app.models.task import Task, TaskCategory, TaskPriority, TaskStatus, TaskUrgency
+from app.services.response_cache import response_cache
+from conftest import API
+
+
+def test_matrix_counts_match_cell_lists(client, make_task):
+    for _ in range(3):
+        make_task(priority="high", urgency="high")
+    make_task(priority="low", urgency="low")
+    done = make_task(priority="low", urgency="low")
+    client.put(f"{API}/tasks/{done['id']}", json={"status": "completed"})
+    # 集計キャッシュを読み込んだ後に別プロセスの書き込みを模擬する（キャッシュには反映されない）
+    client.get(f"{API}/tasks/matrix/summary")
+    with engine.begin() as conn:
+        conn.execute(insert(Task).values(
+            id="other-worker", title="x", category=TaskCategory.WORK,
+            priority=TaskPriority.MEDIUM, urgency=TaskUrgency.LOW,
+        ))
+
+    body = client.get(f"{API}/tasks/matrix").json()
+    assert body["summary"]["by_cell"] == {key: len(tasks) for key, tasks in body["matrix"].items()}
+    assert body["summary"]["total_tasks"] == 5
+    assert body["summary"]["by_quadrant"]["quadrant_4"] == 2
+
+
+def test_matrix_limit_per_cell_keeps_full_counts(client, make_task):
+    for _ in range(4):
+        make_task(priority="high", urgency="high")
+    body = client.get(f"{API}/tasks/matrix", params={"limit_per_cell": 2}).json()
+    assert len(body["matrix"]["high_high"]) == 2
+    assert body["summary"]["by_cell"]["high_high"] == 4
+    assert body["summary"]["by_cell"]["low_low"] == 0
+
+
+def test_matrix_summary_follows_writes_from_other_workers(client, make_task):
+    task = make_task(priority="high", urgency="high")
+    first = client.get(f"{API}/tasks/matrix/summary")
+    assert first.json()["total_tasks"] == 1
+
+    # 他ワーカーでの書き込み（このプロセスの集計キャッシュには差分が適用されない）
+    with SessionLocal() as db:
+        db.execute(update(Task).where(Task.id == task["id"]).values(status=TaskStatus.COMPLETED))
+        db.commit()
+    client.portal.call(response_cache.clear)
+
+    second = client.get(f"{API}/tasks/matrix/summary", headers={"If-None-Match": first.headers["etag"]})
+    assert second.status_code == 200
+    assert second.json()["total_tasks"] == 0
+    assert client.get(
+        f"{API}/tasks/matrix/summary", headers={"If-None-Match": second.headers["etag"]}
+    ).status_code == 304
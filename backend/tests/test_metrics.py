@@ -0,0 +1,81 @@
+import logging
+import re
+
+from app.database import instrumentation
+from app.database.instrumentation import QueryStats
+from app.middleware.metrics import Histogram, RequestMetrics
+from conftest import API, sql_statements
+
+DETAIL_ROUTE = f'method="GET",route="{API}/tasks/{{task_id}}"'
+
+
+def _sample(text, name, labels):
+    """Prometheusテキストから1系列の値を取得（未出力は0）"""
+    match = re.search(rf"^{re.escape(name)}{{{re.escape(labels)}}} (\S+)$", text, re.MULTILINE)
+    return float(match.group(1)) if match else 0.0
+
+
+def test_histogram_is_cumulative():
+    histogram = Histogram((1, 5))
+    for value in (0, 1, 3, 9):
+        histogram.observe(value)
+    assert histogram.cumulative() == [("1", 2), ("5", 3), ("+Inf", 4)]
+    assert (histogram.count, histogram.sum) == (4, 13)
+
+
+def test_prometheus_lines_escape_labels():
+    metrics = RequestMetrics()
+    metrics.observe("GET", '/a"b\\c', 200, 0.02, QueryStats(statements=3, db_seconds=0.5, rows=7))
+    text = "\n".join(metrics.prometheus_lines())
+    labels = 'method="GET",route="/a\\"b\\\\c"'
+    assert _sample(text, "http_requests_total", f'{labels},status="200"') == 1
+    assert _sample(text, "http_request_duration_seconds_bucket", f'{labels},le="0.025"') == 1
+    assert _sample(text, "http_request_duration_seconds_bucket", f'{labels},le="0.01"') == 0
+    assert _sample(text, "http_request_db_statements_bucket", f'{labels},le="3"') == 1
+    assert _sample(text, "http_request_db_statements_bucket", f'{labels},le="2"') == 0
+    assert _sample(text, "http_request_db_seconds_total", labels) == 0.5
+    assert _sample(text, "http_request_db_rows_total", labels) == 7
+
+
+def test_server_timing_reports_statements_and_rows(client, make_task):
+    for i in range(3):
+        make_task(title=f"t{i}")
+    response = client.get(f"{API}/tasks/")
+    app_timing, db_timing = response.headers["server-timing"].split(", ", 1)
+    assert re.fullmatch(r"app;dur=\d+\.\d", app_timing)
+    statements, rows = map(int, re.fullmatch(r'db;dur=\d+\.\d;desc="(\d+) queries, (\d+) rows"', db_timing).groups())
+    assert statements == sql_statements(response) >= 1
+    assert rows >= 3
+
+
+def test_metrics_group_requests_by_route_template(client, make_task):
+    before = client.get("/metrics").text
+    task_id = make_task()["id"]
+    client.get(f"{API}/tasks/{task_id}")
+    client.get(f"{API}/tasks/missing")
+    client.get("/no-such-path")
+    response = client.get("/metrics")
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = response.text
+    for status in ("200", "404"):
+        series = f'{DETAIL_ROUTE},status="{status}"'
+        assert _sample(text, "http_requests_total", series) == _sample(before, "http_requests_total", series) + 1
+    assert task_id not in text
+    unmatched = 'method="GET",route="unmatched",status="404"'
+    assert _sample(text, "http_requests_total", unmatched) == _sample(before, "http_requests_total", unmatched) + 1
+    assert _sample(text, "http_request_db_statements_count", DETAIL_ROUTE) >= 2
+    assert 'response_cache_hits_total{backend="memory"}' in text
+
+    routes = client.get("/metrics/requests").json()["routes"]
+    assert routes[f"GET {API}/tasks/{{task_id}}"]["statements_avg"] > 0
+
+
+def test_slow_queries_are_logged_with_the_route(client, make_task, monkeypatch, caplog):
+    make_task()
+    monkeypatch.setattr(instrumentation, "SLOW_QUERY_THRESHOLD", 1e-9)
+    with caplog.at_level(logging.WARNING, logger="app.slow_query"):
+        client.get(f"{API}/tasks/", params={"limit": 7})
+    messages = [record.getMessage() for record in caplog.records if record.name == "app.slow_query"]
+    assert messages
+    assert all(f"route={API}/tasks/" in message for message in messages)
+    assert any("FROM tasks" in message for message in messages)
@@ -0,0 +1,73 @@
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from app.database.pool import POOL_DEFAULTS, PoolMetrics, engine_options, pool_settings, pool_status
+from conftest import API
+
+
+def test_pool_settings_defaults_and_env(monkeypatch):
+    assert pool_settings("postgresql+asyncpg://db/tasks") == POOL_DEFAULTS["postgresql"]
+    assert pool_settings("sqlite:///tasks.db") == POOL_DEFAULTS["sqlite"]
+    monkeypatch.setenv("DB_POOL_SIZE", "3")
+    monkeypatch.setenv("DB_POOL_TIMEOUT", "2.5")
+    monkeypatch.setenv("DB_POOL_PRE_PING", "off")
+    monkeypatch.setenv("DB_MAX_OVERFLOW", "")
+    settings = pool_settings("postgresql://db/tasks")
+    assert settings["pool_size"] == 3
+    assert settings["pool_timeout"] == 2.5
+    assert settings["pool_pre_ping"] is False
+    assert settings["max_overflow"] == POOL_DEFAULTS["postgresql"]["max_overflow"]
+
+
+def test_engine_options_give_each_pool_its_own_metrics():
+    assert engine_options("sqlite://") == {}
+    assert engine_options("sqlite:///:memory:") == {}
+    first = engine_options("sqlite:///a.db")["poolclass"]
+    second = engine_options("sqlite:///a.db")["poolclass"]
+    assert first.metrics is not second.metrics
+
+
+def test_pool_metrics_snapshot_is_cumulative():
+    metrics = PoolMetrics()
+    for seconds in (0.0005, 0.003, 0.003, 60):
+        metrics.observe(seconds)
+    metrics.timeout()
+    snapshot = metrics.snapshot()
+    assert snapshot["buckets"]["0.001"] == 1
+    assert snapshot["buckets"]["0.005"] == 3
+    assert snapshot["buckets"]["30.0"] == 3
+    assert snapshot["buckets"]["+Inf"] == snapshot["count"] == 4
+    assert snapshot["timeouts"] == 1
+
+
+def test_pool_timeout_is_counted(tmp_path):
+    url = f"sqlite:///{tmp_path / 'pool.db'}"
+    options = {**engine_options(url), "pool_size": 1, "max_overflow": 0, "pool_timeout": 0.01}
+    engine = create_engine(url, **options)
+    try:
+        with engine.connect():
+            with pytest.raises(PoolTimeoutError):
+                engine.connect()
+            status = pool_status(engine)
+            assert status["checked_out"] == 1
+            assert status["size"] == 1
+        status = pool_status(engine)
+        assert status["checked_out"] == 0
+        assert status["wait_seconds"]["count"] == 1
+        assert status["wait_seconds"]["timeouts"] == 1
+    finally:
+        engine.dispose()
+
+
+def test_pool_metrics_endpoint(client, make_task):
+    make_task()
+    pools = client.get("/metrics/pool").json()["pools"]
+    assert set(pools) == {"api", "sync"}
+    api = pools["api"]
+    assert api["checked_out"] == 0
+    assert api["size"] == POOL_DEFAULTS["sqlite"]["pool_size"]
+    assert api["wait_seconds"]["count"] > 0
+    text = client.get("/metrics").text
+    assert 'db_pool_size{pool="api"}' in text
+    assert 'db_pool_wait_seconds_count{pool="sync"}' in text
@@ -0,0 +1,71 @@
+import time
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from starlette.requests import Request
+
+from app.database.replicas import READ_YOUR_WRITES_COOKIE, READ_YOUR_WRITES_HEADER, ReplicaRouter
+from app.middleware.read_your_writes import ReadYourWritesMiddleware
+
+
+def _request(headers=None):
+    raw = [(name.lower().encode(), value.encode()) for name, value in (headers or {}).items()]
+    return Request({"type": "http", "method": "GET", "path": "/", "headers": raw, "query_string": b""})
+
+
+@pytest.fixture
+def router(tmp_path):
+    router = ReplicaRouter([f"sqlite:///{tmp_path / 'replica.db'}"], max_lag=5, check_interval=5)
+    replica = router.replicas[0]
+    replica.healthy, replica.lag, replica.checked_at = True, 0.0, time.monotonic()
+    return router
+
+
+def test_reads_go_to_eligible_replica(router):
+    assert router.choose(_request()) is router.replicas[0]
+    assert router.reads["replica"] == 1
+
+
+def test_read_your_writes_deadline_routes_to_primary(router):
+    future = f"{time.time() + 60:.3f}"
+    assert router.choose(_request({READ_YOUR_WRITES_HEADER: future})) is None
+    assert router.choose(_request({"Cookie": f"{READ_YOUR_WRITES_COOKIE}={future}"})) is None
+    assert router.reads["read_your_writes"] == 2
+    # 期限切れ・不正な値はレプリカへ
+    assert router.choose(_request({READ_YOUR_WRITES_HEADER: f"{time.time() - 1:.3f}"})) is router.replicas[0]
+    assert router.choose(_request({READ_YOUR_WRITES_HEADER: "soon"})) is router.replicas[0]
+
+
+def test_lagging_or_stale_replica_is_skipped(router):
+    replica = router.replicas[0]
+    replica.lag = router.max_lag + 1
+    assert router.choose(_request()) is None
+    replica.lag, replica.checked_at = 0.0, time.monotonic() - router.max_age - 1
+    assert router.choose(_request()) is None
+    assert router.reads["no_eligible_replica"] == 2
+
+
+def test_successful_writes_return_deadline(router):
+    app = FastAPI()
+    app.add_middleware(ReadYourWritesMiddleware, router=router)
+
+    @app.post("/items")
+    def create():
+        return {}
+
+    @app.post("/fail")
+    def fail():
+        raise HTTPException(400)
+
+    @app.get("/items")
+    def read():
+        return {}
+
+    with TestClient(app) as client:
+        written = client.post("/items")
+        deadline = float(written.headers[READ_YOUR_WRITES_HEADER])
+        assert time.time() < deadline <= time.time() + router.deadline_seconds + 1
+        assert READ_YOUR_WRITES_COOKIE in written.headers["set-cookie"]
+        assert READ_YOUR_WRITES_HEADER not in client.post("/fail").headers
+        assert READ_YOUR_WRITES_HEADER not in client.get("/items").headers
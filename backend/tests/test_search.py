@@ -0,0 +1,29 @@
+from sqlalchemy import text
+
+from app.database.connection import engine
+from conftest import API
+
+
+def _search(client, q):
+    response = client.get(f"{API}/tasks/search", params={"q": q})
+    assert response.status_code == 200, response.text
+    return [task["id"] for task in response.json()["tasks"]]
+
+
+def test_search_matches_title_and_comments(client, make_task):
+    task = make_task(title="quarterly report")
+    make_task(title="groceries")
+    client.post(f"{API}/tasks/{task['id']}/comments", json={"content": "needs budget table"})
+    assert _search(client, "report") == [task["id"]]
+    assert _search(client, "budget") == [task["id"]]
+
+
+def test_search_survives_rowid_renumbering(client, make_task):
+    make_task(title="first entry")
+    third = make_task(title="third entry")
+    # VACUUM・ダンプからの復元などで tasks の rowid が振り直された状態
+    with engine.begin() as conn:
+        conn.execute(text("UPDATE tasks SET rowid = -rowid"))
+    assert _search(client, "third") == [third["id"]]
+    client.put(f"{API}/tasks/{third['id']}", json={"title": "renamed entry"})
+    assert _search(client, "renamed") == [third["id"]]
@@ -0,0 +1,152 @@
+import pytest
+from sqlalchemy import update
+
+from app.database.connection import engine
+from app.models.subtask import SubTask
+from app.services.subtask_order import ORDER_GAP, key_between
+from conftest import API
+
+
+@pytest.fixture
+def subtasks(client, make_task):
+    """5件のサブタスクを持つタスクの (task_id, [subtask_id, ...])"""
+    task_id = make_task()["id"]
+    ids = [client.post(f"{API}/tasks/{task_id}/subtasks", json={"title": f"s{i}"}).json()["id"] for i in range(5)]
+    return task_id, ids
+
+
+def _titles(client, task_id):
+    return [subtask["title"] for subtask in client.get(f"{API}/tasks/{task_id}/subtasks").json()["subtasks"]]
+
+
+def test_key_between():
+    assert key_between(None, None) == ORDER_GAP
+    assert key_between(1024, None) == 2048
+    assert key_between(None, 1024) == 0
+    assert key_between(1024, 2048) == 1536
+    assert key_between(5, 6) is None
+
+
+def test_appended_subtasks_get_sparse_keys(client, subtasks):
+    task_id, _ = subtasks
+    keys = [subtask["order_index"] for subtask in client.get(f"{API}/tasks/{task_id}/subtasks").json()["subtasks"]]
+    assert keys == [ORDER_GAP * (i + 1) for i in range(5)]
+
+
+def test_move_updates_only_the_moved_row(client, subtasks):
+    task_id, ids = subtasks
+    response = client.post(f"{API}/subtasks/{ids[4]}/move", json={"after_id": ids[0]})
+    assert response.status_code == 200
+    assert response.json()["order_index"] == ORDER_GAP + ORDER_GAP // 2
+    assert _titles(client, task_id) == ["s0", "s4", "s1", "s2", "s3"]
+    keys = {s["id"]: s["order_index"] for s in client.get(f"{API}/tasks/{task_id}/subtasks").json()["subtasks"]}
+    assert [keys[subtask_id] for subtask_id in ids[:4]] == [ORDER_GAP * (i + 1) for i in range(4)]
+
+    client.post(f"{API}/subtasks/{ids[0]}/move", json={})
+    assert _titles(client, task_id) == ["s4", "s1", "s2", "s3", "s0"]
+    client.post(f"{API}/subtasks/{ids[0]}/move", json={"before_id": ids[4]})
+    assert _titles(client, task_id) == ["s0", "s4", "s1", "s2", "s3"]
+
+
+def test_move_rebalances_dense_keys(client, subtasks):
+    task_id, ids = subtasks
+    with engine.begin() as conn:
+        for position, subtask_id in enumerate(ids):
+            conn.execute(update(SubTask).where(SubTask.id == subtask_id).values(order_index=position))
+    assert client.post(f"{API}/subtasks/{ids[4]}/move", json={"after_id": ids[0]}).status_code == 200
+    assert _titles(client, task_id) == ["s0", "s4", "s1", "s2", "s3"]
+
+
+def test_move_after_rebalance_when_new_key_equals_loaded_key(client, make_task):
+    task_id = make_task()["id"]
+    ids = [client.post(f"{API}/tasks/{task_id}/subtasks", json={"title": f"s{i}"}).json()["id"] for i in range(3)]
+    # 振り直し後の移動先キー（2件目と3件目の中間 = 1536）が移動前の値と同じになる
+    with engine.begin() as conn:
+        for subtask_id, key in zip(ids, (1000, 1001, ORDER_GAP + ORDER_GAP // 2)):
+            conn.execute(update(SubTask).where(SubTask.id == subtask_id).values(order_index=key))
+    response = client.post(f"{API}/subtasks/{ids[2]}/move", json={"after_id": ids[0]})
+    assert response.status_code == 200
+    assert _titles(client, task_id) == ["s0", "s2", "s1"]
+    keys = [subtask["order_index"] for subtask in client.get(f"{API}/tasks/{task_id}/subtasks").json()["subtasks"]]
+    assert response.json()["order_index"] == keys[1]
+
+
+def test_repeated_moves_into_one_gap_keep_order(client, subtasks):
+    task_id, ids = subtasks
+    # 毎回同じ隙間に移動し、隙間がなくなっても振り直して順序を保つ
+    for _ in range(12):
+        client.post(f"{API}/subtasks/{ids[3]}/move", json={"before_id": ids[4]})
+        client.post(f"{API}/subtasks/{ids[4]}/move", json={"before_id": ids[3]})
+    assert _titles(client, task_id) == ["s0", "s1", "s2", "s4", "s3"]
+
+
+@pytest.mark.parametrize("body", [
+    {"after_id": "self"},
+    {"after_id": "other", "before_id": "other"},
+    {"after_id": "missing"},
+])
+def test_invalid_moves_return_400(client, subtasks, body):
+    _, ids = subtasks
+    replace = {"self": ids[1], "other": ids[0], "missing": "missing"}
+    body = {key: replace[value] for key, value in body.items()}
+    assert client.post(f"{API}/subtasks/{ids[1]}/move", json=body).status_code == 400
+
+
+def test_reorder_applies_permutation(client, subtasks):
+    task_id, ids = subtasks
+    response = client.put(f"{API}/tasks/{task_id}/subtasks/order", json={"ids": ids[::-1]})
+    assert response.json() == {"task_id": task_id, "reordered": 5}
+    assert _titles(client, task_id) == ["s4", "s3", "s2", "s1", "s0"]
+
+
+def test_reorder_rejects_partial_or_duplicate_lists(client, subtasks):
+    task_id, ids = subtasks
+    url = f"{API}/tasks/{task_id}/subtasks/order"
+    assert client.put(url, json={"ids": ids[:3]}).status_code == 400
+    assert client.put(url, json={"ids": ids + ids[:1]}).status_code == 400
+    assert client.put(f"{API}/tasks/missing/subtasks/order", json={"ids": []}).status_code == 404
+
+
+def test_subtask_pages(client, subtasks):
+    task_id, ids = subtasks
+    first = client.get(f"{API}/tasks/{task_id}/subtasks", params={"limit": 2}).json()
+    assert [s["id"] for s in first["subtasks"]] == ids[:2]
+    assert first["pagination"]["total"] == 5
+    assert first["pagination"]["prev_cursor"] is None
+    second = client.get(f"{API}/tasks/{task_id}/subtasks", params={
+        "limit": 2, "after": first["pagination"]["next_cursor"]
+    }).json()
+    assert [s["id"] for s in second["subtasks"]] == ids[2:4]
+    back = client.get(f"{API}/tasks/{task_id}/subtasks", params={
+        "limit": 2, "before": second["pagination"]["prev_cursor"]
+    }).json()
+    assert [s["id"] for s in back["subtasks"]] == ids[:2]
+
+
+def test_comment_pages_newest_first(client, make_task):
+    task_id = make_task()["id"]
+    # 同じ秒に作成されたコメントも id 順で重複・欠落なくたどれる
+    created = {client.post(f"{API}/tasks/{task_id}/comments", json={"content": f"c{i}"}).json()["id"] for i in range(7)}
+    seen, after = [], None
+    while True:
+        body = client.get(f"{API}/tasks/{task_id}/comments", params={
+            "limit": 3, **({"after": after} if after else {})
+        }).json()
+        seen += [comment["id"] for comment in body["comments"]]
+        assert body["pagination"]["total"] == 7
+        after = body["pagination"]["next_cursor"]
+        if not after:
+            break
+    assert len(seen) == 7 and set(seen) == created
+    full = client.get(f"{API}/tasks/{task_id}/comments", params={"limit": 100}).json()["comments"]
+    assert [comment["id"] for comment in full] == seen
+
+
+def test_child_list_cursor_errors(client, subtasks):
+    task_id, _ = subtasks
+    cursor = client.get(f"{API}/tasks/{task_id}/subtasks", params={"limit": 1}).json()["pagination"]["next_cursor"]
+    assert client.get(f"{API}/tasks/{task_id}/subtasks", params={"after": "garbage"}).status_code == 400
+    assert client.get(f"{API}/tasks/{task_id}/subtasks", params={"after": cursor, "before": cursor}).status_code == 400
+    # サブタスクのカーソルはコメントに使えない
+    assert client.get(f"{API}/tasks/{task_id}/comments", params={"after": cursor}).status_code == 400
+    assert client.get(f"{API}/tasks/missing/comments").status_code == 404
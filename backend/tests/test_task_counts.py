@@ -0,0 +1,50 @@
+from sqlalchemy import update
+
+from app.database.connection import SessionLocal, engine
+from app.models.task import Task
+from app.services.task_counts import repair_counts
+from conftest import API
+
+
+def _counts(client, task_id):
+    task = client.get(f"{API}/tasks/{task_id}", params={"include": ""}).json()
+    return task["subtask_count"], task["completed_subtasks"], task["comment_count"]
+
+
+def test_counts_follow_subtask_and_comment_writes(client, make_task):
+    task_id = make_task()["id"]
+    first = client.post(f"{API}/tasks/{task_id}/subtasks", json={"title": "a"}).json()
+    second = client.post(f"{API}/tasks/{task_id}/subtasks", json={"title": "b"}).json()
+    client.put(f"{API}/subtasks/{second['id']}", json={"completed": True})
+    comment = client.post(f"{API}/tasks/{task_id}/comments", json={"content": "c"}).json()
+    assert _counts(client, task_id) == (2, 1, 1)
+
+    client.put(f"{API}/subtasks/{first['id']}", json={"completed": True})
+    assert _counts(client, task_id) == (2, 2, 1)
+    client.put(f"{API}/subtasks/{first['id']}", json={"completed": False})
+    assert _counts(client, task_id) == (2, 1, 1)
+
+    client.delete(f"{API}/subtasks/{first['id']}")
+    client.delete(f"{API}/comments/{comment['id']}")
+    assert _counts(client, task_id) == (1, 1, 0)
+
+
+def test_counts_do_not_touch_updated_at(client, make_task):
+    task = make_task()
+    client.post(f"{API}/tasks/{task['id']}/comments", json={"content": "c"})
+    detail = client.get(f"{API}/tasks/{task['id']}", params={"include": ""}).json()
+    assert detail["updated_at"] == task["updated_at"]
+
+
+def test_repair_counts_fixes_drift(client, make_task):
+    task_id = make_task()["id"]
+    client.post(f"{API}/tasks/{task_id}/subtasks", json={"title": "a"})
+    make_task()
+    with engine.begin() as conn:
+        conn.execute(update(Task).where(Task.id == task_id).values(subtask_count=9, comment_count=4))
+    db = SessionLocal()
+    try:
+        assert repair_counts(db, batch_size=1) == (2, 1)
+    finally:
+        db.close()
+    assert _counts(client, task_id) == (1, 0, 0)
@@ -0,0 +1,57 @@
+from conftest import API, sql_statements
+
+
+def _detail(client, task_id, **params):
+    response = client.get(f"{API}/tasks/{task_id}", params=params)
+    assert response.status_code == 200, response.text
+    return response
+
+
+def test_fields_and_include_limit_the_payload(client, make_task):
+    task_id = make_task(title="detail", notes="memo")["id"]
+    client.post(f"{API}/tasks/{task_id}/subtasks", json={"title": "s"})
+    body = _detail(client, task_id, fields="title", include="").json()
+    assert body == {"id": task_id, "title": "detail", "subtask_count": 1, "completed_subtasks": 0, "comment_count": 0}
+    body = _detail(client, task_id, fields="notes,id", include="subtasks").json()
+    assert body["notes"] == "memo" and "title" not in body
+    assert [subtask["title"] for subtask in body["subtasks"]] == ["s"]
+    assert "comments" not in body and "comments_page" not in body
+
+
+def test_statement_count_does_not_depend_on_children(client, make_task):
+    task_id = make_task()["id"]
+    client.post(f"{API}/tasks/{task_id}/subtasks", json={"title": "s"})
+    baseline = sql_statements(_detail(client, task_id))
+    assert sql_statements(_detail(client, task_id, include="")) == baseline - 2
+    for i in range(10):
+        client.post(f"{API}/tasks/{task_id}/subtasks", json={"title": f"s{i}"})
+        client.post(f"{API}/tasks/{task_id}/comments", json={"content": f"c{i}"})
+    assert sql_statements(_detail(client, task_id)) == baseline
+
+
+def test_embedded_pages(client, make_task):
+    task_id = make_task()["id"]
+    subtasks = [client.post(f"{API}/tasks/{task_id}/subtasks", json={"title": f"s{i}"}).json()["id"] for i in range(5)]
+    comments = [client.post(f"{API}/tasks/{task_id}/comments", json={"content": f"c{i}"}).json()["id"] for i in range(3)]
+    body = _detail(client, task_id, subtask_limit=2, subtask_offset=2, comment_limit=2).json()
+    assert [subtask["id"] for subtask in body["subtasks"]] == subtasks[2:4]
+    assert body["subtasks_page"] == {"limit": 2, "offset": 2, "total": 5, "has_more": True}
+    assert len(body["comments"]) == 2
+    assert body["comments_page"] == {"limit": 2, "offset": 0, "total": 3, "has_more": True}
+    last = _detail(client, task_id, subtask_offset=4, comment_offset=2).json()
+    assert [subtask["id"] for subtask in last["subtasks"]] == subtasks[4:]
+    assert last["subtasks_page"]["has_more"] is False
+    assert len(last["comments"]) == 1 and last["comments_page"]["has_more"] is False
+    assert {comment["id"] for comment in body["comments"] + last["comments"]} == set(comments)
+
+
+def test_invalid_detail_parameters(client, make_task):
+    task_id = make_task()["id"]
+    url = f"{API}/tasks/{task_id}"
+    assert client.get(url, params={"fields": "bogus"}).status_code == 400
+    # 集計値は常に返すため fields= には指定できない
+    assert client.get(url, params={"fields": "comment_count"}).status_code == 400
+    assert client.get(url, params={"include": "subtasks,history"}).status_code == 400
+    for params in ({"subtask_limit": 0}, {"subtask_limit": 501}, {"comment_limit": 101}, {"comment_offset": -1}):
+        assert client.get(url, params=params).status_code == 422
+    assert client.get(f"{API}/tasks/missing", params={"fields": "title"}).status_code == 404
@@ -0,0 +1,99 @@
+from conftest import API, sql_statements
+
+
+def test_list_statement_count_does_not_grow_with_rows(client, make_task):
+    make_task()
+    baseline = sql_statements(client.get(f"{API}/tasks/"))
+    for i in range(5):
+        task_id = make_task(title=f"t{i}")["id"]
+        client.post(f"{API}/tasks/{task_id}/subtasks", json={"title": "s"})
+        client.post(f"{API}/tasks/{task_id}/comments", json={"content": "c"})
+    response = client.get(f"{API}/tasks/")
+    tasks = response.json()["tasks"]
+    assert len(tasks) == 6
+    assert sum(task["subtask_count"] for task in tasks) == sum(task["comment_count"] for task in tasks) == 5
+    assert sql_statements(response) == baseline
+
+
+def _walk(client, params, cursor_key="next_cursor"):
+    """カーソルをたどって全ページのidを取得"""
+    ids, cursor = [], None
+    while True:
+        query = {**params, **({"cursor": cursor} if cursor else {})}
+        response = client.get(f"{API}/tasks/", params=query)
+        assert response.status_code == 200, response.text
+        body = response.json()
+        ids.extend(task["id"] for task in body["tasks"])
+        cursor = body["pagination"][cursor_key]
+        if not cursor:
+            return ids, body
+
+
+def test_cursor_paging_visits_every_task_once(client, make_task):
+    created = [make_task(title=f"t{i:02d}")["id"] for i in range(12)]
+    ids, last = _walk(client, {"paging": "cursor", "limit": 5, "sort_by": "title", "sort_order": "asc"})
+    assert ids == created
+    assert last["pagination"]["total"] == 12
+
+    # 最終ページから前へたどると逆順に同じ並びになる
+    previous, cursor = [], last["pagination"]["prev_cursor"]
+    while cursor:
+        body = client.get(f"{API}/tasks/", params={
+            "cursor": cursor, "limit": 5, "sort_by": "title", "sort_order": "asc"
+        }).json()
+        previous = [task["id"] for task in body["tasks"]] + previous
+        cursor = body["pagination"]["prev_cursor"]
+    assert previous + [task["id"] for task in last["tasks"]] == created
+
+
+def test_cursor_paging_with_same_created_at_uses_id_tiebreak(client):
+    # 一括作成は同じ created_at になる
+    response = client.post(f"{API}/tasks/bulk", json={"tasks": [
+        {"title": f"b{i}", "category": "work", "priority": "low", "urgency": "low"} for i in range(7)
+    ]})
+    assert response.status_code == 200
+    ids, _ = _walk(client, {"paging": "cursor", "limit": 3})
+    assert sorted(ids) == sorted(task["id"] for task in response.json()["succeeded"])
+    assert len(ids) == len(set(ids))
+
+
+def test_cursor_paging_without_total(client, make_task):
+    make_task()
+    body = client.get(f"{API}/tasks/", params={"paging": "cursor", "include_total": "false"}).json()
+    assert body["pagination"]["total"] is None
+    assert len(body["tasks"]) == 1
+
+
+def test_invalid_cursor_returns_400(client, make_task):
+    make_task()
+    assert client.get(f"{API}/tasks/", params={"cursor": "not-a-cursor"}).status_code == 400
+
+
+def test_cursor_for_other_sort_returns_400(client, make_task):
+    for i in range(3):
+        make_task(title=f"t{i}")
+    cursor = client.get(f"{API}/tasks/", params={
+        "paging": "cursor", "limit": 1, "sort_by": "title"
+    }).json()["pagination"]["next_cursor"]
+    response = client.get(f"{API}/tasks/", params={"cursor": cursor, "sort_by": "created_at"})
+    assert response.status_code == 400
+
+
+def test_unsupported_cursor_sort_returns_400(client, make_task):
+    make_task()
+    response = client.get(f"{API}/tasks/", params={"paging": "cursor", "sort_by": "due_date"})
+    assert response.status_code == 400
+
+
+def test_unknown_sort_by_returns_400(client, make_task):
+    make_task()
+    for paging in ("offset", "cursor"):
+        response = client.get(f"{API}/tasks/", params={"paging": paging, "sort_by": "bogus"})
+        assert response.status_code == 400, paging
+
+
+def test_fields_projection_and_columns_layout(client, make_task):
+    task = make_task(title="projected")
+    body = client.get(f"{API}/tasks/", params={"fields": "title,comment_count", "layout": "columns"}).json()
+    assert body["tasks"] == {"id": [task["id"]], "title": ["projected"], "comment_count": [0]}
+    assert client.get(f"{API}/tasks/", params={"fields": "bogus"}).status_code == 400
@@ -3,7 +3,7 @@ import {
   Typography, Box, Alert, CircularProgress, 
   Card, CardContent, Grid
 } from '@mui/material';
-import { taskAPI } from '../services/api';
+import { taskAPI, subscribeChanges } from '../services/api';
 import MatrixGrid from '../components/MatrixGrid';
 
 function MatrixView() {
@@ -11,9 +11,11 @@ function MatrixView() {
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
 
-  const fetchMatrixData = async () => {
+  const fetchMatrixData = async ({ silent = false } = {}) => {
     try {
-      setLoading(true);
+      if (!silent) {
+        setLoading(true);
+      }
       const response = await taskAPI.getMatrixData();
       setMatrixData(response.data);
       setError(null);
@@ -29,6 +31,22 @@ function MatrixView() {
     fetchMatrixData();
   }, []);
 
+  // タスクの変更通知を受けたら再取得（短時間の連続した変更はまとめる）
+  useEffect(() => {
+    let timer = null;
+    const unsubscribe = subscribeChanges((event) => {
+      if (event && event.entity !== 'task') {
+        return;
+      }
+      clearTimeout(timer);
+      timer = setTimeout(() => fetchMatrixData({ silent: true }), 300);
+    });
+    return () => {
+      clearTimeout(timer);
+      unsubscribe();
+    };
+  }, []);
+
   if (loading) {
     return (
       <Box display="flex" justifyContent="center" mt={4}>
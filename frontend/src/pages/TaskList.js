@@ -1,13 +1,20 @@
 import React, { useState, useEffect, useCallback } from 'react';
 import { 
   Typography, Box, Button, TextField, MenuItem, 
-  FormControl, InputLabel, Select, Pagination,
+  FormControl, InputLabel, Select,
   Alert, CircularProgress, InputAdornment, IconButton
 } from '@mui/material';
 import { Add, Search } from '@mui/icons-material';
 import { taskAPI } from '../services/api';
 import TaskCard from '../components/TaskCard';
 
+const PAGE_SIZE = 10;
+// TaskCardで表示する項目のみ取得する（メモ・実績などは詳細画面で取得）
+const CARD_FIELDS = [
+  'id', 'title', 'description', 'category', 'priority', 'urgency', 'status', 'progress',
+  'due_date', 'subtask_count', 'completed_subtasks', 'comment_count',
+].join(',');
+
 function TaskList() {
   const [tasks, setTasks] = useState([]);
   const [loading, setLoading] = useState(true);
@@ -20,38 +27,40 @@ function TaskList() {
     search: ''
   });
   const [searchInput, setSearchInput] = useState('');
-  const [pagination, setPagination] = useState({
-    page: 1,
-    limit: 10,
-    total: 0,
-    total_pages: 0
-  });
+  // カーソルページング（OFFSETと総件数の集計を行わない）
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
 
-  const fetchTasks = useCallback(async () => {
+  const fetchTasks = useCallback(async (cursor = null) => {
     try {
-      setLoading(true);
+      if (cursor) {
+        setLoadingMore(true);
+      } else {
+        setLoading(true);
+      }
       const params = {
-        page: pagination.page,
-        limit: pagination.limit,
+        paging: 'cursor',
+        fields: CARD_FIELDS,
+        include_total: false,
+        limit: PAGE_SIZE,
+        ...(cursor ? { cursor } : {}),
         ...Object.fromEntries(
           Object.entries(filters).filter(([_, value]) => value !== '')
         )
       };
       
       const response = await taskAPI.getTasks(params);
-      setTasks(response.data.tasks);
-      setPagination(prev => ({
-        ...prev,
-        ...response.data.pagination
-      }));
+      setTasks(prev => (cursor ? [...prev, ...response.data.tasks] : response.data.tasks));
+      setNextCursor(response.data.pagination.next_cursor);
       setError(null);
     } catch (err) {
       setError('タスクの取得に失敗しました');
       console.error('Error fetching tasks:', err);
     } finally {
       setLoading(false);
+      setLoadingMore(false);
     }
-  }, [pagination.page, filters]);
+  }, [filters]);
 
   useEffect(() => {
     fetchTasks();
@@ -59,12 +68,10 @@ function TaskList() {
 
   const handleFilterChange = (field, value) => {
     setFilters(prev => ({ ...prev, [field]: value }));
-    setPagination(prev => ({ ...prev, page: 1 }));
   };
 
   const handleSearchSubmit = () => {
     setFilters(prev => ({ ...prev, search: searchInput }));
-    setPagination(prev => ({ ...prev, page: 1 }));
   };
 
   const handleSearchKeyPress = (e) => {
@@ -73,8 +80,8 @@ function TaskList() {
     }
   };
 
-  const handlePageChange = (event, page) => {
-    setPagination(prev => ({ ...prev, page }));
+  const handleLoadMore = () => {
+    fetchTasks(nextCursor);
   };
 
   const handleTaskClick = (taskId) => {
@@ -224,15 +231,16 @@ function TaskList() {
             />
           ))}
           
-          {/* ページネーション */}
-          {pagination.total_pages > 1 && (
+          {/* 追加読み込み */}
+          {nextCursor && (
             <Box display="flex" justifyContent="center" mt={3}>
-              <Pagination
-                count={pagination.total_pages}
-                page={pagination.page}
-                onChange={handlePageChange}
-                color="primary"
-              />
+              <Button
+                variant="outlined"
+                onClick={handleLoadMore}
+                disabled={loadingMore}
+              >
+                {loadingMore ? <CircularProgress size={20} /> : 'さらに表示'}
+              </Button>
             </Box>
           )}
         </>
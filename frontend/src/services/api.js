@@ -10,9 +10,88 @@ const apiClient = axios.create({
   },
 });
 
+// read-your-writes
+// 書き込みの応答の X-Primary-Until（UNIX時刻）を保持し、期限までのリクエストに付けて送り返す。
+// 期限内の読み取りはプライマリから行われ、直前の書き込みが必ず反映される
+// （クッキーはクロスオリジンのため送られない）。
+const PRIMARY_UNTIL_HEADER = 'X-Primary-Until';
+let primaryUntil = 0;
+
+apiClient.interceptors.request.use((config) => {
+  if (primaryUntil > Date.now() / 1000) {
+    config.headers[PRIMARY_UNTIL_HEADER] = primaryUntil.toFixed(3);
+  }
+  return config;
+});
+
+const rememberPrimaryUntil = (response) => {
+  const value = parseFloat(response.headers['x-primary-until']);
+  if (!Number.isNaN(value) && value > primaryUntil) {
+    primaryUntil = value;
+  }
+};
+
+// 条件付きGET（ETag）
+// GETのレスポンスを検証子とともに保持し、次回は If-None-Match / If-Modified-Since を送る。
+// 304 Not Modified の場合は保持しているデータを返す。
+const MAX_VALIDATOR_ENTRIES = 100;
+const validatorCache = new Map();
+
+const isGet = (config) => (config.method || 'get').toLowerCase() === 'get';
+const cacheKey = (config) => apiClient.getUri(config);
+
+apiClient.interceptors.request.use((config) => {
+  if (isGet(config)) {
+    const cached = validatorCache.get(cacheKey(config));
+    if (cached) {
+      config.headers['If-None-Match'] = cached.etag;
+      if (cached.lastModified) {
+        config.headers['If-Modified-Since'] = cached.lastModified;
+      }
+    }
+    config.validateStatus = (status) => (status >= 200 && status < 300) || status === 304;
+  }
+  return config;
+});
+
+const rememberResponse = (response) => {
+  const key = cacheKey(response.config);
+  if (response.status === 304) {
+    const cached = validatorCache.get(key);
+    if (!cached) {
+      // 保持データが無い場合は検証子を付けずに取り直す
+      const headers = { ...response.config.headers };
+      delete headers['If-None-Match'];
+      delete headers['If-Modified-Since'];
+      return apiClient.request({ ...response.config, headers });
+    }
+    // 最近使ったものを末尾に移動
+    validatorCache.delete(key);
+    validatorCache.set(key, cached);
+    return { ...response, status: 200, data: cached.data };
+  }
+
+  const etag = response.headers.etag;
+  if (etag) {
+    validatorCache.delete(key);
+    validatorCache.set(key, {
+      etag,
+      lastModified: response.headers['last-modified'],
+      data: response.data,
+    });
+    if (validatorCache.size > MAX_VALIDATOR_ENTRIES) {
+      validatorCache.delete(validatorCache.keys().next().value);
+    }
+  }
+  return response;
+};
+
 // レスポンスインターセプター（エラーハンドリング）
 apiClient.interceptors.response.use(
-  (response) => response,
+  (response) => {
+    rememberPrimaryUntil(response);
+    return isGet(response.config) ? rememberResponse(response) : response;
+  },
   (error) => {
     console.error('API Error:', error);
     return Promise.reject(error);
@@ -24,8 +103,8 @@ export const taskAPI = {
   // タスク一覧取得
   getTasks: (params = {}) => apiClient.get('/tasks', { params }),
   
-  // タスク詳細取得
-  getTask: (id) => apiClient.get(`/tasks/${id}`),
+  // タスク詳細取得（params: fields, include, comment_limit など）
+  getTask: (id, params = {}) => apiClient.get(`/tasks/${id}`, { params }),
   
   // タスク作成
   createTask: (data) => apiClient.post('/tasks', data),
@@ -36,6 +115,11 @@ export const taskAPI = {
   // タスク削除
   deleteTask: (id) => apiClient.delete(`/tasks/${id}`),
   
+  // タスク一括作成・更新・削除（1リクエスト1トランザクション）
+  createTasksBulk: (tasks) => apiClient.post('/tasks/bulk', { tasks }),
+  updateTasksBulk: (items) => apiClient.put('/tasks/bulk', { items }),
+  deleteTasksBulk: (ids) => apiClient.delete('/tasks/bulk', { data: { ids } }),
+  
   // マトリックス表示データ取得
   getMatrixData: () => apiClient.get('/tasks/matrix'),
   
@@ -47,8 +131,8 @@ export const taskAPI = {
 
 // サブタスク関連のAPI
 export const subtaskAPI = {
-  // サブタスク一覧取得
-  getSubtasks: (taskId) => apiClient.get(`/tasks/${taskId}/subtasks`),
+  // サブタスク一覧取得（params: { limit, after, before }）
+  getSubtasks: (taskId, params = {}) => apiClient.get(`/tasks/${taskId}/subtasks`, { params }),
   
   // サブタスク作成
   createSubtask: (taskId, data) => apiClient.post(`/tasks/${taskId}/subtasks`, data),
@@ -58,12 +142,18 @@ export const subtaskAPI = {
   
   // サブタスク削除
   deleteSubtask: (id) => apiClient.delete(`/subtasks/${id}`),
+  
+  // サブタスク移動（data: { after_id } または { before_id }）
+  moveSubtask: (id, data) => apiClient.post(`/subtasks/${id}/move`, data),
+  
+  // サブタスク一括並び替え（ids: 全サブタスクのidを新しい順に）
+  reorderSubtasks: (taskId, ids) => apiClient.put(`/tasks/${taskId}/subtasks/order`, { ids }),
 };
 
 // コメント関連のAPI
 export const commentAPI = {
-  // コメント一覧取得
-  getComments: (taskId) => apiClient.get(`/tasks/${taskId}/comments`),
+  // コメント一覧取得（params: { limit, after, before }）
+  getComments: (taskId, params = {}) => apiClient.get(`/tasks/${taskId}/comments`, { params }),
   
   // コメント作成
   createComment: (taskId, data) => apiClient.post(`/tasks/${taskId}/comments`, data),
@@ -72,4 +162,18 @@ export const commentAPI = {
   deleteComment: (id) => apiClient.delete(`/comments/${id}`),
 };
 
+// 変更フィード（Server-Sent Events）
+// onChange にイベント（entity, action, id, task_id）を渡す。reset は取りこぼしがあったことを示す。
+// 返り値の関数で購読を終了する。
+export const subscribeChanges = (onChange, { taskId, onReset } = {}) => {
+  const url = new URL(`${API_BASE_URL}/changes/stream`);
+  if (taskId) {
+    url.searchParams.set('task_id', taskId);
+  }
+  const source = new EventSource(url.toString());
+  source.addEventListener('change', (event) => onChange(JSON.parse(event.data)));
+  source.addEventListener('reset', () => (onReset || onChange)(null));
+  return () => source.close();
+};
+
 export default apiClient;
\ No newline at end of file
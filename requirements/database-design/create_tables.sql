@@ -9,6 +9,7 @@ CREATE DATABASE task_management_app;
 
 -- UUID拡張を有効化
 CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
 
 -- ENUMタイプの定義
 CREATE TYPE task_category AS ENUM ('work', 'private', 'study', 'other');
@@ -41,6 +42,13 @@ CREATE TABLE tasks (
     -- その他
     notes TEXT,
     
+    -- 子レコードの件数（サブタスク・コメントの書き込み時に更新）
+    subtask_count INTEGER NOT NULL DEFAULT 0,
+    completed_subtasks INTEGER NOT NULL DEFAULT 0,
+    comment_count INTEGER NOT NULL DEFAULT 0,
+    -- サブタスク・コメントの変更回数（タスク詳細のETag用）
+    children_version INTEGER NOT NULL DEFAULT 0,
+    
     -- システム項目
     created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
@@ -64,19 +72,34 @@ CREATE TABLE task_comments (
     created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
 );
 
+-- change_versionsテーブル作成（テーブルごとの変更バージョン、ETag用）
+CREATE TABLE change_versions (
+    table_name VARCHAR(50) PRIMARY KEY,
+    version BIGINT NOT NULL DEFAULT 0,
+    changed_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+);
+INSERT INTO change_versions (table_name) VALUES ('tasks'), ('subtasks'), ('task_comments');
+
 -- インデックス作成
 CREATE INDEX idx_tasks_category ON tasks(category);
 CREATE INDEX idx_tasks_priority_urgency ON tasks(priority, urgency);
 CREATE INDEX idx_tasks_status ON tasks(status);
 CREATE INDEX idx_tasks_due_date ON tasks(due_date);
-CREATE INDEX idx_tasks_created_at ON tasks(created_at);
+CREATE INDEX idx_tasks_created_at ON tasks(created_at, id);
+CREATE INDEX idx_tasks_matrix_open ON tasks(priority, urgency) WHERE status != 'completed';
+CREATE INDEX idx_tasks_planned_start_date ON tasks(planned_start_date);
 
 CREATE INDEX idx_subtasks_task_id ON subtasks(task_id);
-CREATE INDEX idx_subtasks_order ON subtasks(task_id, order_index);
+CREATE INDEX idx_subtasks_task_order ON subtasks(task_id, order_index, id);
+CREATE INDEX idx_subtasks_task_completed ON subtasks(task_id, completed);
 
-CREATE INDEX idx_comments_task_id ON task_comments(task_id);
+CREATE INDEX idx_comments_task_created ON task_comments(task_id, created_at, id);
 CREATE INDEX idx_comments_created_at ON task_comments(created_at);
 
+-- 全文検索（トライグラム、日本語の部分一致に対応）
+CREATE INDEX idx_tasks_search_trgm ON tasks USING gin ((title || ' ' || coalesce(description, '') || ' ' || coalesce(notes, '')) gin_trgm_ops);
+CREATE INDEX idx_comments_content_trgm ON task_comments USING gin (content gin_trgm_ops);
+
 -- updated_at自動更新のトリガー関数
 CREATE OR REPLACE FUNCTION update_updated_at_column()
 RETURNS TRIGGER AS $$